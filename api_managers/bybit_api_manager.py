@@ -1,20 +1,44 @@
-from pybit.unified_trading import HTTP
+import random
+import threading
 import time
+from json import JSONDecodeError
+
+import requests
+from pybit.exceptions import FailedRequestError, InvalidRequestError
+from pybit.unified_trading import HTTP
+from requests.adapters import HTTPAdapter
 
 from api_managers.base_api_manager import BaseAPIManager
+from configs.settings import Settings
 from utils.logging_utils import setup_logger
+from utils.metrics import api_call_seconds, api_calls_total, api_retries_total
+from utils.rate_limiter import RateLimiter
 from utils.telegram_utils import send_telegram_notification
 
 
-logger = setup_logger(log_dir="logs", days_to_keep=30)
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
 
 
 class BybitAPIManager(BaseAPIManager):
+    # Bybit retCodes that describe a temporary condition: server timeout, too many visits,
+    # internal server error and IP rate limit.
+    retryable_ret_codes = {10000, 10006, 10016, 10018}
+    # HTTP statuses pybit reports as FailedRequestError that are worth retrying.
+    retryable_status_codes = {403, 429, 500, 502, 503, 504}
+    # Message pybit uses when its own (single-attempt) retry loop gave up, e.g. on a recv_window error.
+    retries_exceeded_message = "Bad Request. Retries exceeded maximum."
+
     def __init__(self, api_key, api_secret, testnet=False, timeout=30):
         self.api_key = api_key
         self.api_secret = api_secret
         self.testnet = testnet
         self.timeout = timeout
+        self.settings = Settings()
+
+        self.rate_limiter = RateLimiter(self.settings.api_requests_per_second)
+        # Per endpoint: (remaining requests, window reset time in ms) from Bybit's rate limit headers.
+        self.endpoint_limits = {}
+        self.endpoint_limits_lock = threading.Lock()
 
         self.http_session = self.__create_http_session()
 
@@ -22,28 +46,114 @@ class BybitAPIManager(BaseAPIManager):
         return self.http_session
 
     def safe_api_call(self, api_func, *args, **kwargs):
-        max_retries = 3
-        retry_interval = 30
+        endpoint = getattr(api_func, "__name__", str(api_func))
+        with api_call_seconds.time(endpoint=endpoint):
+            return self.__call_with_retries(endpoint, api_func, *args, **kwargs)
+
+    def __call_with_retries(self, endpoint: str, api_func, *args, **kwargs):
+        max_attempts = self.settings.api_max_retries
+
+        for attempt in range(max_attempts):
+            self.__wait_for_endpoint_limit(endpoint)
+            self.rate_limiter.acquire()
 
-        for attempt in range(max_retries):
             try:
-                return api_func(*args, **kwargs)
+                response, _, headers = api_func(*args, **kwargs)
+                self.__update_endpoint_limit(endpoint, headers)
+                api_calls_total.inc(endpoint=endpoint, outcome="success")
+                return response
+
+            except InvalidRequestError as e:
+                self.__update_endpoint_limit(endpoint, e.resp_headers)
+                if e.status_code not in self.retryable_ret_codes:
+                    # A business error (bad parameters, insufficient balance, unknown order...) will not
+                    # go away on retry, so it is returned the way callers already handle retCode != 0.
+                    logger.error("%s rejected by Bybit: %s (retCode %s).", endpoint, e.message, e.status_code)
+                    api_calls_total.inc(endpoint=endpoint, outcome="rejected")
+                    return {"retCode": e.status_code, "retMsg": e.message, "result": {}}
+                error = e
+
+            except FailedRequestError as e:
+                if e.status_code not in self.retryable_status_codes and e.message != self.retries_exceeded_message:
+                    logger.error("%s failed with a non-retryable error: %s", endpoint, e, exc_info=True)
+                    api_calls_total.inc(endpoint=endpoint, outcome="failed")
+                    send_telegram_notification(
+                        f"⚠ API call {endpoint} failed: {e.message} (status {e.status_code})",
+                        coalesce_key=f"api_failed:{endpoint}:{e.status_code}"
+                    )
+                    return None
+                error = e
 
-            except Exception as e:
-                logger.error(f"Unexpected error occurred: {e}. Attempt {attempt + 1}/{max_retries}", exc_info=True)
+            except (requests.exceptions.RequestException, JSONDecodeError) as e:
+                error = e
 
-                if attempt < max_retries - 1:
-                    send_telegram_notification(f"⚠ Unexpected API call error: {e}. Attempt {attempt + 1}/{max_retries}")
-                    self.http_session = self.__create_http_session()
-                    time.sleep(retry_interval)
-                else:
-                    logger.error(f"Unexpected error after {max_retries} retries. Giving up...")
-                    send_telegram_notification(f"⚠ Unexpected API call error: {e}. Final")
+            api_calls_total.inc(endpoint=endpoint, outcome="error")
+            if attempt < max_attempts - 1:
+                api_retries_total.inc(endpoint=endpoint)
+                delay = self.__get_retry_delay(attempt, error)
+                logger.warning("%s failed: %s. Retrying in %.2fs (attempt %s/%s).",
+                               endpoint, error, delay, attempt + 1, max_attempts)
+                time.sleep(delay)
+            else:
+                logger.error("%s failed after %s attempts: %s", endpoint, max_attempts, error, exc_info=error)
+                send_telegram_notification(
+                    f"⚠ API call {endpoint} failed after {max_attempts} attempts: {error}",
+                    coalesce_key=f"api_retries_exhausted:{endpoint}:{type(error).__name__}"
+                )
+
+        return None
+
+    def __get_retry_delay(self, attempt: int, error: Exception) -> float:
+        # A rate limit error says when the window resets, so wait exactly until then.
+        headers = getattr(error, "resp_headers", None)
+        if getattr(error, "status_code", None) in (10006, 10018) and headers and headers.get("X-Bapi-Limit-Reset-Timestamp"):
+            reset_delay = (int(headers["X-Bapi-Limit-Reset-Timestamp"]) - time.time() * 1000) / 1000
+            return min(max(reset_delay, 0.0), self.settings.api_backoff_max)
+
+        # Exponential backoff with full jitter, so concurrent callers do not retry in lockstep.
+        return random.uniform(0, min(self.settings.api_backoff_max, self.settings.api_backoff_base * 2 ** attempt))
+
+    def __update_endpoint_limit(self, endpoint: str, headers) -> None:
+        if not headers or headers.get("X-Bapi-Limit-Status") is None or headers.get("X-Bapi-Limit-Reset-Timestamp") is None:
+            return
+
+        with self.endpoint_limits_lock:
+            self.endpoint_limits[endpoint] = (
+                int(headers["X-Bapi-Limit-Status"]),
+                int(headers["X-Bapi-Limit-Reset-Timestamp"])
+            )
+
+    def __wait_for_endpoint_limit(self, endpoint: str) -> None:
+        with self.endpoint_limits_lock:
+            remaining, reset_timestamp = self.endpoint_limits.get(endpoint, (1, 0))
+
+        if remaining > 0:
+            return
+
+        delay = (reset_timestamp - time.time() * 1000) / 1000
+        if delay > 0:
+            logger.warning("Bybit rate limit for %s exhausted. Waiting %.2fs for the window to reset.", endpoint, delay)
+            time.sleep(min(delay, self.settings.api_backoff_max))
 
     def __create_http_session(self):
-        return HTTP(
+        # pybit is limited to a single attempt (retry_delay only applies to its recv_window retry):
+        # retries, backoff and rate limiting are handled in safe_api_call, where the response headers
+        # are available.
+        http_session = HTTP(
             testnet=self.testnet,
             api_key=self.api_key,
             api_secret=self.api_secret,
-            timeout=self.timeout
-        )
\ No newline at end of file
+            timeout=self.timeout,
+            max_retries=1,
+            retry_delay=0,
+            retry_codes={10002},
+            return_response_headers=True
+        )
+
+        # One keep-alive session for the lifetime of the bot, sized for the concurrent callers.
+        adapter = HTTPAdapter(
+            pool_connections=self.settings.api_connection_pool_size,
+            pool_maxsize=self.settings.api_connection_pool_size
+        )
+        http_session.client.mount("https://", adapter)
+        return http_session
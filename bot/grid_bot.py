@@ -1,22 +1,42 @@
 import json
+import math
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from typing import Optional
 
 from api_managers.bybit_api_manager import BybitAPIManager
 from bot.grid_levels_calculator import GridLevelsCalculator
+from bot.vectorized_backtest_engine import VectorizedBacktestEngine
+from bot.volatility_tracker import VolatilityTracker
 from configs.settings import Settings
 from data.bybit_market_data import BybitMarketData
+from data.columnar_price_store import ColumnarPriceStore
+from data.kline_cache import KlineCache
+from data.base_price_distribution import BasePriceDistribution
+from data.price_distribution_factory import create_price_distribution
+from data.streaming_price_distribution import StreamingPriceDistribution
+from models.price_series import PriceSeries
 from order_managers.backtest_order_manager import BacktestOrderManager
+from order_managers.base_order_manager import BaseOrderManager
 from order_managers.dynamodb_order_manager import DynamoDBOrderManager
+from order_managers.sqlite_order_manager import SQLiteOrderManager
+from streams.bybit_order_stream import BybitOrderStream
+from streams.bybit_ticker_stream import BybitTickerStream
+from streams.order_update_consumer import OrderUpdateConsumer
 from traders.backtest_trader import BacktestTrader
 from traders.bybit_trader import BybitTrader
 from trading_strategies.grid_spot_strategy import GridSpotStrategy
-from utils.datetime_utils import format_timestamp
+from utils.datetime_utils import format_timestamp, to_milliseconds_from_minutes
+from utils.latest_value_mailbox import LatestValueMailbox
 from utils.logging_utils import setup_logger
+from utils.metrics import (MetricsServer, api_calls_total, live_api_calls_per_iteration, live_iterations_total,
+                           live_stage_seconds, metrics, orders_placed_total, price_to_order_seconds)
+from utils.profiling import BacktestProfiler
 from utils.telegram_utils import send_telegram_notification
 
 
-logger = setup_logger(log_dir="logs", days_to_keep=30)
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
 
 
 class GridBot:
@@ -26,13 +46,57 @@ class GridBot:
         logger.info("HTTP session initialized with API keys.")
 
         self.api_manager = BybitAPIManager(self.settings.api_key, self.settings.api_secret)
-        self.market_data = BybitMarketData(self.api_manager)
+        self.kline_cache = KlineCache(self.settings.kline_cache_path) if self.settings.kline_cache_path else None
+        self.market_data = BybitMarketData(self.api_manager, self.kline_cache)
         self.trader = BybitTrader(self.api_manager)
         self.grid_levels_calculator = GridLevelsCalculator()
-        self.order_manager = DynamoDBOrderManager()
+        self.order_manager = self.__create_order_manager()
         self.grid_spot_strategy = GridSpotStrategy(self.order_manager)
+        self.order_update_consumer = self.__create_order_update_consumer()
+        self.price_stream = BybitTickerStream(self.settings.symbol) if self.settings.price_stream_enabled else None
+        self.price_mailbox = LatestValueMailbox()
+        self.io_executor = ThreadPoolExecutor(max_workers=self.settings.live_io_workers, thread_name_prefix="grid-bot-io")
+        self.historical_price_window = self.__create_price_distribution(restore=True)
+        self.volatility_tracker = self.__create_volatility_tracker()
         logger.info("GridBot modules initialized successfully.")
 
+    def __create_order_manager(self) -> BaseOrderManager:
+        if self.settings.order_storage == "dynamodb":
+            return DynamoDBOrderManager()
+        if self.settings.order_storage == "sqlite":
+            return SQLiteOrderManager(self.settings.order_database_path, self.settings.symbol)
+
+        raise ValueError(f"Unknown order storage: {self.settings.order_storage}")
+
+    def __create_price_distribution(self, restore: bool = False) -> BasePriceDistribution:
+        distribution = create_price_distribution(self.settings)
+
+        # A sketch saved by the previous run only needs the candles closed since then.
+        if restore and isinstance(distribution, StreamingPriceDistribution) and self.settings.price_sketch_path:
+            stored_distribution = StreamingPriceDistribution.load(self.settings.price_sketch_path)
+            if stored_distribution is not None and stored_distribution.is_compatible(distribution):
+                logger.info("Restored price sketch with %d prices from %s.", len(stored_distribution),
+                            self.settings.price_sketch_path)
+                return stored_distribution
+
+        return distribution
+
+    def __create_volatility_tracker(self) -> Optional[VolatilityTracker]:
+        # "timer" recalculates the grid once a day; "adaptive" when the volatility tracker asks for it.
+        if self.settings.grid_recalculation_mode == "timer":
+            return None
+        if self.settings.grid_recalculation_mode == "adaptive":
+            return VolatilityTracker.from_settings(self.settings)
+
+        raise ValueError(f"Unknown grid recalculation mode: {self.settings.grid_recalculation_mode}")
+
+    def __create_order_update_consumer(self) -> Optional[OrderUpdateConsumer]:
+        if not self.settings.order_stream_enabled:
+            return None
+
+        order_stream = BybitOrderStream(self.settings.api_key, self.settings.api_secret)
+        return OrderUpdateConsumer(order_stream, self.settings.symbol)
+
     def run_real_time_bot(self):
         logger.info("Starting Grid Bot...")
         send_telegram_notification("Starting Grid Bot...")
@@ -40,38 +104,124 @@ class GridBot:
         grid_recalculation_interval_days = 1
         recalculation_interval_ms = grid_recalculation_interval_days * 24 * 60 * 60 * 1000
         next_grid_recalculation_time = int(time.time() * 1000)
+        last_positions_poll_time = None
+        last_balance_refresh_time = None
+        last_order_time = None
+
+        if self.order_update_consumer is not None:
+            self.order_update_consumer.start()
+        if self.price_stream is not None:
+            self.price_stream.start(lambda price, timestamp: self.price_mailbox.put((price, timestamp)))
+
+        metrics_server = None
+        if self.settings.metrics_server_enabled:
+            metrics_server = MetricsServer(metrics, self.settings.metrics_host, self.settings.metrics_port)
+            metrics_server.start()
+        iteration_count = 0
 
         while True:
             try:
+                iteration_started_at = time.perf_counter()
+                api_calls_before = api_calls_total.total()
                 current_datetime_timestamp = int(time.time() * 1000)
 
-                if current_datetime_timestamp >= next_grid_recalculation_time:
-                    self.refresh_data(current_datetime_timestamp)
+                if self.volatility_tracker is None and current_datetime_timestamp >= next_grid_recalculation_time:
+                    with live_stage_seconds.time(stage="refresh_data"):
+                        self.refresh_data(current_datetime_timestamp)
                     next_grid_recalculation_time += recalculation_interval_ms
 
-                self.grid_spot_strategy.order_manager.update_positions(self.trader)
+                # The exchange and database reads below are independent of each other, so they run
+                # concurrently on the I/O pool and the iteration waits for the slowest one only.
+                # Only the order placement path further down stays sequential.
 
-                self.grid_spot_strategy.balance = self.trader.get_available_coin_balance("USDT")
+                # With a connected order stream, REST polling is only a periodic safety net that also
+                # cancels stale buys; without it, positions are polled every iteration as before.
+                positions_future = None
+                if self.__is_positions_poll_due(last_positions_poll_time):
+                    positions_future = self.io_executor.submit(
+                        self.__run_timed, "update_positions", self.order_manager.update_positions, self.trader
+                    )
+                    last_positions_poll_time = time.monotonic()
+
+                # In streaming mode the loop runs once per price update, so the balance is only
+                # re-read once per trading interval or after the order state changed.
+                balance_future = None
+                is_balance_refresh_due = last_balance_refresh_time is None \
+                    or time.monotonic() - last_balance_refresh_time >= self.settings.trading_interval
+                if is_balance_refresh_due:
+                    balance_future = self.io_executor.submit(
+                        self.__run_timed, "balance", self.trader.get_available_coin_balance, "USDT"
+                    )
+                    last_balance_refresh_time = time.monotonic()
+
+                price_future = None
+                if self.price_stream is None:
+                    price_future = self.io_executor.submit(
+                        self.__run_timed, "price", self.market_data.get_current_price, self.settings.symbol
+                    )
 
-                close_price = self.market_data.get_current_price(self.settings.symbol)
+                close_price, current_datetime_timestamp = self.__get_next_price(current_datetime_timestamp, price_future)
+                price_received_at = time.perf_counter()
 
-                self.grid_spot_strategy.log_grid_levels_and_zone(close_price)
-                order = self.grid_spot_strategy.make_decision(close_price, timestamp=current_datetime_timestamp)
+                # In adaptive mode every price feeds the volatility tracker, and the grid is only
+                # refreshed when the market moved enough to make the current one stale.
+                if self.volatility_tracker is not None:
+                    self.volatility_tracker.update(current_datetime_timestamp, close_price)
+                    recalculation_reason = self.volatility_tracker.get_recalculation_reason(
+                        current_datetime_timestamp, close_price
+                    )
+                    if recalculation_reason is not None:
+                        logger.info("Recalculating grid levels: %s", recalculation_reason)
+                        with live_stage_seconds.time(stage="refresh_data"):
+                            self.refresh_data(current_datetime_timestamp)
+
+                if positions_future is not None:
+                    positions_future.result()
+                if balance_future is not None:
+                    self.grid_spot_strategy.balance = balance_future.result()
+
+                # Applied right before deciding, so a fill streamed while waiting for the price is
+                # already sellable at that price.
+                if self.order_update_consumer is not None:
+                    with live_stage_seconds.time(stage="order_updates"):
+                        applied_update_count = self.order_update_consumer.apply_updates(self.order_manager)
+                    # Any fill moves funds, including sells, which are not stored as orders.
+                    has_executions = self.order_update_consumer.take_executions()
+                    if applied_update_count or has_executions:
+                        self.trader.invalidate_balances()
+                        last_balance_refresh_time = None
+
+                if is_balance_refresh_due:
+                    self.grid_spot_strategy.log_grid_levels_and_zone(close_price)
+
+                order = None
+                if not self.__is_order_cooldown_active(last_order_time):
+                    with live_stage_seconds.time(stage="decision"):
+                        order = self.grid_spot_strategy.make_decision(close_price, timestamp=current_datetime_timestamp)
                 if order:
-                    logger.info(f"Decision made: {order}")
+                    logger.info("Decision made: %s", order)
 
-                    order_action_result = self.trader.place_order(self.settings.symbol, order)
+                    with live_stage_seconds.time(stage="place_order"):
+                        order_action_result = self.trader.place_order(self.settings.symbol, order)
                     if order_action_result and order_action_result.success:
-                        if order.action == "Buy":
-                            self.order_manager.add_order(order)
-                            logger.info(f"Buy order recorded in state manager: {order.order_link_id}")
+                        price_to_order_seconds.observe(time.perf_counter() - price_received_at)
+                        orders_placed_total.inc(side=order.action)
+                        last_balance_refresh_time = None
+                        last_order_time = time.monotonic()
+
+                        portfolio_balance_future = self.io_executor.submit(self.trader.get_portfolio_balance)
+
+                        with live_stage_seconds.time(stage="record_order"):
+                            if order.action == "Buy":
+                                self.order_manager.add_order(order)
+                                logger.info("Buy order recorded in state manager: %s", order.order_link_id)
 
-                        if order.action == "Sell":
-                            self.order_manager.remove_order(order.buy_order_link_id)
-                            logger.info(f"Sell order removed from state manager: {order.buy_order_link_id}")
+                            if order.action == "Sell":
+                                self.order_manager.remove_order(order.buy_order_link_id)
+                                logger.info("Sell order removed from state manager: %s", order.buy_order_link_id)
 
                         action = order.action
-                        portfolio_balance = self.trader.get_portfolio_balance()
+                        portfolio_balance = portfolio_balance_future.result()
 
                         message = None
 
@@ -100,19 +250,104 @@ class GridBot:
                         if message:
                             send_telegram_notification(message)
 
-                time.sleep(self.settings.trading_interval)
+                live_stage_seconds.observe(time.perf_counter() - iteration_started_at, stage="iteration")
+                live_api_calls_per_iteration.observe(api_calls_total.total() - api_calls_before)
+                live_iterations_total.inc()
+                iteration_count += 1
+                if self.settings.metrics_log_interval > 0 and iteration_count % self.settings.metrics_log_interval == 0:
+                    logger.info("Metrics after %d iterations: %s", iteration_count, metrics.summary())
+
+                self.__wait_for_next_iteration()
 
             except Exception as e:
-                logger.error(f"Error occurred in the bot loop: {e}", exc_info=True)
+                logger.error("Error occurred in the bot loop: %s", e, exc_info=True)
 
                 error_message = f"🚨 An error occurred in the bot loop: {e}"
                 send_telegram_notification(error_message)
 
                 break
 
-    def run_backtest(self, from_timestamp, to_timestamp, use_real_data=False, initial_balance=300):
+        if self.order_update_consumer is not None:
+            self.order_update_consumer.stop()
+        if self.price_stream is not None:
+            self.price_stream.stop()
+        if metrics_server is not None:
+            metrics_server.stop()
+        self.io_executor.shutdown(wait=False)
+
+    @staticmethod
+    def __run_timed(stage: str, function, *args):
+        with live_stage_seconds.time(stage=stage):
+            return function(*args)
+
+    def __get_next_price(self, current_datetime_timestamp: int, price_future: Optional[Future] = None):
+        if price_future is not None:
+            return price_future.result(), current_datetime_timestamp
+
+        if self.price_stream is not None:
+            # Blocks until the next ticker update. Ticks that arrived while the previous one was
+            # being processed have been coalesced into the newest price.
+            tick = self.price_mailbox.take(timeout=self.settings.trading_interval)
+            if tick is not None:
+                price, timestamp = tick
+                return price, timestamp or int(time.time() * 1000)
+
+            logger.warning("No price update from the ticker stream. Falling back to REST.")
+
+        return self.market_data.get_current_price(self.settings.symbol), current_datetime_timestamp
+
+    def __is_order_cooldown_active(self, last_order_time: Optional[float]) -> bool:
+        # The strategy would buy again on every tick that stays in the buy zone, so in streaming
+        # mode orders are still placed at most once per trading interval, as in polling mode.
+        if self.price_stream is None or last_order_time is None:
+            return False
+
+        return time.monotonic() - last_order_time < self.settings.trading_interval
+
+    def __is_positions_poll_due(self, last_positions_poll_time: Optional[float]) -> bool:
+        if last_positions_poll_time is None:
+            return True
+
+        if self.order_update_consumer is not None and self.order_update_consumer.is_connected():
+            poll_interval = self.settings.order_poll_interval
+        else:
+            poll_interval = self.settings.trading_interval
+
+        return time.monotonic() - last_positions_poll_time >= poll_interval
+
+    def __wait_for_next_iteration(self):
+        # In streaming mode the loop is paced by __get_next_price.
+        if self.price_stream is not None:
+            return
+
+        # A streamed fill wakes the loop right away, so the bought lot can be offered for sale
+        # without waiting for the rest of the trading interval.
+        if self.order_update_consumer is not None and self.order_update_consumer.is_connected():
+            self.order_update_consumer.wait_for_updates(self.settings.trading_interval)
+        else:
+            time.sleep(self.settings.trading_interval)
+
+    def run_backtest(self, from_timestamp, to_timestamp, use_real_data=False, initial_balance=300, engine="loop",
+                     profile_mode=None):
+        # "deterministic" or "sampling" profiles the whole run; PROFILE_MODE is used when not given.
+        profile_mode = profile_mode if profile_mode is not None else self.settings.profile_mode
+        if not profile_mode:
+            self.__run_backtest(from_timestamp, to_timestamp, use_real_data, initial_balance, engine)
+            return
+
+        profiler = BacktestProfiler(
+            profile_mode,
+            self.settings.profile_output_directory,
+            self.settings.profile_top_n,
+            self.settings.profile_sampling_interval
+        )
+        with profiler:
+            self.__run_backtest(from_timestamp, to_timestamp, use_real_data, initial_balance, engine)
+        profiler.write_report(f"backtest_{engine}")
+
+    def __run_backtest(self, from_timestamp, to_timestamp, use_real_data, initial_balance, engine):
         self.trader = BacktestTrader(initial_balance=initial_balance)
-        self.order_manager = BacktestOrderManager()
+        self.order_manager = BacktestOrderManager(self.settings.symbol)
         self.grid_spot_strategy = GridSpotStrategy(self.order_manager)
 
         logger.info("Starting Grid Bot Backtest...")
@@ -120,102 +355,159 @@ class GridBot:
         grid_recalculation_interval_days = 1
         recalculation_interval_ms = grid_recalculation_interval_days * 24 * 60 * 60 * 1000
 
-        backtest_price_data = self.fetch_historical_data(from_timestamp, to_timestamp, use_real_data)
-        if not backtest_price_data:
+        price_series = self.fetch_historical_data(from_timestamp, to_timestamp, use_real_data)
+        if not price_series:
             logger.warning("Insufficient data for backtest. Terminating backtest.")
             return
 
-        test_price_data = [
-            price_data for price_data in backtest_price_data
-            if from_timestamp <= price_data["timestamp"] <= to_timestamp
-        ]
+        if engine == "vectorized":
+            self.__run_vectorized_backtest(price_series, from_timestamp, to_timestamp)
+            return
+        elif engine != "loop":
+            raise ValueError(f"Unknown backtest engine: {engine}")
+
+        price_window = self.__create_price_distribution()
+        volatility_tracker = self.__create_volatility_tracker()
+        test_start, test_end = price_series.index_range(from_timestamp, to_timestamp)
 
         next_grid_recalculation_time = from_timestamp
 
-        for price_data in test_price_data:
-            current_datetime_timestamp = price_data["timestamp"]
-            close_price = float(price_data["price"])
+        for current_datetime_timestamp, close_price in zip(
+                price_series.timestamps[test_start:test_end].tolist(), price_series.prices[test_start:test_end].tolist()
+        ):
+            if volatility_tracker is not None:
+                volatility_tracker.update(current_datetime_timestamp, close_price)
+                recalculation_reason = volatility_tracker.get_recalculation_reason(current_datetime_timestamp, close_price)
+                is_recalculation_due = recalculation_reason is not None
+            else:
+                is_recalculation_due = current_datetime_timestamp >= next_grid_recalculation_time
 
-            if current_datetime_timestamp >= next_grid_recalculation_time:
-                filtered_historical_prices = [
-                    item["price"] for item in backtest_price_data
-                    if current_datetime_timestamp - (self.settings.grid_historical_days * 24 * 60 * 60 * 1000) <= item["timestamp"] < current_datetime_timestamp
-                ]
+            if is_recalculation_due:
+                price_window.advance(price_series, current_datetime_timestamp)
 
-                if len(filtered_historical_prices) == 0:
+                if len(price_window) == 0:
                     current_datetime_human_readable = datetime.fromtimestamp(
                         current_datetime_timestamp / 1000).strftime("%Y-%m-%d %H:%M:%S")
                     logger.warning(
-                        f"No historical prices available for calculation. Current time: {current_datetime_human_readable}")
+                        "No historical prices available for calculation. Current time: %s", current_datetime_human_readable)
                 else:
                     self.grid_spot_strategy.grid_levels = self.grid_levels_calculator.calculate_uniform_grid_levels_from_step(
-                        filtered_historical_prices, self.settings.grid_levels_count
+                        price_window, self.settings.grid_levels_count
                     )
 
-                next_grid_recalculation_time += recalculation_interval_ms
+                if volatility_tracker is not None:
+                    logger.info("Grid recalculated at %s: %s", format_timestamp(current_datetime_timestamp), recalculation_reason)
+                    volatility_tracker.mark_recalculated(current_datetime_timestamp, price_window)
+                else:
+                    next_grid_recalculation_time += recalculation_interval_ms
 
             self.grid_spot_strategy.balance = self.trader.get_available_coin_balance("USDT")
 
             order = self.grid_spot_strategy.make_decision(close_price, timestamp=current_datetime_timestamp)
             if order:
-                logger.info(f"Decision made: {order}")
+                logger.info("Decision made: %s", order)
 
                 order_placement_result = self.trader.place_order(self.settings.symbol, order)
                 if order_placement_result and order_placement_result.success:
                     if order.action == "Buy":
                         self.order_manager.add_order(order)
-                        logger.info(f"Buy order recorded in state manager: {order.order_link_id}")
+                        logger.info("Buy order recorded in state manager: %s", order.order_link_id)
 
                     if order.action == "Sell":
                         self.order_manager.remove_order(order.buy_order_link_id)
-                        logger.info(f"Sell order removed from state manager: {order.buy_order_link_id}")
+                        logger.info("Sell order removed from state manager: %s", order.buy_order_link_id)
 
         results = self.grid_spot_strategy.trade_results
         total_profit = sum(trade["profit"] for trade in results if "profit" in trade)
 
-        logger.info(f"Backtest finished. Total Profit: {total_profit:.2f} USDT")
+        logger.info("Backtest finished. Total Profit: %.2f USDT", total_profit)
+
+    def __run_vectorized_backtest(self, price_series, from_timestamp, to_timestamp):
+        backtest_engine = VectorizedBacktestEngine(
+            self.settings, self.grid_levels_calculator, self.grid_spot_strategy.qty_precision
+        )
+        result = backtest_engine.run(
+            price_series, from_timestamp, to_timestamp, self.trader.get_available_coin_balance("USDT")
+        )
+
+        self.grid_spot_strategy.trade_results = result.trade_results
+        self.trader.balance["USDT"] = result.final_balance
+        for order in result.open_orders:
+            self.order_manager.add_order(order)
+
+        logger.info("Backtest finished. Total Profit: %.2f USDT", result.total_profit)
 
     def refresh_data(self, current_datetime_timestamp):
-        logger.info(f"Recalculating grid levels at {format_timestamp(current_datetime_timestamp)}...")
+        logger.info("Recalculating grid levels at %s...", format_timestamp(current_datetime_timestamp))
 
-        start_time_for_calculation = current_datetime_timestamp - (
-            self.settings.grid_historical_days * 24 * 60 * 60 * 1000
-        )
+        start_time_for_calculation = math.ceil(current_datetime_timestamp - self.historical_price_window.window_duration_ms)
+        last_timestamp = self.historical_price_window.last_timestamp
+
+        # Only the candles closed since the previous refresh are downloaded; the rest of the window is kept in memory.
+        if last_timestamp is None or last_timestamp < start_time_for_calculation:
+            fetch_start_time = start_time_for_calculation
+        else:
+            fetch_start_time = last_timestamp + 1
 
         historical_price_data = self.market_data.fetch_data_for_period(
             self.settings.symbol,
-            start_time_for_calculation,
+            fetch_start_time,
             current_datetime_timestamp,
             "1"
         )
 
-        historical_prices = [item["close_price"] for item in historical_price_data]
+        candle_duration_ms = to_milliseconds_from_minutes("1")
+        closed_candles = [
+            item for item in historical_price_data
+            if item["timestamp"] >= fetch_start_time and item["timestamp"] + candle_duration_ms <= current_datetime_timestamp
+        ]
 
-        if not historical_prices:
-            logger.warning(f"No sufficient data for recalculation at {format_timestamp(current_datetime_timestamp)}")
+        self.historical_price_window.extend(
+            [item["timestamp"] for item in closed_candles], [item["close_price"] for item in closed_candles]
+        )
+        self.historical_price_window.evict_before(start_time_for_calculation)
+
+        logger.info("Historical price window updated with %d new candles, %d in total.",
+                    len(closed_candles), len(self.historical_price_window))
+
+        if isinstance(self.historical_price_window, StreamingPriceDistribution) and self.settings.price_sketch_path:
+            self.historical_price_window.save(self.settings.price_sketch_path)
+
+        if len(self.historical_price_window) == 0:
+            logger.warning("No sufficient data for recalculation at %s", format_timestamp(current_datetime_timestamp))
         else:
             self.grid_spot_strategy.grid_levels = self.grid_levels_calculator.calculate_uniform_grid_levels_from_step(
-                historical_prices, self.settings.grid_levels_count
+                self.historical_price_window, self.settings.grid_levels_count
             )
 
+        if self.volatility_tracker is not None:
+            self.volatility_tracker.mark_recalculated(current_datetime_timestamp, self.historical_price_window)
+
         self.grid_spot_strategy.min_order_amount = self.market_data.get_min_order_amt(self.settings.symbol)
+        self.grid_spot_strategy.qty_precision = self.market_data.get_qty_precision(self.settings.symbol)
 
-    def fetch_historical_data(self, from_timestamp, to_timestamp, use_real_data):
+    def fetch_historical_data(self, from_timestamp, to_timestamp, use_real_data) -> Optional[PriceSeries]:
         historical_duration_ms = self.settings.grid_historical_days * 24 * 60 * 60 * 1000
 
         if use_real_data:
             logger.info("Fetching real price data...")
 
-            backtest_price_data = self.market_data.fetch_data_for_period(
+            historical_price_data = self.market_data.fetch_data_for_period(
                 symbol=self.settings.symbol,
                 start_datetime=from_timestamp - historical_duration_ms,
                 end_datetime=to_timestamp,
                 interval="1",
             )
+            backtest_price_data = PriceSeries.from_records(historical_price_data, price_key="close_price")
+        elif ColumnarPriceStore.exists(self.settings.historical_data_store):
+            logger.info("Loading historical data from columnar price store...")
+
+            price_store = ColumnarPriceStore(self.settings.historical_data_store)
+            backtest_price_data = price_store.read_range(from_timestamp - historical_duration_ms, to_timestamp)
         else:
             logger.info("Loading historical data from file...")
             try:
-                with open("historical/btc_historical_data_sorted.json", "r") as file:
+                with open(self.settings.historical_data_file, "r") as file:
                     all_historical_data = json.load(file)
             except FileNotFoundError:
                 logger.error("Error: Historical data file not found.")
@@ -224,13 +516,13 @@ class GridBot:
                 logger.error("Error: Failed to decode JSON data.")
                 return None
 
-            backtest_price_data = [
-                p for p in all_historical_data
-                if from_timestamp - historical_duration_ms <= p["timestamp"] <= to_timestamp
-            ]
+            backtest_price_data = PriceSeries.from_records(sorted(
+                (p for p in all_historical_data if from_timestamp - historical_duration_ms <= p["timestamp"] <= to_timestamp),
+                key=lambda p: p["timestamp"]
+            ))
 
         if not backtest_price_data:
             logger.warning("No data found for the requested backtest period, including historical range.")
             return None
 
-        return backtest_price_data
\ No newline at end of file
+        return backtest_price_data
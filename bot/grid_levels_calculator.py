@@ -1,13 +1,23 @@
+import math
+
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
+from data.base_price_distribution import BasePriceDistribution
+from models.grid_bounds_batch import GridBoundsBatch
 from models.grid_levels import GridLevels
+from models.price_series import PriceSeries
+from models.uniform_grid_levels import UniformGridLevels
 from utils.logging_utils import setup_logger
 
 
-logger = setup_logger(log_dir="logs", days_to_keep=30)
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
 
 
 class GridLevelsCalculator:
+    # Upper bound on the prices copied at once when the batch API gathers windows for np.percentile.
+    batch_percentile_elements = 4_000_000
+
     @staticmethod
     def calculate_grid_levels_with_percentile(historical_prices, grid_levels_count):
         logger.info("Calculating grid levels using percentiles...")
@@ -15,12 +25,12 @@ class GridLevelsCalculator:
             logger.error("Insufficient historical data to calculate grid levels.")
             raise ValueError("Insufficient historical data to calculate grid levels")
 
-        min_price, max_price = np.percentile(historical_prices, [5, 95])
+        min_price, max_price = GridLevelsCalculator.__percentile_bounds(historical_prices)
 
         levels = np.linspace(min_price, max_price, grid_levels_count).tolist()
 
         logger.info(
-            f"Percentile grid calculated: min={min_price:.2f}, max={max_price:.2f}, levels={len(levels)}"
+            "Percentile grid calculated: min=%.2f, max=%.2f, levels=%s", min_price, max_price, len(levels)
         )
 
         return GridLevels(levels=levels, min=float(min_price), max=float(max_price))
@@ -41,8 +51,8 @@ class GridLevelsCalculator:
         levels = np.linspace(min_price, max_price, grid_levels_count).tolist()
 
         logger.info(
-            f"Standard deviation grid calculated: mean={mean_price:.2f}, std_dev={std_dev_price:.2f}, "
-            f"min={min_price:.2f}, max={max_price:.2f}, levels={len(levels)}"
+            "Standard deviation grid calculated: mean=%.2f, std_dev=%.2f, min=%.2f, max=%.2f, levels=%s",
+            mean_price, std_dev_price, min_price, max_price, len(levels)
         )
 
         return GridLevels(levels=levels, min=min_price, max=max_price)
@@ -65,8 +75,9 @@ class GridLevelsCalculator:
         levels = np.linspace(lower_band, upper_band, grid_levels_count).tolist()
 
         logger.info(
-            f"Bollinger Bands grid calculated: moving_average={moving_average:.2f}, std_dev={std_dev:.2f}, "
-            f"lower_band={lower_band:.2f}, upper_band={upper_band:.2f}, levels={len(levels)}"
+            "Bollinger Bands grid calculated: moving_average=%.2f, std_dev=%.2f, "
+            "lower_band=%.2f, upper_band=%.2f, levels=%s",
+            moving_average, std_dev, lower_band, upper_band, len(levels)
         )
 
         return GridLevels(levels=levels, min=float(lower_band), max=float(upper_band))
@@ -78,11 +89,94 @@ class GridLevelsCalculator:
             logger.error("Insufficient historical data to calculate uniform grid levels.")
             raise ValueError("Insufficient historical data to calculate uniform grid levels")
 
-        min_price, max_price = np.percentile(historical_prices, [5, 95])
+        min_price, max_price = GridLevelsCalculator.__percentile_bounds(historical_prices)
         step_size = (max_price - min_price) / (grid_levels_count - 1)
 
-        uniform_levels = np.arange(0, 1_000_000 + step_size, step_size).tolist()
+        # Same levels as np.arange(0, 1_000_000 + step_size, step_size), described by origin and step only.
+        levels_count = math.ceil((1_000_000 + step_size) / step_size)
+
+        logger.info("Uniform grid calculated: step_size=%.2f, levels_count=%s", step_size, levels_count)
 
-        logger.info(f"Uniform grid calculated: step_size={step_size:.2f}, levels_count={len(uniform_levels)}")
+        return UniformGridLevels(origin=0.0, step=float(step_size), levels_count=levels_count, min=0.0, max=1_000_000)
+
+    @staticmethod
+    def calculate_grid_bounds_batch(price_series: PriceSeries, recalculation_timestamps, window_lengths_ms,
+                                    grid_levels_count: int, k: float = 2, n_points: int = 20) -> GridBoundsBatch:
+        # Every method for every (window length, timestamp) pair at once. A window holds the prices in
+        # [timestamp - window length, timestamp), as RollingPriceWindow.advance does. Mean and standard
+        # deviation come from prefix sums; percentiles from strided views, grouped by window size.
+        timestamps = price_series.timestamps
+        prices = price_series.prices
+        recalculation_timestamps = np.asarray(recalculation_timestamps, dtype=np.int64)
+        window_lengths_ms = np.asarray(window_lengths_ms, dtype=np.float64)
+
+        logger.info("Calculating grid bounds for %d window length(s) at %d recalculation point(s)...",
+                    len(window_lengths_ms), len(recalculation_timestamps))
+
+        window_starts = np.ceil(recalculation_timestamps[np.newaxis, :] - window_lengths_ms[:, np.newaxis])
+        start_indexes = np.searchsorted(timestamps, window_starts.astype(np.int64), side="left")
+        end_indexes = np.broadcast_to(
+            np.searchsorted(timestamps, recalculation_timestamps, side="left"), start_indexes.shape
+        )
+        price_counts = end_indexes - start_indexes
+        has_enough_prices = price_counts >= 2
+
+        # Prices are centered before summing, so the sums of squares do not lose the variance to rounding.
+        center = float(prices.mean()) if len(prices) else 0.0
+        centered_prices = prices - center
+        price_sums = np.concatenate(([0.0], np.cumsum(centered_prices)))
+        squared_price_sums = np.concatenate(([0.0], np.cumsum(centered_prices * centered_prices)))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            centered_mean = (price_sums[end_indexes] - price_sums[start_indexes]) / price_counts
+            variance = (squared_price_sums[end_indexes] - squared_price_sums[start_indexes]) / price_counts \
+                - centered_mean * centered_mean
+        mean = np.where(has_enough_prices, centered_mean + center, np.nan)
+        std = np.where(has_enough_prices, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+        # Bollinger Bands only use the last n_points prices of each window; that short a window is read
+        # directly from a strided view, as prefix sums over the whole series would cancel too many digits.
+        has_bollinger_points = price_counts >= n_points
+        bollinger_mean = np.full(price_counts.shape, np.nan)
+        bollinger_std = np.full(price_counts.shape, np.nan)
+        if has_bollinger_points.any():
+            bollinger_windows = sliding_window_view(prices, n_points)[end_indexes[has_bollinger_points] - n_points]
+            bollinger_mean[has_bollinger_points] = np.mean(bollinger_windows, axis=1)
+            bollinger_std[has_bollinger_points] = np.std(bollinger_windows, axis=1)
+
+        percentile_min = np.full(price_counts.shape, np.nan)
+        percentile_max = np.full(price_counts.shape, np.nan)
+        for window_size in np.unique(price_counts[has_enough_prices]).tolist():
+            # Windows of the same size are rows of one strided view over the prices (no copies
+            # until the rows are gathered, a bounded number at a time).
+            windows = sliding_window_view(prices, window_size)
+            positions = np.nonzero(has_enough_prices & (price_counts == window_size))
+            rows_per_chunk = max(1, GridLevelsCalculator.batch_percentile_elements // window_size)
+
+            for chunk_start in range(0, len(positions[0]), rows_per_chunk):
+                chunk_positions = tuple(axis[chunk_start:chunk_start + rows_per_chunk] for axis in positions)
+                bounds = np.percentile(windows[start_indexes[chunk_positions]], [5, 95], axis=1)
+                percentile_min[chunk_positions] = bounds[0]
+                percentile_max[chunk_positions] = bounds[1]
+
+        return GridBoundsBatch(
+            recalculation_timestamps=recalculation_timestamps,
+            window_lengths_ms=window_lengths_ms,
+            price_counts=price_counts,
+            percentile_min=percentile_min,
+            percentile_max=percentile_max,
+            mean=mean,
+            std=std,
+            std_min=mean - k * std,
+            std_max=mean + k * std,
+            bollinger_min=bollinger_mean - k * bollinger_std,
+            bollinger_max=bollinger_mean + k * bollinger_std,
+            uniform_step=(percentile_max - percentile_min) / (grid_levels_count - 1),
+        )
+
+    @staticmethod
+    def __percentile_bounds(historical_prices):
+        if isinstance(historical_prices, BasePriceDistribution):
+            return historical_prices.percentile(5), historical_prices.percentile(95)
 
-        return GridLevels(levels=uniform_levels, min=0.0, max=1_000_000)
\ No newline at end of file
+        return np.percentile(historical_prices, [5, 95])
@@ -0,0 +1,136 @@
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from bot.grid_levels_calculator import GridLevelsCalculator
+from bot.vectorized_backtest_engine import VectorizedBacktestEngine
+from configs.settings import Settings
+from data.columnar_price_store import ColumnarPriceStore
+from utils.logging_utils import apply_log_profile, setup_logger
+from utils.profiling import BacktestProfiler
+
+
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
+
+# Opened once per worker process by _initialize_worker. The columns are memory-mapped, so every
+# worker reads the same page-cache pages instead of receiving a pickled copy of the prices.
+_worker_price_store: Optional[ColumnarPriceStore] = None
+
+
+def _initialize_worker(price_store_directory: str) -> None:
+    global _worker_price_store
+
+    apply_log_profile("sweep_worker")
+    _worker_price_store = ColumnarPriceStore(price_store_directory)
+
+
+def _run_backtest(parameters: dict, from_timestamp: int, to_timestamp: int, initial_balance: float,
+                  profile_mode: str = "") -> Tuple[dict, Optional[Tuple[dict, float]]]:
+    settings = Settings()
+    for name, value in parameters.items():
+        setattr(settings, name, value)
+
+    # The worker's profile (call stacks and wall time) is sent back with the result and merged by the parent.
+    profiler = BacktestProfiler(profile_mode, sampling_interval=settings.profile_sampling_interval) if profile_mode else None
+    if profiler is not None:
+        profiler.start()
+
+    historical_duration_ms = settings.grid_historical_days * 24 * 60 * 60 * 1000
+    price_series = _worker_price_store.read_range(int(from_timestamp - historical_duration_ms), to_timestamp)
+
+    backtest_engine = VectorizedBacktestEngine(settings, GridLevelsCalculator())
+    result = backtest_engine.run(price_series, from_timestamp, to_timestamp, initial_balance)
+
+    profile = None
+    if profiler is not None:
+        profiler.stop()
+        profile = dict(profiler.stacks), profiler.wall_time
+
+    return {
+        **parameters,
+        "total_profit": result.total_profit,
+        "trade_count": len(result.trade_results),
+        "max_drawdown": result.max_drawdown,
+        "final_balance": result.final_balance,
+        "open_lots": len(result.open_orders),
+    }, profile
+
+
+class ParameterSweep:
+    sweepable_parameters = ("grid_levels_count", "buy_percentage", "grid_historical_days", "grid_threshold_factor")
+
+    def __init__(self, price_store_directory: str, from_timestamp: int, to_timestamp: int,
+                 initial_balance: float = 300, max_workers: Optional[int] = None, profile_mode: Optional[str] = None):
+        if not ColumnarPriceStore.exists(price_store_directory):
+            raise FileNotFoundError(
+                f"Columnar price store '{price_store_directory}' not found. Run convert_historical_data.py first."
+            )
+
+        self.price_store_directory = price_store_directory
+        self.from_timestamp = from_timestamp
+        self.to_timestamp = to_timestamp
+        self.initial_balance = initial_balance
+        self.max_workers = max_workers or os.cpu_count()
+        self.settings = Settings()
+        self.profile_mode = profile_mode if profile_mode is not None else self.settings.profile_mode
+
+    def run(self, parameter_grid: Dict[str, List]) -> List[dict]:
+        unknown_parameters = set(parameter_grid) - set(self.sweepable_parameters)
+        if unknown_parameters:
+            raise ValueError(f"Unsupported sweep parameters: {', '.join(sorted(unknown_parameters))}")
+
+        names = list(parameter_grid)
+        combinations = [dict(zip(names, values)) for values in itertools.product(*parameter_grid.values())]
+
+        logger.info("Starting parameter sweep: %s backtests on %s workers...", len(combinations), self.max_workers)
+
+        with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_initialize_worker,
+                initargs=(self.price_store_directory,)
+        ) as executor:
+            outcomes = list(executor.map(
+                _run_backtest,
+                combinations,
+                itertools.repeat(self.from_timestamp),
+                itertools.repeat(self.to_timestamp),
+                itertools.repeat(self.initial_balance),
+                itertools.repeat(self.profile_mode),
+            ))
+
+        results = [row for row, _ in outcomes]
+        if self.profile_mode:
+            self.__write_profile([profile for _, profile in outcomes])
+
+        results.sort(key=lambda row: row["total_profit"], reverse=True)
+
+        logger.info("Parameter sweep finished. Best run: %s", results[0] if results else None)
+
+        return results
+
+    def __write_profile(self, profiles: List[Tuple[dict, float]]) -> None:
+        # One report for the whole sweep: the time of every backtest, summed per call stack.
+        profiler = BacktestProfiler(
+            self.profile_mode,
+            self.settings.profile_output_directory,
+            self.settings.profile_top_n,
+            self.settings.profile_sampling_interval
+        )
+        for stacks, wall_time in profiles:
+            profiler.merge(stacks, wall_time)
+        profiler.write_report("sweep")
+
+    @staticmethod
+    def write_results(results: List[dict], path: str) -> None:
+        if not results:
+            logger.warning("No sweep results to write.")
+            return
+
+        with open(path, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(results[0].keys()))
+            writer.writeheader()
+            writer.writerows(results)
+
+        logger.info("Sweep results written to %s", path)
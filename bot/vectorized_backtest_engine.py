@@ -0,0 +1,253 @@
+import bisect
+import secrets
+import string
+from decimal import Decimal, ROUND_DOWN
+from typing import Optional, Union
+
+import numpy as np
+
+from bot.grid_levels_calculator import GridLevelsCalculator
+from bot.volatility_tracker import VolatilityTracker
+from configs.settings import Settings
+from data.base_price_distribution import BasePriceDistribution
+from data.price_distribution_factory import create_price_distribution
+from models.backtest_result import BacktestResult
+from models.grid_levels import GridLevels
+from models.order import Order
+from models.price_series import PriceSeries
+from models.uniform_grid_levels import UniformGridLevels
+from utils.datetime_utils import format_timestamp
+from utils.logging_utils import setup_logger
+
+
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
+
+
+class VectorizedBacktestEngine:
+    """
+    Replays GridSpotStrategy over a PriceSeries without calling it tick by tick.
+
+    Grid cells and buy/sell zones are classified for a whole recalculation segment
+    with array operations. Only ticks that land in a buy or sell zone are visited,
+    and they are visited with plain floats instead of Order objects and logging.
+    The produced trade_results match the loop engine in GridBot.run_backtest.
+    """
+
+    min_sell_profit = 0.02
+
+    def __init__(self, settings: Settings, grid_levels_calculator: GridLevelsCalculator, qty_precision: Optional[int] = None):
+        self.settings = settings
+        self.grid_levels_calculator = grid_levels_calculator
+        self.qty_precision = settings.qty_precision if qty_precision is None else qty_precision
+
+    def run(self, price_series: PriceSeries, from_timestamp: int, to_timestamp: int, initial_balance: float) -> BacktestResult:
+        timestamps = price_series.timestamps
+        prices = price_series.prices
+
+        start, end = price_series.index_range(from_timestamp, to_timestamp)
+        logger.info("Vectorized backtest over %d ticks from %s to %s...",
+                    end - start, format_timestamp(from_timestamp), format_timestamp(to_timestamp))
+
+        balance = float(initial_balance)
+        held_amount = 0.0
+        event_indexes = []
+        balances_after_events = []
+        held_amounts_after_events = []
+        open_lots = []
+        lot_sequence = 0
+        trade_results = []
+
+        grid_levels = GridLevels(levels=[], min=0, max=0)
+
+        for segment_start, segment_end, recalculated_grid_levels in self.__iterate_segments(price_series, start, end, from_timestamp):
+            if recalculated_grid_levels is not None:
+                grid_levels = recalculated_grid_levels
+
+            if len(grid_levels) == 0:
+                continue
+
+            buy_zone, sell_zone = self.__classify_zones(prices[segment_start:segment_end], grid_levels)
+            event_offsets = np.flatnonzero(buy_zone | sell_zone)
+
+            for offset in event_offsets.tolist():
+                index = segment_start + offset
+                current_price = float(prices[index])
+
+                amount_to_spend = max(balance * self.settings.buy_percentage, self.settings.min_transaction_amount)
+
+                if buy_zone[offset] and balance >= amount_to_spend:
+                    bought_amount = self.__round_to_precision(amount_to_spend / current_price)
+                    if bought_amount == 0 or bought_amount * current_price > balance:
+                        continue
+
+                    balance -= bought_amount * current_price
+                    held_amount += bought_amount
+                    bisect.insort(open_lots, (current_price, lot_sequence, bought_amount))
+                    lot_sequence += 1
+
+                    event_indexes.append(index)
+                    balances_after_events.append(balance)
+                    held_amounts_after_events.append(held_amount)
+                    continue
+
+                if not sell_zone[offset]:
+                    continue
+
+                lot_index = self.__find_sellable_lot(open_lots, current_price)
+                if lot_index is None:
+                    continue
+
+                buy_price, _, amount = open_lots.pop(lot_index)
+                trade_results.append({
+                    "action": "Sell",
+                    "buy_price": buy_price,
+                    "sell_price": current_price,
+                    "amount": amount,
+                    "profit": (current_price - buy_price) * amount,
+                    "timestamp": int(timestamps[index]),
+                })
+                balance += amount * current_price
+                held_amount -= amount
+
+                event_indexes.append(index)
+                balances_after_events.append(balance)
+                held_amounts_after_events.append(held_amount)
+
+        open_orders = [
+            Order(
+                order_link_id=''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(16)),
+                amount=amount,
+                price=buy_price,
+                allow_to_sell=True,
+                action="Buy"
+            )
+            for buy_price, _, amount in sorted(open_lots, key=lambda lot: lot[1])
+        ]
+
+        logger.info("Vectorized backtest finished: %d trades, %d open lots.", len(trade_results), len(open_orders))
+
+        max_drawdown = self.__calculate_max_drawdown(
+            prices, start, end, float(initial_balance), event_indexes, balances_after_events, held_amounts_after_events
+        )
+
+        return BacktestResult(
+            trade_results=trade_results,
+            final_balance=balance,
+            open_orders=open_orders,
+            max_drawdown=max_drawdown
+        )
+
+    @staticmethod
+    def __calculate_max_drawdown(prices, start, end, initial_balance, event_indexes, balances_after_events, held_amounts_after_events):
+        # Equity only changes through fills or through the price of the lots we hold, so the
+        # per-tick cash and position can be rebuilt from the fill events with a single searchsorted.
+        if end <= start or not event_indexes:
+            return 0.0
+
+        last_event_positions = np.searchsorted(event_indexes, np.arange(start, end), side="right") - 1
+        has_event = last_event_positions >= 0
+        clipped_positions = np.clip(last_event_positions, 0, None)
+
+        cash = np.where(has_event, np.asarray(balances_after_events)[clipped_positions], initial_balance)
+        held = np.where(has_event, np.asarray(held_amounts_after_events)[clipped_positions], 0.0)
+
+        equity = cash + held * prices[start:end]
+        peak_equity = np.maximum.accumulate(equity)
+        drawdowns = np.divide(peak_equity - equity, peak_equity, out=np.zeros_like(equity), where=peak_equity > 0)
+
+        return float(drawdowns.max())
+
+    def __iterate_segments(self, price_series: PriceSeries, start: int, end: int, from_timestamp: int):
+        if self.settings.grid_recalculation_mode == "adaptive":
+            yield from self.__iterate_adaptive_segments(price_series, start, end)
+            return
+        if self.settings.grid_recalculation_mode != "timer":
+            raise ValueError(f"Unknown grid recalculation mode: {self.settings.grid_recalculation_mode}")
+
+        # Mirrors the loop engine schedule: the grid is recalculated on the first tick at or past
+        # next_grid_recalculation_time, after which the deadline moves forward by exactly one interval.
+        timestamps = price_series.timestamps
+        recalculation_interval_ms = 24 * 60 * 60 * 1000
+        price_window = create_price_distribution(self.settings)
+
+        next_grid_recalculation_time = from_timestamp
+        segment_start = start
+
+        while segment_start < end:
+            current_datetime_timestamp = int(timestamps[segment_start])
+            grid_levels = None
+
+            if current_datetime_timestamp >= next_grid_recalculation_time:
+                grid_levels = self.__calculate_grid_levels(price_window, price_series, current_datetime_timestamp)
+                next_grid_recalculation_time += recalculation_interval_ms
+
+            next_recalculation_index = int(np.searchsorted(timestamps, next_grid_recalculation_time, side="left"))
+            segment_end = min(max(next_recalculation_index, segment_start + 1), end)
+
+            yield segment_start, segment_end, grid_levels
+            segment_start = segment_end
+
+    def __iterate_adaptive_segments(self, price_series: PriceSeries, start: int, end: int):
+        # The tracker needs every tick, but only a float update each; a segment ends at the first
+        # tick that asks for a recalculation, exactly as in the loop engine.
+        volatility_tracker = VolatilityTracker.from_settings(self.settings)
+        price_window = create_price_distribution(self.settings)
+
+        segment_start = start
+        grid_levels = None
+
+        for index, (current_datetime_timestamp, current_price) in enumerate(
+                zip(price_series.timestamps[start:end].tolist(), price_series.prices[start:end].tolist()), start
+        ):
+            volatility_tracker.update(current_datetime_timestamp, current_price)
+            if volatility_tracker.get_recalculation_reason(current_datetime_timestamp, current_price) is None:
+                continue
+
+            if index > segment_start:
+                yield segment_start, index, grid_levels
+
+            grid_levels = self.__calculate_grid_levels(price_window, price_series, current_datetime_timestamp)
+            volatility_tracker.mark_recalculated(current_datetime_timestamp, price_window)
+            segment_start = index
+
+        if segment_start < end:
+            yield segment_start, end, grid_levels
+
+    def __calculate_grid_levels(self, price_window: BasePriceDistribution, price_series: PriceSeries, current_datetime_timestamp: int):
+        price_window.advance(price_series, current_datetime_timestamp)
+
+        if len(price_window) == 0:
+            logger.warning("No historical prices available for calculation. Current time: %s",
+                           format_timestamp(current_datetime_timestamp))
+            return None
+
+        return self.grid_levels_calculator.calculate_uniform_grid_levels_from_step(
+            price_window, self.settings.grid_levels_count
+        )
+
+    def __classify_zones(self, segment_prices: np.ndarray, grid_levels: Union[GridLevels, UniformGridLevels]):
+        lower_grid, upper_grid, has_lower, has_upper = grid_levels.find_nearest_levels_array(segment_prices)
+
+        grid_distance = np.where(has_lower & has_upper, upper_grid - lower_grid, 0.0)
+        lower_buy_threshold = lower_grid + grid_distance * self.settings.grid_threshold_factor
+        upper_sell_threshold = upper_grid - grid_distance * self.settings.grid_threshold_factor
+
+        within_grid = (segment_prices >= grid_levels.min) & (segment_prices <= grid_levels.max)
+
+        buy_zone = within_grid & has_lower & (lower_grid <= segment_prices) & (segment_prices < lower_buy_threshold)
+        sell_zone = within_grid & has_upper & (upper_grid >= segment_prices) & (segment_prices > upper_sell_threshold)
+
+        return buy_zone, sell_zone
+
+    def __find_sellable_lot(self, open_lots, current_price: float):
+        for lot_index, (buy_price, _, amount) in enumerate(open_lots):
+            if buy_price >= current_price:
+                return None
+            if (current_price - buy_price) * amount > self.min_sell_profit:
+                return lot_index
+        return None
+
+    def __round_to_precision(self, value):
+        decimal_value = Decimal(value)
+        rounded_value = decimal_value.quantize(Decimal(f'1e-{self.qty_precision}'), rounding=ROUND_DOWN)
+        return float(rounded_value)
@@ -0,0 +1,116 @@
+import math
+from typing import Optional
+
+from configs.settings import Settings
+from data.base_price_distribution import BasePriceDistribution
+
+
+class VolatilityTracker:
+    """
+    Decides when the grid is worth recalculating, from the price stream alone and in O(1) per tick.
+
+    Realized volatility is a time-weighted EWMA of squared log returns, scaled to one day. The
+    grid is recalculated when
+      - the daily volatility crosses `threshold`, give or take volatility_hysteresis, in either
+        direction since the last grid,
+      - the price leaves the grid's 5th-95th percentile range by more than `threshold`,
+      - or max_interval_ms passed without either,
+    but never sooner than min_interval_ms after the previous recalculation.
+    """
+
+    day_ms = 24 * 60 * 60 * 1000
+    # Returns needed before the volatility estimate is trusted.
+    min_samples = 30
+    # Relative band around the threshold, so an estimate hovering at it does not flip back and forth.
+    volatility_hysteresis = 0.1
+
+    def __init__(self, threshold: float, half_life_ms: float, min_interval_ms: float, max_interval_ms: float):
+        self.threshold = threshold
+        self.half_life_ms = half_life_ms
+        self.min_interval_ms = min_interval_ms
+        self.max_interval_ms = max_interval_ms
+
+        self.__last_timestamp: Optional[int] = None
+        self.__last_price: Optional[float] = None
+        self.__variance_rate: Optional[float] = None
+        self.__sample_count = 0
+
+        self.__recalculated_at: Optional[int] = None
+        self.__lower_bound: Optional[float] = None
+        self.__upper_bound: Optional[float] = None
+        self.__was_volatile: Optional[bool] = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "VolatilityTracker":
+        return cls(
+            threshold=settings.volatility_threshold,
+            half_life_ms=settings.volatility_half_life_minutes * 60 * 1000,
+            min_interval_ms=settings.grid_min_recalculation_minutes * 60 * 1000,
+            max_interval_ms=settings.grid_max_recalculation_hours * 60 * 60 * 1000,
+        )
+
+    @property
+    def volatility(self) -> Optional[float]:
+        if self.__sample_count < self.min_samples:
+            return None
+        return math.sqrt(self.__variance_rate * self.day_ms)
+
+    def update(self, timestamp: int, price: float) -> None:
+        if self.__last_price is not None and timestamp > self.__last_timestamp and price > 0:
+            elapsed_ms = timestamp - self.__last_timestamp
+            log_return = math.log(price / self.__last_price)
+            # Variance per millisecond, so irregular tick spacing does not bias the estimate.
+            sample = log_return * log_return / elapsed_ms
+
+            if self.__variance_rate is None:
+                self.__variance_rate = sample
+            else:
+                decay = math.exp(-math.log(2) * elapsed_ms / self.half_life_ms)
+                self.__variance_rate = decay * self.__variance_rate + (1 - decay) * sample
+            self.__sample_count += 1
+
+        if self.__last_timestamp is None or timestamp >= self.__last_timestamp:
+            self.__last_timestamp = timestamp
+            self.__last_price = price
+
+        # The grid may have been calculated before the estimate warmed up; the regime it was
+        # calculated in is then taken from the first trusted estimate.
+        if self.__was_volatile is None and self.__recalculated_at is not None and self.volatility is not None:
+            self.__was_volatile = self.volatility > self.threshold
+
+    def get_recalculation_reason(self, timestamp: int, price: float) -> Optional[str]:
+        if self.__recalculated_at is None:
+            return "no grid yet"
+
+        elapsed_ms = timestamp - self.__recalculated_at
+        if elapsed_ms < self.min_interval_ms:
+            return None
+        if elapsed_ms >= self.max_interval_ms:
+            return f"{elapsed_ms / 3_600_000:.1f}h since the last recalculation"
+
+        if self.__lower_bound is not None and price < self.__lower_bound * (1 - self.threshold):
+            return f"price {price:.2f} fell below the grid range ({self.__lower_bound:.2f})"
+        if self.__upper_bound is not None and price > self.__upper_bound * (1 + self.threshold):
+            return f"price {price:.2f} rose above the grid range ({self.__upper_bound:.2f})"
+
+        volatility = self.volatility
+        if volatility is not None and self.__was_volatile is not None:
+            if self.__was_volatile and volatility < self.threshold * (1 - self.volatility_hysteresis):
+                return f"daily volatility {volatility:.2%} fell below {self.threshold:.2%}"
+            if not self.__was_volatile and volatility > self.threshold * (1 + self.volatility_hysteresis):
+                return f"daily volatility {volatility:.2%} rose above {self.threshold:.2%}"
+
+        return None
+
+    def mark_recalculated(self, timestamp: int, price_distribution: Optional[BasePriceDistribution] = None) -> None:
+        self.__recalculated_at = timestamp
+
+        # Same bounds GridLevelsCalculator derives the grid from.
+        if price_distribution is not None and len(price_distribution) > 0:
+            self.__lower_bound = price_distribution.percentile(5)
+            self.__upper_bound = price_distribution.percentile(95)
+        else:
+            self.__lower_bound = self.__upper_bound = None
+
+        volatility = self.volatility
+        self.__was_volatile = volatility > self.threshold if volatility is not None else None
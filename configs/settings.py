@@ -14,18 +14,85 @@ class Settings:
         self.aws_access_key = os.getenv("AWS_ACCESS_KEY")
         self.aws_secret_key = os.getenv("AWS_SECRET_KEY")
 
+        # Order Storage Settings
+        self.order_storage = os.getenv("ORDER_STORAGE", "dynamodb").lower()
+        self.order_database_path = os.getenv("ORDER_DATABASE_PATH", "storage/orders.sqlite")
+        self.order_cache_enabled = os.getenv("ORDER_CACHE_ENABLED", "true").lower() == "true"
+        self.order_cache_reconcile_interval = int(os.getenv("ORDER_CACHE_RECONCILE_INTERVAL", 0))
+        # GSI on sellStatus, used when the order cache is off. Orders stored before it was enabled have no
+        # sellStatus; each process tags them once (backfill_pending_index) and scans until that succeeded.
+        self.dynamodb_pending_index = os.getenv("DYNAMODB_PENDING_INDEX", "")
+
+        # Stream Settings
+        self.order_stream_enabled = os.getenv("ORDER_STREAM_ENABLED", "false").lower() == "true"
+        self.order_poll_interval = int(os.getenv("ORDER_POLL_INTERVAL", 300))
+        self.price_stream_enabled = os.getenv("PRICE_STREAM_ENABLED", "false").lower() == "true"
+
+        # API Client Settings
+        self.api_requests_per_second = float(os.getenv("API_REQUESTS_PER_SECOND", 10))
+        self.api_max_retries = int(os.getenv("API_MAX_RETRIES", 3))
+        self.api_backoff_base = float(os.getenv("API_BACKOFF_BASE", 0.5))
+        self.api_backoff_max = float(os.getenv("API_BACKOFF_MAX", 30))
+        self.api_connection_pool_size = int(os.getenv("API_CONNECTION_POOL_SIZE", 10))
+        # Longer than TRADING_INTERVAL, so polling iterations reuse wallet balances: they are already dropped after
+        # every order, cancellation and fill, and the TTL only bounds how long deposits or manual trades go unseen.
+        self.balance_cache_ttl = float(os.getenv("BALANCE_CACHE_TTL", 180))
+        self.instrument_cache_path = os.getenv("INSTRUMENT_CACHE_PATH", "cache/instruments.json")
+        self.instrument_cache_ttl = float(os.getenv("INSTRUMENT_CACHE_TTL", 24 * 60 * 60))
+
         # Telegram Credentials
         self.telegram_bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
         self.telegram_chat_id = os.getenv("TELEGRAM_CHAT_ID")
+        self.telegram_queue_size = int(os.getenv("TELEGRAM_QUEUE_SIZE", 100))
+        self.telegram_messages_per_second = float(os.getenv("TELEGRAM_MESSAGES_PER_SECOND", 1))
+        self.telegram_timeout = float(os.getenv("TELEGRAM_TIMEOUT", 10))
 
         # General Bot Settings
         self.symbol = os.getenv("SYMBOL", "BTCUSDT")
         self.grid_levels_count = int(os.getenv("GRID_LEVELS_COUNT", 20))
         self.volatility_threshold = float(os.getenv("VOLATILITY_THRESHOLD", 0.05))
+        self.grid_recalculation_mode = os.getenv("GRID_RECALCULATION_MODE", "timer").lower()
+        self.volatility_half_life_minutes = float(os.getenv("VOLATILITY_HALF_LIFE_MINUTES", 360))
+        self.grid_min_recalculation_minutes = float(os.getenv("GRID_MIN_RECALCULATION_MINUTES", 15))
+        self.grid_max_recalculation_hours = float(os.getenv("GRID_MAX_RECALCULATION_HOURS", 7 * 24))
         self.profit_target = float(os.getenv("PROFIT_TARGET", 0.02))
         self.btc_per_trade = float(os.getenv("BTC_PER_TRADE", 0.0000314))
         self.buy_percentage = float(os.getenv("BUY_PERCENTAGE", 0.005))
+        self.grid_threshold_factor = float(os.getenv("GRID_THRESHOLD_FACTOR", 0.30))
         self.min_transaction_amount = float(os.getenv("MIN_TRANSACTION_AMOUNT", 6))
         self.grid_historical_days = float(os.getenv("GRID_HISTORICAL_DAYS", 61))
         self.trading_interval = int(os.getenv("TRADING_INTERVAL", 60))
-        self.qty_precision = int(os.getenv("QTY_PRECISION", 6))
\ No newline at end of file
+        self.qty_precision = int(os.getenv("QTY_PRECISION", 6))
+        self.live_io_workers = int(os.getenv("LIVE_IO_WORKERS", 4))
+
+        # Price Distribution Settings
+        self.price_distribution = os.getenv("PRICE_DISTRIBUTION", "window").lower()
+        self.price_sketch_path = os.getenv("PRICE_SKETCH_PATH", "cache/price_sketch.json")
+        self.price_sketch_compression = float(os.getenv("PRICE_SKETCH_COMPRESSION", 200))
+        self.price_sketch_half_life_days = float(os.getenv("PRICE_SKETCH_HALF_LIFE_DAYS", 0))
+
+        # Logging Settings
+        self.log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+        self.log_module_levels = os.getenv("LOG_MODULE_LEVELS", "")
+        self.log_async = os.getenv("LOG_ASYNC", "true").lower() == "true"
+        self.log_profile = os.getenv("LOG_PROFILE", "live")
+
+        # Metrics Settings
+        self.metrics_server_enabled = os.getenv("METRICS_SERVER_ENABLED", "false").lower() == "true"
+        self.metrics_host = os.getenv("METRICS_HOST", "127.0.0.1")
+        self.metrics_port = int(os.getenv("METRICS_PORT", 9108))
+        self.metrics_log_interval = int(os.getenv("METRICS_LOG_INTERVAL", 60))
+
+        # Market Data Settings
+        self.kline_cache_path = os.getenv("KLINE_CACHE_PATH", "cache/klines.sqlite")
+        self.kline_download_workers = int(os.getenv("KLINE_DOWNLOAD_WORKERS", 4))
+        self.kline_requests_per_second = float(os.getenv("KLINE_REQUESTS_PER_SECOND", 10))
+        self.kline_download_retries = int(os.getenv("KLINE_DOWNLOAD_RETRIES", 2))
+
+        # Backtest Settings
+        self.historical_data_file = os.getenv("HISTORICAL_DATA_FILE", "historical/btc_historical_data_sorted.json")
+        self.historical_data_store = os.getenv("HISTORICAL_DATA_STORE", "historical/btc_historical_data")
+        self.profile_mode = os.getenv("PROFILE_MODE", "").lower()
+        self.profile_output_directory = os.getenv("PROFILE_OUTPUT_DIRECTORY", "profiles")
+        self.profile_top_n = int(os.getenv("PROFILE_TOP_N", 25))
+        self.profile_sampling_interval = float(os.getenv("PROFILE_SAMPLING_INTERVAL", 0.002))
@@ -0,0 +1,6 @@
+from configs.settings import Settings
+from data.columnar_price_store import ColumnarPriceStore
+
+settings = Settings()
+
+ColumnarPriceStore.convert_from_json(settings.historical_data_file, settings.historical_data_store)
@@ -0,0 +1,11 @@
+from abc import ABC, abstractmethod
+
+
+class BasePriceDistribution(ABC):
+    @abstractmethod
+    def percentile(self, q: float) -> float:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
@@ -1,102 +1,258 @@
-from typing import List, Dict, Union
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from decimal import Decimal
+from typing import List, Dict, Optional, Union
 
 from api_managers.base_api_manager import BaseAPIManager
 from configs.settings import Settings
 from data.base_market_data import BaseMarketData
+from data.kline_cache import KlineCache
 from utils.datetime_utils import to_milliseconds_from_minutes, format_timestamp
 from utils.logging_utils import setup_logger
+from utils.rate_limiter import RateLimiter
+from utils.ttl_cache import TTLCache
 
 
-logger = setup_logger(log_dir="logs", days_to_keep=30)
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
 
 
 class BybitMarketData(BaseMarketData):
-    def __init__(self, api_manager: BaseAPIManager):
+    def __init__(self, api_manager: BaseAPIManager, kline_cache: Optional[KlineCache] = None):
         self.api_manager = api_manager
+        self.kline_cache = kline_cache
         self.settings = Settings()
+        self.kline_rate_limiter = RateLimiter(self.settings.kline_requests_per_second)
+        self.instrument_cache = TTLCache(self.settings.instrument_cache_ttl)
         logger.info("MarketData initialized successfully.")
 
     def get_min_order_amt(self, symbol: str) -> float:
-        logger.info(f"Fetching min order amount for symbol: {symbol}...")
-        try:
-            response = self.api_manager.safe_api_call(
-                self.api_manager.get_http_session().get_instruments_info, category="spot", symbol=symbol)
-
-            if response.get("retCode") == 0:
-                instruments = response.get("result", {}).get("list", [])
-                if instruments:
-                    min_order_amt = float(instruments[0]["lotSizeFilter"]["minOrderAmt"])
-                    logger.info(f"Min order amount for {symbol}: {min_order_amt}")
-                    return min_order_amt
-            logger.error(f"Error fetching min order amount: {response.get('retMsg')}")
+        instrument_filters = self.__get_instrument_filters(symbol)
+        if instrument_filters is None:
             return 5
 
-        except Exception as e:
-            logger.error(f"An error occurred while fetching min order amount for {symbol}: {e}", exc_info=True)
-            return 5
+        min_order_amt = instrument_filters["min_order_amt"]
+        logger.info("Min order amount for %s: %s", symbol, min_order_amt)
+        return min_order_amt
+
+    def get_qty_precision(self, symbol: str) -> int:
+        instrument_filters = self.__get_instrument_filters(symbol)
+        if instrument_filters is None:
+            return self.settings.qty_precision
+
+        return instrument_filters["qty_precision"]
 
     def get_current_price(self, symbol: str) -> float:
-        logger.info(f"Fetching current price for symbol: {symbol}...")
+        logger.info("Fetching current price for symbol: %s...", symbol)
         try:
             response = self.api_manager.safe_api_call(
                 self.api_manager.get_http_session().get_tickers, category="spot", symbol=symbol)
 
             if response.get("retCode") == 0:
                 current_price = float(response["result"]["list"][0]["lastPrice"])
-                logger.info(f"Current price for {symbol}: {current_price}")
+                logger.info("Current price for %s: %s", symbol, current_price)
                 return current_price
             else:
-                logger.error(f"Error fetching market price for {symbol}: {response['retMsg']}")
+                logger.error("Error fetching market price for %s: %s", symbol, response['retMsg'])
                 return 0.0
         except Exception as e:
-            logger.error(f"An error occurred while fetching market price for {symbol}: {e}", exc_info=True)
+            logger.error("An error occurred while fetching market price for %s: %s", symbol, e, exc_info=True)
             return 0.0
 
     def fetch_data_for_period(self, symbol: str, start_datetime: int, end_datetime: int, interval: str = "1") -> List[Dict[str, Union[int, float]]]:
-        logger.info(f"Fetching historical data for symbol: {symbol} "
-                    f"from {format_timestamp(start_datetime)} to {format_timestamp(end_datetime)} with interval {interval}...")
+        logger.info("Fetching historical data for symbol: %s from %s to %s with interval %s...",
+                    symbol, format_timestamp(start_datetime), format_timestamp(end_datetime), interval)
+        try:
+            if self.kline_cache is None:
+                completed_chunks, failed_chunks = self.__download_kline_chunks(symbol, start_datetime, end_datetime, interval)
+                self.__raise_if_incomplete(symbol, failed_chunks)
+
+                historical_prices = [entry for _, _, chunk_prices in completed_chunks for entry in chunk_prices]
+            else:
+                historical_prices = self.__fetch_with_cache(symbol, start_datetime, end_datetime, interval)
+
+            historical_prices = sorted(historical_prices, key=lambda x: x["timestamp"])
+            logger.info("Fetched total %s historical entries for %s.", len(historical_prices), symbol)
+            return historical_prices
+
+        except Exception as e:
+            logger.error("An error occurred while fetching historical data for %s: %s", symbol, e, exc_info=True)
+            return []
+
+    def __get_instrument_filters(self, symbol: str) -> Optional[Dict[str, Union[int, float]]]:
+        # Instrument filters practically never change, so they are kept in memory and on disk and
+        # only requested again once INSTRUMENT_CACHE_TTL has passed, also across restarts.
+        instrument_filters = self.instrument_cache.get(symbol)
+        if instrument_filters is not None:
+            return instrument_filters
+
+        stored_filters = self.__load_instrument_filters().get(symbol)
+        if stored_filters is not None and time.time() - stored_filters["fetched_at"] < self.settings.instrument_cache_ttl:
+            instrument_filters = stored_filters
+        else:
+            instrument_filters = self.__fetch_instrument_filters(symbol)
+            if instrument_filters is None:
+                return None
+            self.__store_instrument_filters(symbol, instrument_filters)
+
+        self.instrument_cache.set(
+            symbol, instrument_filters, self.settings.instrument_cache_ttl - (time.time() - instrument_filters["fetched_at"])
+        )
+        return instrument_filters
+
+    def __fetch_instrument_filters(self, symbol: str) -> Optional[Dict[str, Union[int, float]]]:
+        logger.info("Fetching instrument filters for symbol: %s...", symbol)
+        try:
+            response = self.api_manager.safe_api_call(
+                self.api_manager.get_http_session().get_instruments_info, category="spot", symbol=symbol)
+
+            if response and response.get("retCode") == 0:
+                instruments = response.get("result", {}).get("list", [])
+                if instruments:
+                    lot_size_filter = instruments[0]["lotSizeFilter"]
+                    return {
+                        "min_order_amt": float(lot_size_filter["minOrderAmt"]),
+                        "qty_precision": -Decimal(lot_size_filter["basePrecision"]).normalize().as_tuple().exponent,
+                        "fetched_at": time.time()
+                    }
+            logger.error("Error fetching instrument filters: %s",
+                         response.get('retMsg') if response else 'No response from API')
+            return None
+
+        except Exception as e:
+            logger.error("An error occurred while fetching instrument filters for %s: %s", symbol, e, exc_info=True)
+            return None
+
+    def __load_instrument_filters(self) -> Dict[str, Dict[str, Union[int, float]]]:
+        path = self.settings.instrument_cache_path
+        if not path or not os.path.exists(path):
+            return {}
+
+        try:
+            with open(path, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to read instrument cache %s: %s", path, e)
+            return {}
+
+    def __store_instrument_filters(self, symbol: str, instrument_filters: Dict[str, Union[int, float]]) -> None:
+        path = self.settings.instrument_cache_path
+        if not path:
+            return
+
+        stored_filters = self.__load_instrument_filters()
+        stored_filters[symbol] = instrument_filters
+
         try:
-            historical_prices = []
-            interval_milliseconds = to_milliseconds_from_minutes(interval)
-            max_duration = 200 * interval_milliseconds
-
-            while start_datetime < end_datetime:
-                current_end_time = min(start_datetime + max_duration, end_datetime)
-
-                logger.info(f"Fetching data from {format_timestamp(start_datetime)} to {format_timestamp(current_end_time)}...")
-
-                response = self.api_manager.safe_api_call(
-                    self.api_manager.get_http_session().get_kline,
-                    category="spot",
-                    symbol=symbol,
-                    interval=interval,
-                    start=start_datetime,
-                    end=current_end_time
+            directory = os.path.dirname(path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+
+            # Written to a temporary file first, so a crash never leaves a truncated cache behind.
+            temporary_path = f"{path}.tmp"
+            with open(temporary_path, "w") as file:
+                json.dump(stored_filters, file, indent=4)
+            os.replace(temporary_path, path)
+        except OSError as e:
+            logger.warning("Failed to write instrument cache %s: %s", path, e)
+
+    def __fetch_with_cache(self, symbol: str, start_datetime: int, end_datetime: int, interval: str) -> List[Dict[str, Union[int, float]]]:
+        interval_milliseconds = to_milliseconds_from_minutes(interval)
+        # The candle that is still open keeps changing, so coverage stops before it and the tail
+        # of the range is re-requested until that candle has closed.
+        last_closed_candle_end = (int(time.time() * 1000) // interval_milliseconds) * interval_milliseconds - 1
+
+        missing_ranges = self.kline_cache.get_missing_ranges(symbol, interval, start_datetime, end_datetime)
+        logger.info("Kline cache: %s missing range(s) for %s with interval %s.", len(missing_ranges), symbol, interval)
+
+        failed_chunks = []
+        for missing_start, missing_end in missing_ranges:
+            completed_chunks, missing_failed_chunks = self.__download_kline_chunks(symbol, missing_start, missing_end, interval)
+
+            # Completed chunks are kept even when others failed, so the next call only retries the gaps.
+            for chunk_start, chunk_end, chunk_prices in completed_chunks:
+                self.kline_cache.store(
+                    symbol, interval, chunk_prices, chunk_start, min(chunk_end, last_closed_candle_end)
                 )
+            failed_chunks.extend(missing_failed_chunks)
 
-                if response.get("retCode") == 0:
-                    kline_data = response.get("result", {}).get("list", [])
-                    if not kline_data:
-                        logger.warning(f"No kline data for the time period: {format_timestamp(start_datetime)} to {format_timestamp(current_end_time)}.")
-                        start_datetime = current_end_time + 1
-                        continue
+        self.__raise_if_incomplete(symbol, failed_chunks)
 
-                    for entry in kline_data:
-                        timestamp = int(entry[0])
-                        close_price = float(entry[4])
+        return self.kline_cache.load(symbol, interval, start_datetime, end_datetime)
 
-                        historical_prices.append({"timestamp": timestamp, "close_price": close_price})
+    def __download_kline_chunks(self, symbol: str, start_datetime: int, end_datetime: int, interval: str):
+        interval_milliseconds = to_milliseconds_from_minutes(interval)
+        # get_kline returns at most 200 candles, and start/end are both inclusive.
+        max_duration = 200 * interval_milliseconds - 1
 
-                    logger.info(f"Fetched {len(kline_data)} entries for {symbol} from {format_timestamp(start_datetime)} to {format_timestamp(current_end_time)}.")
-                    start_datetime = current_end_time + 1
-                else:
-                    logger.error(f"Error fetching historical data: {response.get('retMsg')}")
+        pending_chunks = []
+        while start_datetime < end_datetime:
+            current_end_time = min(start_datetime + max_duration, end_datetime)
+            pending_chunks.append((start_datetime, current_end_time))
+            start_datetime = current_end_time + 1
+
+        completed_chunks = []
+        workers = max(1, min(self.settings.kline_download_workers, len(pending_chunks)))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for attempt in range(self.settings.kline_download_retries + 1):
+                if not pending_chunks:
                     break
 
-            historical_prices = sorted(historical_prices, key=lambda x: x["timestamp"])
-            logger.info(f"Fetched total {len(historical_prices)} historical entries for {symbol}.")
-            return historical_prices
+                if attempt > 0:
+                    logger.warning("Retrying %s failed kline chunk(s) for %s (attempt %s/%s)...",
+                                   len(pending_chunks), symbol, attempt + 1, self.settings.kline_download_retries + 1)
 
-        except Exception as e:
-            logger.error(f"An error occurred while fetching historical data for {symbol}: {e}", exc_info=True)
-            return []
\ No newline at end of file
+                futures = {
+                    executor.submit(self.__fetch_kline_chunk, symbol, chunk_start, chunk_end, interval): (chunk_start, chunk_end)
+                    for chunk_start, chunk_end in pending_chunks
+                }
+
+                failed_chunks = []
+                for future in as_completed(futures):
+                    chunk_start, chunk_end = futures[future]
+                    try:
+                        completed_chunks.append((chunk_start, chunk_end, future.result()))
+                    except Exception as e:
+                        logger.warning("Failed to fetch kline chunk %s to %s: %s",
+                                       format_timestamp(chunk_start), format_timestamp(chunk_end), e)
+                        failed_chunks.append((chunk_start, chunk_end))
+
+                pending_chunks = sorted(failed_chunks)
+
+        completed_chunks.sort(key=lambda chunk: chunk[0])
+        return completed_chunks, pending_chunks
+
+    def __fetch_kline_chunk(self, symbol: str, start_datetime: int, end_datetime: int, interval: str) -> List[Dict[str, Union[int, float]]]:
+        self.kline_rate_limiter.acquire()
+
+        response = self.api_manager.safe_api_call(
+            self.api_manager.get_http_session().get_kline,
+            category="spot",
+            symbol=symbol,
+            interval=interval,
+            start=start_datetime,
+            end=end_datetime
+        )
+
+        if response is None:
+            raise RuntimeError("No response from API")
+        if response.get("retCode") != 0:
+            raise RuntimeError(response.get("retMsg"))
+
+        kline_data = response.get("result", {}).get("list", [])
+        if not kline_data:
+            logger.warning("No kline data for the time period: %s to %s.",
+                           format_timestamp(start_datetime), format_timestamp(end_datetime))
+        else:
+            logger.info("Fetched %s entries for %s from %s to %s.",
+                        len(kline_data), symbol, format_timestamp(start_datetime), format_timestamp(end_datetime))
+
+        return [{"timestamp": int(entry[0]), "close_price": float(entry[4])} for entry in kline_data]
+
+    @staticmethod
+    def __raise_if_incomplete(symbol: str, failed_chunks) -> None:
+        if failed_chunks:
+            missing = ", ".join(f"{format_timestamp(start)} to {format_timestamp(end)}" for start, end in failed_chunks)
+            raise RuntimeError(f"Kline download for {symbol} is incomplete. Missing chunks: {missing}")
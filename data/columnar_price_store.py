@@ -0,0 +1,83 @@
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+
+from models.price_series import PriceSeries
+from utils.logging_utils import setup_logger
+
+
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
+
+
+class ColumnarPriceStore:
+    """
+    Historical prices stored as one .npy file per column in a directory: an int64 "timestamp"
+    column sorted ascending, plus float64 price columns ("price" and, when present, OHLC/volume).
+    Columns are memory-mapped read-only, so opening the store and reading a range only touches
+    the pages that are actually used.
+    """
+
+    timestamp_column = "timestamp"
+    price_columns = ("price", "open", "high", "low", "close", "volume")
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+        self.timestamps = np.load(self.__column_path(self.timestamp_column), mmap_mode="r")
+        self.columns: Dict[str, np.ndarray] = {}
+
+        for column in self.price_columns:
+            path = self.__column_path(column)
+            if os.path.exists(path):
+                self.columns[column] = np.load(path, mmap_mode="r")
+
+        logger.info("Opened columnar price store '%s' with %s rows and columns: %s",
+                    directory, len(self.timestamps), ', '.join(self.columns))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def exists(cls, directory: str) -> bool:
+        return os.path.exists(os.path.join(directory, f"{cls.timestamp_column}.npy"))
+
+    def read_range(self, from_timestamp: int, to_timestamp: int, column: str = "price") -> PriceSeries:
+        if column not in self.columns:
+            raise KeyError(f"Column '{column}' is not available in price store '{self.directory}'")
+
+        start = int(np.searchsorted(self.timestamps, from_timestamp, side="left"))
+        end = int(np.searchsorted(self.timestamps, to_timestamp, side="right"))
+
+        return PriceSeries(self.timestamps[start:end], self.columns[column][start:end])
+
+    @classmethod
+    def convert_from_json(cls, json_path: str, directory: str) -> "ColumnarPriceStore":
+        logger.info("Converting '%s' to columnar price store '%s'...", json_path, directory)
+
+        with open(json_path, "r") as file:
+            records: List[dict] = json.load(file)
+
+        if not records:
+            raise ValueError(f"No records found in '{json_path}'")
+
+        timestamps = np.fromiter((record["timestamp"] for record in records), dtype=np.int64, count=len(records))
+        order = np.argsort(timestamps, kind="stable")
+
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, f"{cls.timestamp_column}.npy"), timestamps[order])
+
+        for column in cls.price_columns:
+            if column not in records[0]:
+                continue
+
+            values = np.fromiter((float(record[column]) for record in records), dtype=np.float64, count=len(records))
+            np.save(os.path.join(directory, f"{column}.npy"), values[order])
+
+        logger.info("Converted %s records to '%s'.", len(records), directory)
+
+        return cls(directory)
+
+    def __column_path(self, column: str) -> str:
+        return os.path.join(self.directory, f"{column}.npy")
@@ -0,0 +1,111 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Tuple, Union
+
+from utils.logging_utils import setup_logger
+
+
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
+
+
+class KlineCache:
+    """
+    On-disk SQLite store of close prices per symbol/interval. Besides the candles themselves it
+    records which [start, end] ranges have been fully downloaded, so callers can ask for the gaps
+    and only fetch those. Candles are keyed by (symbol, interval, timestamp), so overlapping
+    downloads are deduplicated on insert.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.__lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS klines ("
+            "symbol TEXT NOT NULL, interval TEXT NOT NULL, timestamp INTEGER NOT NULL, close_price REAL NOT NULL, "
+            "PRIMARY KEY (symbol, interval, timestamp)) WITHOUT ROWID"
+        )
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS coverage ("
+            "symbol TEXT NOT NULL, interval TEXT NOT NULL, start INTEGER NOT NULL, end INTEGER NOT NULL)"
+        )
+        self.connection.commit()
+
+        logger.info("Kline cache opened at %s", path)
+
+    def get_missing_ranges(self, symbol: str, interval: str, start: int, end: int) -> List[Tuple[int, int]]:
+        missing_ranges = []
+        cursor = start
+
+        for covered_start, covered_end in self.__get_coverage(symbol, interval):
+            if covered_end < cursor:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > cursor:
+                missing_ranges.append((cursor, covered_start - 1))
+            cursor = max(cursor, covered_end + 1)
+            if cursor > end:
+                break
+
+        if cursor <= end:
+            missing_ranges.append((cursor, end))
+
+        return missing_ranges
+
+    def store(self, symbol: str, interval: str, klines: List[Dict[str, Union[int, float]]], covered_start: int, covered_end: int) -> None:
+        with self.__lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO klines (symbol, interval, timestamp, close_price) VALUES (?, ?, ?, ?)",
+                [(symbol, interval, kline["timestamp"], kline["close_price"]) for kline in klines]
+            )
+
+            if covered_start <= covered_end:
+                self.__add_coverage(symbol, interval, covered_start, covered_end)
+
+    def load(self, symbol: str, interval: str, start: int, end: int) -> List[Dict[str, Union[int, float]]]:
+        with self.__lock:
+            rows = self.connection.execute(
+                "SELECT timestamp, close_price FROM klines "
+                "WHERE symbol = ? AND interval = ? AND timestamp BETWEEN ? AND ? ORDER BY timestamp",
+                (symbol, interval, start, end)
+            ).fetchall()
+
+        return [{"timestamp": timestamp, "close_price": close_price} for timestamp, close_price in rows]
+
+    def __get_coverage(self, symbol: str, interval: str) -> List[Tuple[int, int]]:
+        with self.__lock:
+            return self.connection.execute(
+                "SELECT start, end FROM coverage WHERE symbol = ? AND interval = ? ORDER BY start",
+                (symbol, interval)
+            ).fetchall()
+
+    def __add_coverage(self, symbol: str, interval: str, start: int, end: int) -> None:
+        # Called inside the store() transaction: merge the new range with every overlapping or
+        # adjacent one and rewrite the symbol/interval coverage as a minimal set of ranges.
+        ranges = self.connection.execute(
+            "SELECT start, end FROM coverage WHERE symbol = ? AND interval = ? ORDER BY start",
+            (symbol, interval)
+        ).fetchall()
+        ranges.append((start, end))
+        ranges.sort()
+
+        merged_ranges = [list(ranges[0])]
+        for range_start, range_end in ranges[1:]:
+            if range_start <= merged_ranges[-1][1] + 1:
+                merged_ranges[-1][1] = max(merged_ranges[-1][1], range_end)
+            else:
+                merged_ranges.append([range_start, range_end])
+
+        self.connection.execute("DELETE FROM coverage WHERE symbol = ? AND interval = ?", (symbol, interval))
+        self.connection.executemany(
+            "INSERT INTO coverage (symbol, interval, start, end) VALUES (?, ?, ?, ?)",
+            [(symbol, interval, range_start, range_end) for range_start, range_end in merged_ranges]
+        )
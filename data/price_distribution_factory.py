@@ -0,0 +1,19 @@
+from configs.settings import Settings
+from data.base_price_distribution import BasePriceDistribution
+from data.rolling_price_window import RollingPriceWindow
+from data.streaming_price_distribution import StreamingPriceDistribution
+
+
+def create_price_distribution(settings: Settings) -> BasePriceDistribution:
+    # Shared by the live loop and both backtest engines, so PRICE_DISTRIBUTION means the same everywhere.
+    window_duration_ms = settings.grid_historical_days * 24 * 60 * 60 * 1000
+
+    if settings.price_distribution == "window":
+        return RollingPriceWindow(window_duration_ms)
+    if settings.price_distribution != "sketch":
+        raise ValueError(f"Unknown price distribution: {settings.price_distribution}")
+
+    half_life_ms = settings.price_sketch_half_life_days * 24 * 60 * 60 * 1000 or None
+    return StreamingPriceDistribution(
+        window_duration_ms, half_life_ms=half_life_ms, compression=settings.price_sketch_compression
+    )
@@ -0,0 +1,89 @@
+import math
+from collections import deque
+from typing import List, Optional
+
+import numpy as np
+
+from data.base_price_distribution import BasePriceDistribution
+from models.price_series import PriceSeries
+from utils.sorted_list import SortedList
+
+
+class RollingPriceWindow(BasePriceDistribution):
+    """
+    Prices from the last window_duration_ms milliseconds, kept both in time order (for eviction)
+    and in a SortedList (for order statistics). percentile() matches np.percentile's default
+    linear method without copying or re-sorting the window.
+    """
+
+    def __init__(self, window_duration_ms: float):
+        self.window_duration_ms = window_duration_ms
+
+        self.__entries = deque()
+        self.__sorted_prices = SortedList()
+        self.__series_position = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return self.__entries[-1][0] if self.__entries else None
+
+    def extend(self, timestamps, prices) -> None:
+        timestamps = list(timestamps)
+        prices = [float(price) for price in prices]
+
+        self.__entries.extend(zip(timestamps, prices))
+        self.__sorted_prices.update(prices)
+
+    def evict_before(self, timestamp: float) -> None:
+        while self.__entries and self.__entries[0][0] < timestamp:
+            _, price = self.__entries.popleft()
+            self.__sorted_prices.remove(price)
+
+    def advance(self, price_series: PriceSeries, current_timestamp: int) -> None:
+        # Two-pointer walk over a sorted PriceSeries: append everything before current_timestamp
+        # that has not been seen yet, then drop what fell out of [current - duration, current).
+        window_start = math.ceil(current_timestamp - self.window_duration_ms)
+
+        series_end = int(np.searchsorted(price_series.timestamps, current_timestamp, side="left"))
+        series_start = max(
+            self.__series_position,
+            int(np.searchsorted(price_series.timestamps, window_start, side="left"))
+        )
+
+        if series_start < series_end:
+            self.extend(
+                price_series.timestamps[series_start:series_end].tolist(),
+                price_series.prices[series_start:series_end].tolist()
+            )
+
+        self.__series_position = max(self.__series_position, series_end)
+        self.evict_before(window_start)
+
+    def prices(self) -> List[float]:
+        return [price for _, price in self.__entries]
+
+    def percentile(self, q: float) -> float:
+        if not self.__sorted_prices:
+            raise ValueError("Cannot calculate a percentile of an empty window")
+
+        count = len(self.__sorted_prices)
+        virtual_index = (count - 1) * (q / 100)
+
+        if virtual_index >= count - 1:
+            return self.__sorted_prices[-1]
+        if virtual_index < 0:
+            return self.__sorted_prices[0]
+
+        previous_index = math.floor(virtual_index)
+        previous_price = self.__sorted_prices[previous_index]
+        next_price = self.__sorted_prices[previous_index + 1]
+        gamma = virtual_index - previous_index
+
+        # Same interpolation as numpy's _lerp, so the result is bit-identical to np.percentile.
+        difference = next_price - previous_price
+        if gamma >= 0.5:
+            return next_price - difference * (1 - gamma)
+        return previous_price + difference * gamma
@@ -0,0 +1,208 @@
+import json
+import math
+import os
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from data.base_price_distribution import BasePriceDistribution
+from models.price_series import PriceSeries
+from utils.logging_utils import setup_logger
+from utils.t_digest import TDigest
+
+
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
+
+
+class StreamingPriceDistribution(BasePriceDistribution):
+    """
+    Percentiles of recent prices from t-digest sketches instead of the raw candles, so memory
+    does not depend on the number of prices and the state can be saved and restored.
+
+    Windowed (the default): one digest per bucket_duration_ms bucket, dropped as a whole once
+    the bucket is older than window_duration_ms, so the window is exact to one bucket.
+    Decayed (half_life_ms set): a single digest in which a price's weight halves every
+    half_life_ms; nothing is evicted.
+    """
+
+    # Decayed weights grow as 2 ** (elapsed / half_life); they are rebased before they overflow.
+    max_decay_weight = 2.0 ** 512
+
+    def __init__(self, window_duration_ms: float, bucket_duration_ms: float = 24 * 60 * 60 * 1000,
+                 half_life_ms: Optional[float] = None, compression: float = 200):
+        self.window_duration_ms = window_duration_ms
+        self.bucket_duration_ms = bucket_duration_ms
+        self.half_life_ms = half_life_ms
+        self.compression = compression
+
+        # Windowed: [bucket start, digest, price count] per bucket, oldest first.
+        self.__buckets = deque()
+        self.__merged_digest: Optional[TDigest] = None
+
+        # Decayed: one digest and the timestamp its weights are relative to.
+        self.__decayed_digest = TDigest(compression)
+        self.__decay_origin: Optional[int] = None
+        self.__decayed_count = 0
+
+        self.__last_timestamp: Optional[int] = None
+        self.__series_position = 0
+
+    @property
+    def is_decayed(self) -> bool:
+        return bool(self.half_life_ms)
+
+    def __len__(self) -> int:
+        if self.is_decayed:
+            return self.__decayed_count
+        return sum(count for _, _, count in self.__buckets)
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        return self.__last_timestamp
+
+    def add(self, timestamp: int, price: float) -> None:
+        if self.is_decayed:
+            self.__add_decayed(timestamp, price)
+        else:
+            self.__add_windowed(timestamp, price)
+
+        self.__last_timestamp = timestamp if self.__last_timestamp is None else max(self.__last_timestamp, timestamp)
+
+    def extend(self, timestamps, prices) -> None:
+        for timestamp, price in zip(timestamps, prices):
+            self.add(int(timestamp), float(price))
+
+    def evict_before(self, timestamp: float) -> None:
+        # A decayed sketch forgets gradually instead.
+        if self.is_decayed:
+            return
+
+        while self.__buckets and self.__buckets[0][0] + self.bucket_duration_ms <= timestamp:
+            self.__buckets.popleft()
+            self.__merged_digest = None
+
+    def advance(self, price_series: PriceSeries, current_timestamp: int) -> None:
+        window_start = math.ceil(current_timestamp - self.window_duration_ms)
+
+        series_end = int(np.searchsorted(price_series.timestamps, current_timestamp, side="left"))
+        series_start = max(
+            self.__series_position,
+            int(np.searchsorted(price_series.timestamps, window_start, side="left"))
+        )
+
+        if series_start < series_end:
+            self.extend(
+                price_series.timestamps[series_start:series_end].tolist(),
+                price_series.prices[series_start:series_end].tolist()
+            )
+
+        self.__series_position = max(self.__series_position, series_end)
+        self.evict_before(window_start)
+
+    def percentile(self, q: float) -> float:
+        digest = self.__decayed_digest if self.is_decayed else self.__get_merged_digest()
+        if digest.total_weight == 0:
+            raise ValueError("Cannot calculate a percentile of an empty price distribution")
+        return digest.quantile(q / 100)
+
+    def to_dict(self) -> dict:
+        return {
+            "window_duration_ms": self.window_duration_ms,
+            "bucket_duration_ms": self.bucket_duration_ms,
+            "half_life_ms": self.half_life_ms,
+            "compression": self.compression,
+            "last_timestamp": self.__last_timestamp,
+            "buckets": [
+                {"start": start, "count": count, "digest": digest.to_dict()} for start, digest, count in self.__buckets
+            ],
+            "decayed": {
+                "origin": self.__decay_origin,
+                "count": self.__decayed_count,
+                "digest": self.__decayed_digest.to_dict(),
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StreamingPriceDistribution":
+        distribution = cls(data["window_duration_ms"], data["bucket_duration_ms"], data["half_life_ms"], data["compression"])
+        distribution.__last_timestamp = data["last_timestamp"]
+        distribution.__buckets.extend(
+            [bucket["start"], TDigest.from_dict(bucket["digest"]), bucket["count"]] for bucket in data["buckets"]
+        )
+        distribution.__decay_origin = data["decayed"]["origin"]
+        distribution.__decayed_count = data["decayed"]["count"]
+        distribution.__decayed_digest = TDigest.from_dict(data["decayed"]["digest"])
+        return distribution
+
+    def save(self, path: str) -> None:
+        try:
+            directory = os.path.dirname(path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+
+            # Written to a temporary file first, so a crash never leaves a truncated sketch behind.
+            temporary_path = f"{path}.tmp"
+            with open(temporary_path, "w") as file:
+                json.dump(self.to_dict(), file)
+            os.replace(temporary_path, path)
+        except OSError as e:
+            logger.warning("Failed to write price sketch %s: %s", path, e)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["StreamingPriceDistribution"]:
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "r") as file:
+                return cls.from_dict(json.load(file))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Failed to read price sketch %s: %s", path, e)
+            return None
+
+    def is_compatible(self, other: "StreamingPriceDistribution") -> bool:
+        # A stored sketch is only reused if it was built with the same window and decay.
+        return (self.window_duration_ms, self.bucket_duration_ms, self.half_life_ms) == \
+            (other.window_duration_ms, other.bucket_duration_ms, other.half_life_ms)
+
+    def __add_windowed(self, timestamp: int, price: float) -> None:
+        bucket_start = timestamp - timestamp % self.bucket_duration_ms
+
+        # Prices normally arrive in time order, so the bucket is almost always the last one.
+        index = len(self.__buckets)
+        while index > 0 and self.__buckets[index - 1][0] > bucket_start:
+            index -= 1
+
+        if index > 0 and self.__buckets[index - 1][0] == bucket_start:
+            bucket = self.__buckets[index - 1]
+        else:
+            bucket = [bucket_start, TDigest(self.compression), 0]
+            self.__buckets.insert(index, bucket)
+
+        bucket[1].add(price)
+        bucket[2] += 1
+        self.__merged_digest = None
+
+    def __add_decayed(self, timestamp: int, price: float) -> None:
+        # Instead of shrinking every old weight on each tick, new prices get exponentially larger
+        # weights; only the ratio between weights matters for percentiles.
+        if self.__decay_origin is None:
+            self.__decay_origin = timestamp
+
+        weight = 2.0 ** ((timestamp - self.__decay_origin) / self.half_life_ms)
+        if weight > self.max_decay_weight:
+            self.__decayed_digest.scale(1 / weight)
+            self.__decay_origin = timestamp
+            weight = 1.0
+
+        self.__decayed_digest.add(price, weight)
+        self.__decayed_count += 1
+
+    def __get_merged_digest(self) -> TDigest:
+        if self.__merged_digest is None:
+            merged_digest = TDigest(self.compression)
+            for _, digest, _ in self.__buckets:
+                merged_digest.merge(digest)
+            self.__merged_digest = merged_digest
+        return self.__merged_digest
@@ -1,17 +1,19 @@
 from bot.grid_bot import GridBot
 from utils.logging_utils import setup_logger
-from utils.telegram_utils import send_telegram_notification
+from utils.telegram_utils import send_telegram_notification, flush_telegram_notifications
 
-logger = setup_logger(log_dir="logs", days_to_keep=30)
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
 
 if __name__ == "__main__":
     try:
         grid_bot = GridBot()
         grid_bot.run_real_time_bot()
     except Exception as e:
-        logger.error(f"An error occurred during bot operation: {e}", exc_info=True)
+        logger.error("An error occurred during bot operation: %s", e, exc_info=True)
 
         error_message = f"🚨 Grid Bot Error: {e}"
         send_telegram_notification(error_message)
     finally:
+        # Notifications are sent in the background; give the last ones a chance to go out.
+        flush_telegram_notifications()
         logger.info("Bot has stopped.")
\ No newline at end of file
@@ -0,0 +1,15 @@
+from typing import List
+
+from models.order import Order
+
+
+class BacktestResult:
+    def __init__(self, trade_results: List[dict], final_balance: float, open_orders: List[Order], max_drawdown: float = 0.0):
+        self.trade_results = trade_results
+        self.final_balance = final_balance
+        self.open_orders = open_orders
+        self.max_drawdown = max_drawdown
+
+    @property
+    def total_profit(self) -> float:
+        return sum(trade["profit"] for trade in self.trade_results if "profit" in trade)
@@ -0,0 +1,50 @@
+from typing import List
+
+import numpy as np
+
+
+class GridBoundsBatch:
+    """
+    Grid bounds of every calculation method for every (window length, recalculation timestamp)
+    pair. Each array has shape (len(window_lengths_ms), len(recalculation_timestamps)); a window
+    with too few prices for a method holds NaN.
+    """
+
+    def __init__(self, recalculation_timestamps: np.ndarray, window_lengths_ms: np.ndarray, price_counts: np.ndarray,
+                 percentile_min: np.ndarray, percentile_max: np.ndarray, mean: np.ndarray, std: np.ndarray,
+                 std_min: np.ndarray, std_max: np.ndarray, bollinger_min: np.ndarray, bollinger_max: np.ndarray,
+                 uniform_step: np.ndarray):
+        self.recalculation_timestamps = recalculation_timestamps
+        self.window_lengths_ms = window_lengths_ms
+        self.price_counts = price_counts
+        self.percentile_min = percentile_min
+        self.percentile_max = percentile_max
+        self.mean = mean
+        self.std = std
+        self.std_min = std_min
+        self.std_max = std_max
+        self.bollinger_min = bollinger_min
+        self.bollinger_max = bollinger_max
+        self.uniform_step = uniform_step
+
+    def to_rows(self) -> List[dict]:
+        # One row per window length and timestamp, e.g. for ParameterSweep.write_results.
+        rows = []
+        for window_index, window_length_ms in enumerate(self.window_lengths_ms.tolist()):
+            for timestamp_index, timestamp in enumerate(self.recalculation_timestamps.tolist()):
+                position = window_index, timestamp_index
+                rows.append({
+                    "timestamp": timestamp,
+                    "window_length_ms": window_length_ms,
+                    "price_count": int(self.price_counts[position]),
+                    "percentile_min": float(self.percentile_min[position]),
+                    "percentile_max": float(self.percentile_max[position]),
+                    "mean": float(self.mean[position]),
+                    "std": float(self.std[position]),
+                    "std_min": float(self.std_min[position]),
+                    "std_max": float(self.std_max[position]),
+                    "bollinger_min": float(self.bollinger_min[position]),
+                    "bollinger_max": float(self.bollinger_max[position]),
+                    "uniform_step": float(self.uniform_step[position]),
+                })
+        return rows
@@ -1,9 +1,38 @@
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from typing import List
+from typing import List, Optional, Tuple
+
+import numpy as np
 
 #TODO: remove dataclass
 @dataclass
 class GridLevels:
     levels: List[float]
     min: float
-    max: float
\ No newline at end of file
+    max: float
+
+    def __len__(self) -> int:
+        return len(self.levels)
+
+    def find_nearest_levels(self, price: float) -> Tuple[Optional[float], Optional[float]]:
+        lower_index = bisect_right(self.levels, price) - 1
+        upper_index = bisect_left(self.levels, price)
+
+        lower_level = self.levels[lower_index] if lower_index >= 0 else None
+        upper_level = self.levels[upper_index] if upper_index < len(self.levels) else None
+
+        return lower_level, upper_level
+
+    def find_nearest_levels_array(self, prices: np.ndarray):
+        levels = np.asarray(self.levels, dtype=np.float64)
+
+        lower_indexes = np.searchsorted(levels, prices, side="right") - 1
+        upper_indexes = np.searchsorted(levels, prices, side="left")
+
+        has_lower = lower_indexes >= 0
+        has_upper = upper_indexes < len(levels)
+
+        lower_levels = levels[np.clip(lower_indexes, 0, len(levels) - 1)]
+        upper_levels = levels[np.clip(upper_indexes, 0, len(levels) - 1)]
+
+        return lower_levels, upper_levels, has_lower, has_upper
@@ -0,0 +1,36 @@
+from typing import Optional
+
+
+class OrderUpdate:
+    def __init__(
+            self,
+            order_link_id: str,
+            order_status: str,
+            symbol: str,
+            side: str,
+            updated_time: Optional[int] = None,
+            executed_qty: Optional[float] = None
+    ):
+        self.order_link_id = order_link_id
+        self.order_status = order_status
+        self.symbol = symbol
+        self.side = side
+        self.updated_time = updated_time
+        self.executed_qty = executed_qty
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            order_link_id=data.get("orderLinkId", ""),
+            order_status=data.get("orderStatus", ""),
+            symbol=data.get("symbol", ""),
+            side=data.get("side", ""),
+            updated_time=int(data["updatedTime"]) if data.get("updatedTime") else None,
+            executed_qty=float(data["cumExecQty"]) if data.get("cumExecQty") else None
+        )
+
+    def __repr__(self):
+        return (
+            f"OrderUpdate(orderLinkId={self.order_link_id}, orderStatus={self.order_status}, "
+            f"symbol={self.symbol}, side={self.side}, updatedTime={self.updated_time}, cumExecQty={self.executed_qty})"
+        )
@@ -0,0 +1,30 @@
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+
+class PriceSeries:
+    def __init__(self, timestamps, prices):
+        self.timestamps = np.asarray(timestamps, dtype=np.int64)
+        self.prices = np.asarray(prices, dtype=np.float64)
+
+        if self.timestamps.shape != self.prices.shape:
+            raise ValueError("Timestamps and prices must have the same length")
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Union[int, float]]], price_key: str = "price") -> "PriceSeries":
+        timestamps = np.fromiter((record["timestamp"] for record in records), dtype=np.int64, count=len(records))
+        prices = np.fromiter((float(record[price_key]) for record in records), dtype=np.float64, count=len(records))
+        return cls(timestamps, prices)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def index_range(self, from_timestamp: int, to_timestamp: int) -> Tuple[int, int]:
+        start = int(np.searchsorted(self.timestamps, from_timestamp, side="left"))
+        end = int(np.searchsorted(self.timestamps, to_timestamp, side="right"))
+        return start, end
+
+    def slice_by_time(self, from_timestamp: int, to_timestamp: int) -> "PriceSeries":
+        start, end = self.index_range(from_timestamp, to_timestamp)
+        return PriceSeries(self.timestamps[start:end], self.prices[start:end])
@@ -0,0 +1,68 @@
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class UniformGridLevels:
+    """
+    Grid whose levels are origin + i * step for i in [0, levels_count). The levels are never
+    materialized; the cell around a price is found arithmetically.
+    """
+
+    def __init__(self, origin: float, step: float, levels_count: int, min: float, max: float):
+        self.origin = origin
+        self.step = step
+        self.levels_count = levels_count
+        self.min = min
+        self.max = max
+
+    def __len__(self) -> int:
+        return self.levels_count
+
+    def level_at(self, index: int) -> float:
+        return self.origin + index * self.step
+
+    def find_nearest_levels(self, price: float) -> Tuple[Optional[float], Optional[float]]:
+        if self.levels_count == 0:
+            return None, None
+
+        lower_index = min(max(math.floor((price - self.origin) / self.step), -1), self.levels_count - 1)
+
+        # The division may land one cell off when price sits on a level, so settle against the real level values.
+        if lower_index >= 0 and self.level_at(lower_index) > price:
+            lower_index -= 1
+        if lower_index + 1 < self.levels_count and self.level_at(lower_index + 1) <= price:
+            lower_index += 1
+
+        lower_level = self.level_at(lower_index) if lower_index >= 0 else None
+
+        if lower_level == price:
+            return lower_level, lower_level
+
+        upper_level = self.level_at(lower_index + 1) if lower_index + 1 < self.levels_count else None
+        return lower_level, upper_level
+
+    def find_nearest_levels_array(self, prices: np.ndarray):
+        lower_indexes = np.clip(np.floor((prices - self.origin) / self.step), -1, self.levels_count - 1)
+
+        lower_indexes = np.where(
+            (lower_indexes >= 0) & (self.origin + lower_indexes * self.step > prices), lower_indexes - 1, lower_indexes
+        )
+        lower_indexes = np.where(
+            (lower_indexes + 1 < self.levels_count) & (self.origin + (lower_indexes + 1) * self.step <= prices),
+            lower_indexes + 1, lower_indexes
+        )
+
+        has_lower = lower_indexes >= 0
+        lower_levels = self.origin + lower_indexes * self.step
+
+        upper_indexes = np.where(has_lower & (lower_levels == prices), lower_indexes, lower_indexes + 1)
+        upper_levels = self.origin + upper_indexes * self.step
+        has_upper = upper_indexes < self.levels_count
+
+        return lower_levels, upper_levels, has_lower, has_upper
+
+    def __repr__(self) -> str:
+        return (f"UniformGridLevels(origin={self.origin}, step={self.step}, levels_count={self.levels_count}, "
+                f"min={self.min}, max={self.max})")
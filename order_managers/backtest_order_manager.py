@@ -1,43 +1,43 @@
 from typing import Optional, List, Union
 from models.order import Order
 from order_managers.base_order_manager import BaseOrderManager
+from order_managers.position_book import PositionBook
 
 
 class BacktestOrderManager(BaseOrderManager):
-    def __init__(self):
-        self.orders: List[Order] = []  # Список для зберігання об'єктів Order
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.position_book = PositionBook()  # Індекс відкритих ордерів за ціною входу
 
     def add_order(self, order: Order):
         order.allow_to_sell = True
-        self.orders.append(order)
+        self.position_book.add(order)
 
     def remove_order(self, order_link_id: str):
-        self.orders = [order for order in self.orders if order.order_link_id != order_link_id]
+        self.position_book.remove(order_link_id)
 
     def update_order(self, order_link_id: str, **fields):
-        order = self.get_order(order_link_id)
-        if order:
-            for key, value in fields.items():
-                if hasattr(order, key):
-                    setattr(order, key, value)
+        self.position_book.update(order_link_id, **fields)
 
     def get_orders(self) -> List[Order]:
-        for order in self.orders:
+        orders = self.position_book.get_orders()
+        for order in orders:
             order.amount = float(order.amount)
             order.price = float(order.price)
-        return self.orders
+        return orders
 
     def get_order(self, order_link_id: str) -> Optional[Order]:
-        for order in self.orders:
-            if order.order_link_id == order_link_id:
-                order.amount = float(order.amount)
-                order.price = float(order.price)
-                return order
+        order = self.position_book.get(order_link_id)
+        if order:
+            order.amount = float(order.amount)
+            order.price = float(order.price)
+            return order
         return None
 
+    def find_sellable_order(self, current_price: float, min_profit: float) -> Optional[Order]:
+        return self.position_book.find_sellable_order(current_price, min_profit)
+
     def update_positions(self, trader):
-        for order in self.orders:
-            if not order.allow_to_sell:
-                is_closed = trader.is_order_closed(order.order_link_id)
-                if is_closed:
-                    order.allow_to_sell = True
\ No newline at end of file
+        pending_orders = self.position_book.get_pending_orders()
+        for order_link_id in self.get_closed_order_ids(trader, pending_orders, self.symbol):
+            self.position_book.update(order_link_id, allow_to_sell=True)
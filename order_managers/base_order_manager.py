@@ -1,6 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Set
+
 from models.order import Order
+from utils.logging_utils import setup_logger
+
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
+
 
 class BaseOrderManager(ABC):
     @abstractmethod
@@ -11,6 +17,14 @@ class BaseOrderManager(ABC):
     def remove_order(self, order_link_id: str) -> None:
         pass
 
+    def add_orders(self, orders: List[Order]) -> None:
+        for order in orders:
+            self.add_order(order)
+
+    def remove_orders(self, order_link_ids: List[str]) -> None:
+        for order_link_id in order_link_ids:
+            self.remove_order(order_link_id)
+
     @abstractmethod
     def update_order(self, order_link_id: str, **fields) -> None:
         pass
@@ -25,4 +39,37 @@ class BaseOrderManager(ABC):
 
     @abstractmethod
     def update_positions(self, trader) -> None:
-        pass
\ No newline at end of file
+        pass
+
+    def find_sellable_order(self, current_price: float, min_profit: float) -> Optional[Order]:
+        sorted_orders = sorted(self.get_orders(), key=lambda order: order.price)
+
+        return next(
+            (order for order in sorted_orders if (current_price - order.price) * order.amount > min_profit and order.allow_to_sell),
+            None
+        )
+
+    def get_closed_order_ids(self, trader, pending_orders: List[Order], symbol: str) -> Set[str]:
+        # One snapshot of the symbol's open orders and recent history replaces a status request per
+        # pending order. If the snapshot cannot be fetched, fall back to asking order by order.
+        if not pending_orders:
+            return set()
+
+        start_time = min(int(datetime.fromisoformat(order.created_on).timestamp() * 1000) for order in pending_orders)
+        order_statuses = trader.get_order_statuses(symbol, start_time)
+
+        if order_statuses is None:
+            logger.warning("Order status snapshot unavailable. Checking %s pending orders one by one.",
+                           len(pending_orders))
+            closed_order_link_ids = {
+                order.order_link_id for order in pending_orders if trader.is_order_closed(order.order_link_id) is True
+            }
+        else:
+            closed_order_link_ids = {
+                order.order_link_id for order in pending_orders if order_statuses.get(order.order_link_id) == "Filled"
+            }
+
+        # Fills move funds between coins, so cached wallet balances are stale now.
+        if closed_order_link_ids:
+            trader.invalidate_balances()
+        return closed_order_link_ids
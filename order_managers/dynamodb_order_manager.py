@@ -1,49 +1,130 @@
+import time
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, timezone, timedelta
 
 import boto3
+from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 from configs.settings import Settings
 from models.order import Order
 from order_managers.base_order_manager import BaseOrderManager
+from order_managers.position_book import PositionBook
 from utils.logging_utils import setup_logger
+from utils.metrics import dynamodb_call_seconds
+
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
 
-logger = setup_logger(log_dir="logs", days_to_keep=30)
 
-#TODO: add cashing
 class DynamoDBOrderManager(BaseOrderManager):
+    # DynamoDB attribute names accepted by update_order and the Order attributes they map to.
+    order_attributes = {
+        "orderLinkId": "order_link_id",
+        "amount": "amount",
+        "price": "price",
+        "allowToSell": "allow_to_sell",
+        "createdOn": "created_on",
+    }
+
+    # DynamoDB cannot index a BOOL attribute, so pending orders also carry sellStatus = "PENDING".
+    # The attribute is removed once the order becomes sellable, which keeps the pending index sparse.
+    pending_status_attribute = "sellStatus"
+    pending_status_value = "PENDING"
+
     def __init__(self):
         self.config = Settings()
 
+        # Connected on first use, see table.
+        self.dynamodb = None
+        self.__table = None
+
+        self.pending_index_name = self.config.dynamodb_pending_index
+        self.pending_index_backfilled = False
+
+        # Write-through cache: the table is read on the first read of orders, every write goes to DynamoDB
+        # and, once it succeeded, to the position book, and all reads are served from the position book.
+        # Nothing is connected or read here, so building the manager (e.g. in GridBot before a backtest)
+        # stays offline.
+        self.cache_enabled = self.config.order_cache_enabled
+        self.position_book: Optional[PositionBook] = None
+        self.reconcile_interval = self.config.order_cache_reconcile_interval
+        self.last_reconciled_at = 0.0
+
+    @property
+    def table(self):
+        if self.__table is None:
+            try:
+                self.dynamodb = boto3.resource(
+                    "dynamodb",
+                    region_name=self.config.aws_region,
+                    aws_access_key_id=self.config.aws_access_key,
+                    aws_secret_access_key=self.config.aws_secret_key,
+                )
+                self.__table = self.dynamodb.Table("Orders")
+                logger.info("Connected to DynamoDB table: 'Orders'")
+            except ClientError as e:
+                logger.error("Error connecting to DynamoDB: %s", e, exc_info=True)
+                raise
+        return self.__table
+
+    def add_order(self, order: Order):
         try:
-            self.dynamodb = boto3.resource(
-                "dynamodb",
-                region_name=self.config.aws_region,
-                aws_access_key_id=self.config.aws_access_key,
-                aws_secret_access_key=self.config.aws_secret_key,
-            )
-            self.table = self.dynamodb.Table("Orders")
-            logger.info(f"Connected to DynamoDB table: 'Orders'")
+            with dynamodb_call_seconds.time(operation="put_item"):
+                self.table.put_item(Item=self.__to_item(order))
+            logger.info("Order %s added to DynamoDB.", order.order_link_id)
         except ClientError as e:
-            logger.error(f"Error connecting to DynamoDB: {e}", exc_info=True)
-            raise
+            logger.error("Failed to add order %s to DynamoDB: %s", order.order_link_id, e, exc_info=True)
+            return
 
-    def add_order(self, order: Order):
+        if self.position_book is not None:
+            self.position_book.add(order)
+
+    def add_orders(self, orders: List[Order]):
         try:
-            self.table.put_item(Item=order.to_dict())
-            logger.info(f"Order {order.order_link_id} added to DynamoDB.")
+            with dynamodb_call_seconds.time(operation="batch_write_item"), \
+                    self.table.batch_writer(overwrite_by_pkeys=["orderLinkId"]) as batch:
+                for order in orders:
+                    batch.put_item(Item=self.__to_item(order))
+            logger.info("%s orders added to DynamoDB in a batch.", len(orders))
         except ClientError as e:
-            logger.error(f"Failed to add order {order.order_link_id} to DynamoDB: {e}", exc_info=True)
+            logger.error("Failed to add %s orders to DynamoDB in a batch: %s", len(orders), e, exc_info=True)
+            return
+
+        if self.position_book is not None:
+            for order in orders:
+                self.position_book.add(order)
 
     def remove_order(self, order_link_id: str):
         try:
-            self.table.delete_item(Key={"orderLinkId": order_link_id})
-            logger.info(f"Order {order_link_id} removed from DynamoDB.")
+            with dynamodb_call_seconds.time(operation="delete_item"):
+                self.table.delete_item(Key={"orderLinkId": order_link_id})
+            logger.info("Order %s removed from DynamoDB.", order_link_id)
+        except ClientError as e:
+            logger.error("Failed to remove order %s from DynamoDB: %s", order_link_id, e, exc_info=True)
+            return
+
+        if self.position_book is not None:
+            self.position_book.remove(order_link_id)
+
+    def remove_orders(self, order_link_ids: List[str]):
+        try:
+            with dynamodb_call_seconds.time(operation="batch_write_item"), \
+                    self.table.batch_writer(overwrite_by_pkeys=["orderLinkId"]) as batch:
+                for order_link_id in order_link_ids:
+                    batch.delete_item(Key={"orderLinkId": order_link_id})
+            logger.info("%s orders removed from DynamoDB in a batch.", len(order_link_ids))
         except ClientError as e:
-            logger.error(f"Failed to remove order {order_link_id} from DynamoDB: {e}", exc_info=True)
+            logger.error("Failed to remove %s orders from DynamoDB in a batch: %s",
+                         len(order_link_ids), e, exc_info=True)
+            return
+
+        if self.position_book is not None:
+            for order_link_id in order_link_ids:
+                self.position_book.remove(order_link_id)
 
     def update_order(self, order_link_id: str, **fields):
+        cached_fields = {self.order_attributes.get(key, key): value for key, value in fields.items()}
+
         try:
             for key, value in fields.items():
                 if isinstance(value, float):
@@ -52,63 +133,222 @@ class DynamoDBOrderManager(BaseOrderManager):
             update_expression = "SET " + ", ".join(f"{key} = :{key}" for key in fields.keys())
             expression_values = {f":{key}": value for key, value in fields.items()}
 
-            self.table.update_item(
-                Key={"orderLinkId": order_link_id},
-                UpdateExpression=update_expression,
-                ExpressionAttributeValues=expression_values
-            )
-            logger.info(f"Order {order_link_id} updated in DynamoDB with fields: {fields}.")
+            if self.pending_index_name and "allowToSell" in fields:
+                if fields["allowToSell"]:
+                    update_expression += f" REMOVE {self.pending_status_attribute}"
+                else:
+                    update_expression += f", {self.pending_status_attribute} = :{self.pending_status_attribute}"
+                    expression_values[f":{self.pending_status_attribute}"] = self.pending_status_value
+
+            with dynamodb_call_seconds.time(operation="update_item"):
+                self.table.update_item(
+                    Key={"orderLinkId": order_link_id},
+                    UpdateExpression=update_expression,
+                    ExpressionAttributeValues=expression_values
+                )
+            logger.info("Order %s updated in DynamoDB with fields: %s.", order_link_id, fields)
         except ClientError as e:
-            logger.error(f"Failed to update order {order_link_id} in DynamoDB: {e}", exc_info=True)
+            logger.error("Failed to update order %s in DynamoDB: %s", order_link_id, e, exc_info=True)
+            return
+
+        if self.position_book is not None:
+            self.position_book.update(order_link_id, **cached_fields)
 
     def get_orders(self) -> list[Order]:
-        try:
-            response = self.table.scan()
-            orders = response.get("Items", [])
-            logger.info(f"Fetched {len(orders)} orders from DynamoDB.")
-            return [Order.from_dict(order) for order in orders]
-        except ClientError as e:
-            logger.error(f"Failed to fetch orders from DynamoDB: {e}", exc_info=True)
-            return []
+        position_book = self.__get_position_book()
+        if position_book is not None:
+            return position_book.get_orders()
+
+        return self.__scan_orders()
 
     def get_order(self, order_link_id: str) -> Optional[Order]:
+        position_book = self.__get_position_book()
+        if position_book is not None:
+            return position_book.get(order_link_id)
+
         try:
-            response = self.table.get_item(Key={"orderLinkId": order_link_id})
+            with dynamodb_call_seconds.time(operation="get_item"):
+                response = self.table.get_item(Key={"orderLinkId": order_link_id})
             order = response.get("Item")
             if order:
-                logger.info(f"Order {order_link_id} fetched successfully from DynamoDB.")
+                logger.info("Order %s fetched successfully from DynamoDB.", order_link_id)
                 return Order.from_dict(order)
             else:
-                logger.warning(f"Order {order_link_id} not found in DynamoDB.")
+                logger.warning("Order %s not found in DynamoDB.", order_link_id)
                 return None
         except ClientError as e:
-            logger.error(f"Failed to fetch order {order_link_id} from DynamoDB: {e}", exc_info=True)
+            logger.error("Failed to fetch order %s from DynamoDB: %s", order_link_id, e, exc_info=True)
             return None
 
+    def find_sellable_order(self, current_price: float, min_profit: float) -> Optional[Order]:
+        position_book = self.__get_position_book()
+        if position_book is not None:
+            return position_book.find_sellable_order(current_price, min_profit)
+
+        return super().find_sellable_order(current_price, min_profit)
+
+    def reconcile(self):
+        orders = self.__scan_orders(raise_on_error=True)
+
+        position_book = PositionBook()
+        for order in orders:
+            position_book.add(order)
+
+        if self.position_book is not None:
+            cached_ids = set(self.position_book.orders)
+            stored_ids = set(position_book.orders)
+            if cached_ids != stored_ids:
+                logger.warning(
+                    "Order cache reconciled with DynamoDB: %s missing, %s stale order(s).",
+                    len(stored_ids - cached_ids), len(cached_ids - stored_ids)
+                )
+
+        self.position_book = position_book
+        self.last_reconciled_at = time.monotonic()
+        logger.info("Order cache loaded with %s orders from DynamoDB.", len(position_book))
+
+    def backfill_pending_index(self) -> int:
+        # Orders written before DYNAMODB_PENDING_INDEX was set lack sellStatus, so the sparse index
+        # does not contain them. Tags every such pending order; the condition skips orders that
+        # became sellable in the meantime.
+        items = self.__read_all_pages(
+            self.table.scan,
+            FilterExpression=self.__is_pending_condition() & Attr(self.pending_status_attribute).not_exists(),
+        )
+
+        for item in items:
+            try:
+                with dynamodb_call_seconds.time(operation="update_item"):
+                    self.table.update_item(
+                        Key={"orderLinkId": item["orderLinkId"]},
+                        UpdateExpression=f"SET {self.pending_status_attribute} = :{self.pending_status_attribute}",
+                        ConditionExpression=self.__is_pending_condition(),
+                        ExpressionAttributeValues={f":{self.pending_status_attribute}": self.pending_status_value},
+                    )
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                    raise
+
+        logger.info("Pending index '%s' backfilled: %s order(s) tagged.", self.pending_index_name, len(items))
+        self.pending_index_backfilled = True
+        return len(items)
+
     def update_positions(self, trader):
-        active_orders = self.get_orders()
+        position_book = self.__get_position_book()
+        if position_book is not None and self.reconcile_interval > 0 \
+                and time.monotonic() - self.last_reconciled_at >= self.reconcile_interval:
+            try:
+                self.reconcile()
+                position_book = self.position_book
+            except ClientError as e:
+                logger.error("Failed to reconcile order cache with DynamoDB: %s", e, exc_info=True)
 
-        for order in active_orders:
-            if not order.allow_to_sell:
-                is_order_closed = trader.is_order_closed(order.order_link_id)
+        if position_book is not None:
+            active_orders = position_book.get_pending_orders()
+        elif self.pending_index_name:
+            active_orders = self.__query_pending_orders()
+        else:
+            active_orders = self.get_orders()
 
-                if is_order_closed and is_order_closed is True:
-                    logger.info(f"OrderLinkId {order.order_link_id} is closed. Marking as 'allowToSell'.")
-                    self.update_order(order.order_link_id, allowToSell=True)
-                else:
-                    created_on = datetime.fromisoformat(order.created_on)
-                    now = datetime.now(timezone.utc)
+        pending_orders = [order for order in active_orders if not order.allow_to_sell]
+        closed_order_link_ids = self.get_closed_order_ids(trader, pending_orders, self.config.symbol)
+        canceled_order_link_ids = []
+
+        for order in pending_orders:
+            if order.order_link_id in closed_order_link_ids:
+                logger.info("OrderLinkId %s is closed. Marking as 'allowToSell'.", order.order_link_id)
+                self.update_order(order.order_link_id, allowToSell=True)
+            else:
+                created_on = datetime.fromisoformat(order.created_on)
+                now = datetime.now(timezone.utc)
 
-                    if now - created_on > timedelta(minutes=30):
+                if now - created_on > timedelta(minutes=30):
+                    logger.info(
+                        "OrderLinkId %s is still open, but older than 30 minutes. Attempting to cancel.",
+                        order.order_link_id)
+
+                    cancel_result = trader.cancel_order(order.order_link_id)
+
+                    if cancel_result.success:
                         logger.info(
-                            f"OrderLinkId {order.order_link_id} is still open, but older than 30 minutes. Attempting to cancel.")
+                            "OrderLinkId %s canceled successfully. Removing record from database.", order.order_link_id)
+                        canceled_order_link_ids.append(order.order_link_id)
+                    else:
+                        logger.error(
+                            "Failed to cancel OrderLinkId %s. Error: %s",
+                            order.order_link_id, cancel_result.error_message)
+
+        if canceled_order_link_ids:
+            self.remove_orders(canceled_order_link_ids)
+
+    def __get_position_book(self) -> Optional[PositionBook]:
+        # Loads the cache on first use. Until that succeeds, reads go to the table and a failed
+        # load is retried on the next read.
+        if self.position_book is None and self.cache_enabled:
+            try:
+                self.reconcile()
+            except ClientError as e:
+                logger.error("Failed to load order cache from DynamoDB: %s", e, exc_info=True)
+        return self.position_book
+
+    def __scan_orders(self, raise_on_error=False) -> list[Order]:
+        try:
+            items = self.__read_all_pages(self.table.scan)
+            logger.info("Fetched %s orders from DynamoDB.", len(items))
+            return [Order.from_dict(item) for item in items]
+        except ClientError as e:
+            logger.error("Failed to fetch orders from DynamoDB: %s", e, exc_info=True)
+            if raise_on_error:
+                raise
+            return []
+
+    def __query_pending_orders(self) -> list[Order]:
+        # Until the backfill has run, the index may miss older pending orders, so they are scanned for.
+        if not self.pending_index_backfilled:
+            try:
+                self.backfill_pending_index()
+            except ClientError as e:
+                logger.error("Failed to backfill pending index '%s': %s", self.pending_index_name, e, exc_info=True)
+                return [order for order in self.__scan_orders() if not order.allow_to_sell]
+
+        try:
+            items = self.__read_all_pages(
+                self.table.query,
+                IndexName=self.pending_index_name,
+                KeyConditionExpression=Key(self.pending_status_attribute).eq(self.pending_status_value),
+            )
+            logger.info("Fetched %s pending orders from DynamoDB index '%s'.", len(items), self.pending_index_name)
+            return [Order.from_dict(item) for item in items]
+        except ClientError as e:
+            logger.error("Failed to query pending orders from DynamoDB: %s", e, exc_info=True)
+            return []
+
+    def __read_all_pages(self, read_function, **kwargs) -> list[dict]:
+        # A single scan/query response stops at 1 MB, so follow LastEvaluatedKey until the end and
+        # only read the attributes Order.from_dict needs.
+        projection_names = {f"#{attribute}": attribute for attribute in self.order_attributes}
+        kwargs["ProjectionExpression"] = ", ".join(projection_names)
+        kwargs["ExpressionAttributeNames"] = projection_names
+
+        operation = getattr(read_function, "__name__", "read")
+        items = []
+        while True:
+            with dynamodb_call_seconds.time(operation=operation):
+                response = read_function(**kwargs)
+            items.extend(response.get("Items", []))
+
+            last_evaluated_key = response.get("LastEvaluatedKey")
+            if not last_evaluated_key:
+                return items
+            kwargs["ExclusiveStartKey"] = last_evaluated_key
 
-                        cancel_result = trader.cancel_order(order.order_link_id)
+    @staticmethod
+    def __is_pending_condition():
+        # Order.from_dict treats a missing allowToSell as pending too.
+        return Attr("allowToSell").eq(False) | Attr("allowToSell").not_exists()
 
-                        if cancel_result.success:
-                            logger.info(
-                                f"OrderLinkId {order.order_link_id} canceled successfully. Removing record from database.")
-                            self.remove_order(order.order_link_id)
-                        else:
-                            logger.error(
-                                f"Failed to cancel OrderLinkId {order.order_link_id}. Error: {cancel_result.error_message}")
\ No newline at end of file
+    def __to_item(self, order: Order) -> dict:
+        item = order.to_dict()
+        if self.pending_index_name and not order.allow_to_sell:
+            item[self.pending_status_attribute] = self.pending_status_value
+        return item
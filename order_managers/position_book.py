@@ -0,0 +1,107 @@
+import itertools
+from typing import Dict, List, Optional
+
+from models.order import Order
+from utils.sorted_list import SortedList
+
+
+class PositionBook:
+    """
+    Open buy orders indexed by entry price. Sellable and pending orders live in separate
+    partitions, so sell selection only walks sellable lots, cheapest first, and stops as soon as
+    no remaining lot can reach the requested profit.
+
+    Whether a lot is sellable depends on its price and its amount together, so no single sorted
+    key finds the answer in O(log n). The walk visits the lots priced below
+    current_price - min_profit / largest amount, until the first one that clears min_profit: one
+    lot when amounts are equal, as the strategy places them, and O(n) only when many cheap lots are
+    too small to sell.
+    """
+
+    def __init__(self):
+        self.orders: Dict[str, Order] = {}
+
+        self.__sellable = SortedList()
+        self.__sellable_amounts = SortedList()
+        self.__pending = SortedList()
+        self.__sequences: Dict[str, int] = {}
+        self.__sequence_counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def __contains__(self, order_link_id: str) -> bool:
+        return order_link_id in self.orders
+
+    def add(self, order: Order) -> None:
+        if order.order_link_id in self.orders:
+            self.remove(order.order_link_id)
+
+        self.orders[order.order_link_id] = order
+        self.__sequences[order.order_link_id] = next(self.__sequence_counter)
+        self.__index(order)
+
+    def remove(self, order_link_id: str) -> Optional[Order]:
+        order = self.orders.pop(order_link_id, None)
+        if order is None:
+            return None
+
+        self.__unindex(order)
+        del self.__sequences[order_link_id]
+        return order
+
+    def update(self, order_link_id: str, **fields) -> Optional[Order]:
+        order = self.orders.get(order_link_id)
+        if order is None:
+            return None
+
+        self.__unindex(order)
+        for key, value in fields.items():
+            if hasattr(order, key):
+                setattr(order, key, value)
+        self.__index(order)
+
+        return order
+
+    def get(self, order_link_id: str) -> Optional[Order]:
+        return self.orders.get(order_link_id)
+
+    def get_orders(self) -> List[Order]:
+        return list(self.orders.values())
+
+    def get_pending_orders(self) -> List[Order]:
+        return [self.orders[order_link_id] for _, _, order_link_id in self.__pending]
+
+    def find_sellable_order(self, current_price: float, min_profit: float) -> Optional[Order]:
+        if not self.__sellable:
+            return None
+
+        max_amount = self.__sellable_amounts[-1]
+
+        for price, _, order_link_id in self.__sellable:
+            # Floating point multiplication is monotonic, so once even the largest lot cannot clear
+            # min_profit at this entry price, no lot at this or a higher price can.
+            if (current_price - price) * max_amount <= min_profit:
+                return None
+
+            order = self.orders[order_link_id]
+            if (current_price - order.price) * order.amount > min_profit:
+                return order
+
+        return None
+
+    def __index(self, order: Order) -> None:
+        key = (float(order.price), self.__sequences[order.order_link_id], order.order_link_id)
+        if order.allow_to_sell:
+            self.__sellable.add(key)
+            self.__sellable_amounts.add(float(order.amount))
+        else:
+            self.__pending.add(key)
+
+    def __unindex(self, order: Order) -> None:
+        key = (float(order.price), self.__sequences[order.order_link_id], order.order_link_id)
+        if order.allow_to_sell:
+            self.__sellable.remove(key)
+            self.__sellable_amounts.remove(float(order.amount))
+        else:
+            self.__pending.remove(key)
@@ -0,0 +1,180 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone, timedelta
+from typing import List, Optional
+
+from models.order import Order
+from order_managers.base_order_manager import BaseOrderManager
+from utils.logging_utils import setup_logger
+
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
+
+
+class SQLiteOrderManager(BaseOrderManager):
+    """
+    Local order storage for single-node deployments: a WAL-mode SQLite file with the same
+    semantics as DynamoDBOrderManager, but without network round trips.
+    """
+
+    # Field names accepted by update_order (both the DynamoDB and the Order spelling) and their columns.
+    order_columns = {
+        "orderLinkId": "order_link_id",
+        "order_link_id": "order_link_id",
+        "amount": "amount",
+        "price": "price",
+        "allowToSell": "allow_to_sell",
+        "allow_to_sell": "allow_to_sell",
+        "createdOn": "created_on",
+        "created_on": "created_on",
+    }
+
+    select_orders = "SELECT order_link_id, amount, price, allow_to_sell, created_on FROM orders"
+
+    def __init__(self, path: str, symbol: str):
+        self.path = path
+        self.symbol = symbol
+        self.__lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS orders ("
+            "order_link_id TEXT PRIMARY KEY, amount REAL NOT NULL, price REAL NOT NULL, "
+            "allow_to_sell INTEGER NOT NULL, created_on TEXT NOT NULL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS orders_allow_to_sell_price ON orders (allow_to_sell, price)"
+        )
+        self.connection.commit()
+
+        logger.info("Connected to SQLite order database: %s", path)
+
+    def add_order(self, order: Order):
+        self.add_orders([order])
+
+    def add_orders(self, orders: List[Order]):
+        try:
+            with self.__lock, self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO orders (order_link_id, amount, price, allow_to_sell, created_on) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [self.__to_row(order) for order in orders]
+                )
+            logger.info("%s order(s) added to SQLite.", len(orders))
+        except sqlite3.Error as e:
+            logger.error("Failed to add %s order(s) to SQLite: %s", len(orders), e, exc_info=True)
+
+    def remove_order(self, order_link_id: str):
+        self.remove_orders([order_link_id])
+
+    def remove_orders(self, order_link_ids: List[str]):
+        try:
+            with self.__lock, self.connection:
+                self.connection.executemany(
+                    "DELETE FROM orders WHERE order_link_id = ?",
+                    [(order_link_id,) for order_link_id in order_link_ids]
+                )
+            logger.info("%s order(s) removed from SQLite.", len(order_link_ids))
+        except sqlite3.Error as e:
+            logger.error("Failed to remove %s order(s) from SQLite: %s", len(order_link_ids), e, exc_info=True)
+
+    def update_order(self, order_link_id: str, **fields):
+        self.update_orders({order_link_id: fields})
+
+    def update_orders(self, updates: dict):
+        # All updates are applied in one transaction: either every order changes or none does.
+        try:
+            with self.__lock, self.connection:
+                for order_link_id, fields in updates.items():
+                    columns = [self.order_columns[key] for key in fields]
+                    self.connection.execute(
+                        "UPDATE orders SET " + ", ".join(f"{column} = ?" for column in columns) + " WHERE order_link_id = ?",
+                        [*fields.values(), order_link_id]
+                    )
+            logger.info("%s order(s) updated in SQLite.", len(updates))
+        except (sqlite3.Error, KeyError) as e:
+            logger.error("Failed to update %s order(s) in SQLite: %s", len(updates), e, exc_info=True)
+
+    def get_orders(self) -> List[Order]:
+        return self.__select(self.select_orders + " ORDER BY price, rowid")
+
+    def get_order(self, order_link_id: str) -> Optional[Order]:
+        orders = self.__select(self.select_orders + " WHERE order_link_id = ?", (order_link_id,))
+        if not orders:
+            logger.warning("Order %s not found in SQLite.", order_link_id)
+            return None
+        return orders[0]
+
+    def get_pending_orders(self) -> List[Order]:
+        return self.__select(self.select_orders + " WHERE allow_to_sell = 0 ORDER BY price, rowid")
+
+    def find_sellable_order(self, current_price: float, min_profit: float) -> Optional[Order]:
+        orders = self.__select(
+            self.select_orders + " WHERE allow_to_sell = 1 AND (? - price) * amount > ? ORDER BY price, rowid LIMIT 1",
+            (current_price, min_profit)
+        )
+        return orders[0] if orders else None
+
+    def update_positions(self, trader):
+        closed_order_updates = {}
+        canceled_order_link_ids = []
+
+        pending_orders = self.get_pending_orders()
+        closed_order_link_ids = self.get_closed_order_ids(trader, pending_orders, self.symbol)
+
+        for order in pending_orders:
+            if order.order_link_id in closed_order_link_ids:
+                logger.info("OrderLinkId %s is closed. Marking as 'allowToSell'.", order.order_link_id)
+                closed_order_updates[order.order_link_id] = {"allowToSell": True}
+            else:
+                created_on = datetime.fromisoformat(order.created_on)
+                now = datetime.now(timezone.utc)
+
+                if now - created_on > timedelta(minutes=30):
+                    logger.info(
+                        "OrderLinkId %s is still open, but older than 30 minutes. Attempting to cancel.",
+                        order.order_link_id)
+
+                    cancel_result = trader.cancel_order(order.order_link_id)
+
+                    if cancel_result.success:
+                        logger.info(
+                            "OrderLinkId %s canceled successfully. Removing record from database.", order.order_link_id)
+                        canceled_order_link_ids.append(order.order_link_id)
+                    else:
+                        logger.error(
+                            "Failed to cancel OrderLinkId %s. Error: %s",
+                            order.order_link_id, cancel_result.error_message)
+
+        if closed_order_updates:
+            self.update_orders(closed_order_updates)
+        if canceled_order_link_ids:
+            self.remove_orders(canceled_order_link_ids)
+
+    def close(self):
+        with self.__lock:
+            self.connection.close()
+
+    def __select(self, query: str, parameters: tuple = ()) -> List[Order]:
+        try:
+            with self.__lock:
+                rows = self.connection.execute(query, parameters).fetchall()
+        except sqlite3.Error as e:
+            logger.error("Failed to fetch orders from SQLite: %s", e, exc_info=True)
+            return []
+
+        return [
+            Order(order_link_id=order_link_id, amount=amount, price=price,
+                  allow_to_sell=bool(allow_to_sell), created_on=created_on)
+            for order_link_id, amount, price, allow_to_sell, created_on in rows
+        ]
+
+    @staticmethod
+    def __to_row(order: Order) -> tuple:
+        return order.order_link_id, float(order.amount), float(order.price), bool(order.allow_to_sell), order.created_on
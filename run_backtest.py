@@ -1,5 +1,8 @@
 from datetime import datetime
 from bot.grid_bot import GridBot
+from utils.logging_utils import apply_log_profile
+
+apply_log_profile("backtest")
 
 from_datetime = datetime.strptime("2023-01-01", "%Y-%m-%d")
 to_datetime = datetime.strptime("2025-04-12", "%Y-%m-%d")
@@ -9,4 +12,4 @@ to_timestamp = int(to_datetime.timestamp() * 1000)
 
 grid_bot = GridBot()
 
-grid_bot.run_backtest(from_timestamp, to_timestamp, use_real_data=False, initial_balance=300)
\ No newline at end of file
+grid_bot.run_backtest(from_timestamp, to_timestamp, use_real_data=False, initial_balance=300, engine="vectorized")
\ No newline at end of file
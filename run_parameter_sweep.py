@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from bot.parameter_sweep import ParameterSweep
+from configs.settings import Settings
+from utils.logging_utils import apply_log_profile
+
+from_datetime = datetime.strptime("2023-01-01", "%Y-%m-%d")
+to_datetime = datetime.strptime("2025-04-12", "%Y-%m-%d")
+
+from_timestamp = int(from_datetime.timestamp() * 1000)
+to_timestamp = int(to_datetime.timestamp() * 1000)
+
+parameter_grid = {
+    "grid_levels_count": [10, 20, 40],
+    "buy_percentage": [0.005, 0.01],
+    "grid_historical_days": [30, 61, 90],
+    "grid_threshold_factor": [0.2, 0.3, 0.4],
+}
+
+if __name__ == "__main__":
+    apply_log_profile("backtest")
+    settings = Settings()
+
+    parameter_sweep = ParameterSweep(settings.historical_data_store, from_timestamp, to_timestamp, initial_balance=300)
+    results = parameter_sweep.run(parameter_grid)
+
+    ParameterSweep.write_results(results, "sweep_results.csv")
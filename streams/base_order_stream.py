@@ -0,0 +1,18 @@
+from abc import ABC, abstractmethod
+from typing import Callable
+
+from models.order_update import OrderUpdate
+
+
+class BaseOrderStream(ABC):
+    @abstractmethod
+    def start(self, on_order_update: Callable[[OrderUpdate], None]) -> None:
+        pass
+
+    @abstractmethod
+    def stop(self) -> None:
+        pass
+
+    @abstractmethod
+    def is_connected(self) -> bool:
+        pass
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+from typing import Callable
+
+
+class BasePriceStream(ABC):
+    @abstractmethod
+    def start(self, on_price: Callable[[float, int], None]) -> None:
+        pass
+
+    @abstractmethod
+    def stop(self) -> None:
+        pass
+
+    @abstractmethod
+    def is_connected(self) -> bool:
+        pass
@@ -0,0 +1,50 @@
+from typing import Callable, Optional
+
+from pybit.unified_trading import WebSocket
+
+from models.order_update import OrderUpdate
+from streams.base_order_stream import BaseOrderStream
+from utils.logging_utils import setup_logger
+
+
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
+
+
+class BybitOrderStream(BaseOrderStream):
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = False):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.testnet = testnet
+
+        self.web_socket: Optional[WebSocket] = None
+        self.on_order_update: Optional[Callable[[OrderUpdate], None]] = None
+
+    def start(self, on_order_update: Callable[[OrderUpdate], None]) -> None:
+        self.on_order_update = on_order_update
+
+        # pybit keeps the connection on its own thread and resubscribes after reconnecting.
+        self.web_socket = WebSocket(
+            testnet=self.testnet,
+            channel_type="private",
+            api_key=self.api_key,
+            api_secret=self.api_secret
+        )
+        self.web_socket.order_stream(callback=self.handle_message)
+        logger.info("Subscribed to Bybit private order stream.")
+
+    def stop(self) -> None:
+        if self.web_socket is not None:
+            self.web_socket.exit()
+            self.web_socket = None
+            logger.info("Bybit private order stream closed.")
+
+    def is_connected(self) -> bool:
+        return self.web_socket is not None and self.web_socket.is_connected()
+
+    def handle_message(self, message: dict) -> None:
+        try:
+            for entry in message.get("data", []):
+                if entry.get("category", "spot") == "spot" and entry.get("orderLinkId"):
+                    self.on_order_update(OrderUpdate.from_dict(entry))
+        except Exception as e:
+            logger.error("Failed to handle order stream message %s: %s", message, e, exc_info=True)
@@ -0,0 +1,42 @@
+from typing import Callable, Optional
+
+from pybit.unified_trading import WebSocket
+
+from streams.base_price_stream import BasePriceStream
+from utils.logging_utils import setup_logger
+
+
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
+
+
+class BybitTickerStream(BasePriceStream):
+    def __init__(self, symbol: str, testnet: bool = False):
+        self.symbol = symbol
+        self.testnet = testnet
+
+        self.web_socket: Optional[WebSocket] = None
+        self.on_price: Optional[Callable[[float, int], None]] = None
+
+    def start(self, on_price: Callable[[float, int], None]) -> None:
+        self.on_price = on_price
+
+        self.web_socket = WebSocket(testnet=self.testnet, channel_type="spot")
+        self.web_socket.ticker_stream(symbol=self.symbol, callback=self.handle_message)
+        logger.info("Subscribed to Bybit spot ticker stream for %s.", self.symbol)
+
+    def stop(self) -> None:
+        if self.web_socket is not None:
+            self.web_socket.exit()
+            self.web_socket = None
+            logger.info("Bybit spot ticker stream for %s closed.", self.symbol)
+
+    def is_connected(self) -> bool:
+        return self.web_socket is not None and self.web_socket.is_connected()
+
+    def handle_message(self, message: dict) -> None:
+        try:
+            data = message.get("data", {})
+            if data.get("symbol") == self.symbol and data.get("lastPrice"):
+                self.on_price(float(data["lastPrice"]), int(message.get("ts", 0)))
+        except Exception as e:
+            logger.error("Failed to handle ticker stream message %s: %s", message, e, exc_info=True)
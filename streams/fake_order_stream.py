@@ -0,0 +1,40 @@
+import time
+
+from streams.bybit_order_stream import BybitOrderStream
+
+
+class FakeOrderStream(BybitOrderStream):
+    """
+    Offline stand-in for the Bybit private order stream: publish() builds the same message the
+    exchange pushes and runs it through the regular message handler.
+    """
+
+    def __init__(self):
+        super().__init__(api_key="", api_secret="")
+        self.connected = False
+
+    def start(self, on_order_update) -> None:
+        self.on_order_update = on_order_update
+        self.connected = True
+
+    def stop(self) -> None:
+        self.connected = False
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def publish(self, order_link_id: str, order_status: str, symbol: str = "BTCUSDT", side: str = "Buy",
+                executed_qty: str = "0") -> None:
+        self.handle_message({
+            "topic": "order",
+            "creationTime": int(time.time() * 1000),
+            "data": [{
+                "category": "spot",
+                "symbol": symbol,
+                "orderLinkId": order_link_id,
+                "orderStatus": order_status,
+                "side": side,
+                "cumExecQty": executed_qty,
+                "updatedTime": str(int(time.time() * 1000)),
+            }]
+        })
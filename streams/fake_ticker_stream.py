@@ -0,0 +1,34 @@
+import time
+
+from streams.bybit_ticker_stream import BybitTickerStream
+
+
+class FakeTickerStream(BybitTickerStream):
+    """
+    Offline stand-in for the Bybit spot ticker stream: publish() builds the same message the
+    exchange pushes and runs it through the regular message handler.
+    """
+
+    def __init__(self, symbol: str = "BTCUSDT"):
+        super().__init__(symbol)
+        self.connected = False
+
+    def start(self, on_price) -> None:
+        self.on_price = on_price
+        self.connected = True
+
+    def stop(self) -> None:
+        self.connected = False
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def publish(self, last_price: float) -> None:
+        timestamp = int(time.time() * 1000)
+        self.handle_message({
+            "topic": f"tickers.{self.symbol}",
+            "ts": timestamp,
+            "type": "snapshot",
+            "cs": timestamp,
+            "data": {"symbol": self.symbol, "lastPrice": str(last_price)}
+        })
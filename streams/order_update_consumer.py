@@ -0,0 +1,103 @@
+import queue
+import threading
+
+from models.order_update import OrderUpdate
+from order_managers.base_order_manager import BaseOrderManager
+from streams.base_order_stream import BaseOrderStream
+from utils.logging_utils import setup_logger
+
+
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
+
+
+class OrderUpdateConsumer:
+    """
+    Collects order updates pushed on the stream's thread and applies them to the order manager
+    on the bot thread, so order state is never modified from two threads at once.
+    """
+
+    filled_statuses = {"Filled"}
+    terminated_statuses = {"Cancelled", "Rejected", "Deactivated", "PartiallyFilledCanceled"}
+    # Statuses after which some of the order executed, so wallet balances changed.
+    executed_statuses = {"Filled", "PartiallyFilled", "PartiallyFilledCanceled"}
+
+    def __init__(self, order_stream: BaseOrderStream, symbol: str):
+        self.order_stream = order_stream
+        self.symbol = symbol
+
+        self.__updates = queue.Queue()
+        self.__updates_available = threading.Event()
+
+        # Written only by the stream thread and read only by the bot thread, so no fill is missed.
+        self.__execution_count = 0
+        self.__taken_execution_count = 0
+
+    def start(self) -> None:
+        self.order_stream.start(self.__on_order_update)
+
+    def stop(self) -> None:
+        self.order_stream.stop()
+
+    def is_connected(self) -> bool:
+        return self.order_stream.is_connected()
+
+    def wait_for_updates(self, timeout: float) -> bool:
+        return self.__updates_available.wait(timeout)
+
+    def take_executions(self) -> bool:
+        # Whether any order of the symbol, buy or sell, executed since the previous call.
+        execution_count = self.__execution_count
+        has_executions = execution_count != self.__taken_execution_count
+        self.__taken_execution_count = execution_count
+        return has_executions
+
+    def apply_updates(self, order_manager: BaseOrderManager) -> int:
+        self.__updates_available.clear()
+
+        # Only the latest status of every order matters.
+        latest_updates = {}
+        while True:
+            try:
+                update = self.__updates.get_nowait()
+            except queue.Empty:
+                break
+            latest_updates[update.order_link_id] = update
+
+        applied_updates = 0
+        for order_link_id, update in latest_updates.items():
+            if update.order_status not in self.filled_statuses and update.order_status not in self.terminated_statuses:
+                continue
+
+            order = order_manager.get_order(order_link_id)
+            if order is None or order.allow_to_sell:
+                continue
+
+            if update.order_status in self.filled_statuses:
+                logger.info("OrderLinkId %s filled (order stream). Marking as 'allowToSell'.", order_link_id)
+                order_manager.update_order(order_link_id, allowToSell=True)
+            elif update.order_status == "PartiallyFilledCanceled" and update.executed_qty:
+                # The executed part is held like any filled buy, so it is kept and sold; only its amount shrinks.
+                logger.info("OrderLinkId %s partially filled (%s of %s) and canceled (order stream). "
+                            "Marking the executed amount as 'allowToSell'.",
+                            order_link_id, update.executed_qty, order.amount)
+                order_manager.update_order(order_link_id, amount=update.executed_qty, allowToSell=True)
+            else:
+                logger.info("OrderLinkId %s %s (order stream). Removing record from database.",
+                            order_link_id, update.order_status)
+                order_manager.remove_order(order_link_id)
+            applied_updates += 1
+
+        return applied_updates
+
+    def __on_order_update(self, update: OrderUpdate) -> None:
+        if update.symbol != self.symbol:
+            return
+        if update.order_status in self.executed_statuses:
+            self.__execution_count += 1
+
+        # Sell orders are never stored, so only buys can change order state.
+        if update.side != "Buy":
+            return
+
+        self.__updates.put(update)
+        self.__updates_available.set()
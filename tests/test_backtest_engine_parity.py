@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from bot.grid_bot import GridBot
+from models.price_series import PriceSeries
+
+DAY_MS = 24 * 60 * 60 * 1000
+START_TIMESTAMP = 1672531200000
+
+
+def _make_price_series(days: int) -> PriceSeries:
+    random = np.random.default_rng(1)
+    minutes = days * 24 * 60
+    timestamps = START_TIMESTAMP + np.arange(minutes, dtype=np.int64) * 60_000
+    prices = np.round(20000 * np.exp(np.cumsum(random.normal(0, 0.0015, minutes))), 2)
+    return PriceSeries(timestamps, prices)
+
+
+def _run_backtest(engine: str, price_series: PriceSeries) -> list:
+    bot = GridBot()
+    bot.fetch_historical_data = lambda from_timestamp, to_timestamp, use_real_data: price_series
+    try:
+        bot.run_backtest(START_TIMESTAMP + 3 * DAY_MS, START_TIMESTAMP + 14 * DAY_MS, engine=engine)
+    finally:
+        bot.io_executor.shutdown()
+    return bot.grid_spot_strategy.trade_results
+
+
+@pytest.mark.parametrize("price_distribution", ["window", "sketch"])
+@pytest.mark.parametrize("grid_recalculation_mode", ["timer", "adaptive"])
+def test_vectorized_engine_matches_loop_engine(monkeypatch, tmp_path, price_distribution, grid_recalculation_mode):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PRICE_DISTRIBUTION", price_distribution)
+    monkeypatch.setenv("PRICE_SKETCH_PATH", "")
+    monkeypatch.setenv("GRID_RECALCULATION_MODE", grid_recalculation_mode)
+    monkeypatch.setenv("GRID_HISTORICAL_DAYS", "3")
+    monkeypatch.setenv("KLINE_CACHE_PATH", "")
+    monkeypatch.setenv("ORDER_STREAM_ENABLED", "false")
+    monkeypatch.setenv("PROFILE_MODE", "")
+
+    price_series = _make_price_series(days=14)
+
+    loop_trade_results = _run_backtest("loop", price_series)
+    vectorized_trade_results = _run_backtest("vectorized", price_series)
+
+    assert loop_trade_results
+    assert vectorized_trade_results == loop_trade_results
@@ -0,0 +1,90 @@
+import math
+
+import numpy as np
+import pytest
+
+from bot.grid_levels_calculator import GridLevelsCalculator
+from models.price_series import PriceSeries
+
+DAY_MS = 24 * 60 * 60 * 1000
+START_TIMESTAMP = 1672531200000
+
+
+def _make_price_series() -> PriceSeries:
+    random = np.random.default_rng(3)
+    timestamps = START_TIMESTAMP + np.arange(20 * 24 * 60, dtype=np.int64) * 60_000
+    # A gap of a day and a half, so some windows are short or empty.
+    timestamps = np.delete(timestamps, np.arange(5 * 24 * 60, 6 * 24 * 60 + 12 * 60))
+    prices = 30000 + np.cumsum(random.normal(0, 20, len(timestamps)))
+    return PriceSeries(timestamps, prices)
+
+
+def test_grid_bounds_batch_matches_per_window_calculation():
+    price_series = _make_price_series()
+    grid_levels_count = 20
+    # 1 minute, 10 minutes, 1 day, 4 days.
+    window_lengths_ms = [60_000, 10 * 60_000, DAY_MS, 4 * DAY_MS]
+    recalculation_timestamps = np.concatenate((
+        [START_TIMESTAMP, START_TIMESTAMP + 60_000, START_TIMESTAMP + 5 * 60_000],
+        START_TIMESTAMP + np.arange(1, 20) * DAY_MS,
+        # Inside the gap and right after it.
+        [START_TIMESTAMP + 6 * DAY_MS, START_TIMESTAMP + 6 * DAY_MS + 12 * 60 * 60_000 + 3 * 60_000],
+    ))
+
+    batch = GridLevelsCalculator.calculate_grid_bounds_batch(
+        price_series, recalculation_timestamps, window_lengths_ms, grid_levels_count
+    )
+    assert batch.percentile_min.shape == (len(window_lengths_ms), len(recalculation_timestamps))
+
+    checked = {"short": 0, "bollinger_short": 0, "full": 0}
+    for window_index, window_length_ms in enumerate(window_lengths_ms):
+        for timestamp_index, timestamp in enumerate(recalculation_timestamps.tolist()):
+            position = window_index, timestamp_index
+            start = np.searchsorted(price_series.timestamps, math.ceil(timestamp - window_length_ms), side="left")
+            end = np.searchsorted(price_series.timestamps, timestamp, side="left")
+            window = price_series.prices[start:end].tolist()
+            assert batch.price_counts[position] == len(window)
+
+            if len(window) < 2:
+                checked["short"] += 1
+                for values in (batch.percentile_min, batch.percentile_max, batch.std_min, batch.std_max,
+                               batch.bollinger_min, batch.bollinger_max, batch.uniform_step):
+                    assert np.isnan(values[position])
+                continue
+
+            percentile_levels = GridLevelsCalculator.calculate_grid_levels_with_percentile(window, grid_levels_count)
+            assert batch.percentile_min[position] == percentile_levels.min
+            assert batch.percentile_max[position] == percentile_levels.max
+
+            uniform_levels = GridLevelsCalculator.calculate_uniform_grid_levels_from_step(window, grid_levels_count)
+            assert batch.uniform_step[position] == uniform_levels.step
+
+            # Prefix sums round differently from np.std over the window.
+            std_levels = GridLevelsCalculator.calculate_grid_levels_with_standard_deviation(window, grid_levels_count)
+            assert batch.std_min[position] == pytest.approx(std_levels.min, abs=1e-7)
+            assert batch.std_max[position] == pytest.approx(std_levels.max, abs=1e-7)
+
+            if len(window) < 20:
+                checked["bollinger_short"] += 1
+                assert np.isnan(batch.bollinger_min[position])
+                assert np.isnan(batch.bollinger_max[position])
+                continue
+
+            checked["full"] += 1
+            bollinger_levels = GridLevelsCalculator.calculate_grid_levels_bollinger(window, grid_levels_count)
+            assert batch.bollinger_min[position] == bollinger_levels.min
+            assert batch.bollinger_max[position] == bollinger_levels.max
+
+    assert all(checked.values())
+
+
+def test_grid_bounds_batch_rows():
+    price_series = _make_price_series()
+    batch = GridLevelsCalculator.calculate_grid_bounds_batch(
+        price_series, [START_TIMESTAMP + DAY_MS, START_TIMESTAMP + 2 * DAY_MS], [DAY_MS], 20
+    )
+
+    rows = batch.to_rows()
+    assert [row["timestamp"] for row in rows] == [START_TIMESTAMP + DAY_MS, START_TIMESTAMP + 2 * DAY_MS]
+    assert rows[0]["price_count"] == 24 * 60
+    assert rows[0]["percentile_min"] == batch.percentile_min[0, 0]
@@ -0,0 +1,67 @@
+import pytest
+
+from data.kline_cache import KlineCache
+
+SYMBOL = "BTCUSDT"
+INTERVAL = "1"
+
+
+@pytest.fixture
+def kline_cache(tmp_path):
+    cache = KlineCache(str(tmp_path / "klines.sqlite"))
+    yield cache
+    cache.connection.close()
+
+
+def _store_coverage(kline_cache, start, end):
+    kline_cache.store(SYMBOL, INTERVAL, [], start, end)
+
+
+def test_empty_cache_misses_the_whole_range(kline_cache):
+    assert kline_cache.get_missing_ranges(SYMBOL, INTERVAL, 100, 200) == [(100, 200)]
+
+
+def test_fully_covered_range_has_nothing_missing(kline_cache):
+    _store_coverage(kline_cache, 0, 1000)
+    assert kline_cache.get_missing_ranges(SYMBOL, INTERVAL, 100, 200) == []
+    assert kline_cache.get_missing_ranges(SYMBOL, INTERVAL, 0, 1000) == []
+
+
+def test_partially_covered_range(kline_cache):
+    _store_coverage(kline_cache, 100, 199)
+    _store_coverage(kline_cache, 300, 399)
+
+    assert kline_cache.get_missing_ranges(SYMBOL, INTERVAL, 50, 450) == [(50, 99), (200, 299), (400, 450)]
+    assert kline_cache.get_missing_ranges(SYMBOL, INTERVAL, 150, 350) == [(200, 299)]
+    # Coverage of another symbol does not count.
+    assert kline_cache.get_missing_ranges("ETHUSDT", INTERVAL, 150, 350) == [(150, 350)]
+
+
+def test_overlapping_ranges_are_merged(kline_cache):
+    _store_coverage(kline_cache, 100, 200)
+    _store_coverage(kline_cache, 150, 300)
+    _store_coverage(kline_cache, 120, 130)
+
+    assert kline_cache._KlineCache__get_coverage(SYMBOL, INTERVAL) == [(100, 300)]
+    assert kline_cache.get_missing_ranges(SYMBOL, INTERVAL, 0, 400) == [(0, 99), (301, 400)]
+
+
+def test_touching_ranges_are_merged(kline_cache):
+    _store_coverage(kline_cache, 100, 199)
+    _store_coverage(kline_cache, 200, 299)
+    _store_coverage(kline_cache, 301, 400)
+
+    # 299 and 301 leave 300 uncovered, so only the first two touch.
+    assert kline_cache._KlineCache__get_coverage(SYMBOL, INTERVAL) == [(100, 299), (301, 400)]
+    assert kline_cache.get_missing_ranges(SYMBOL, INTERVAL, 100, 400) == [(300, 300)]
+
+
+def test_stored_klines_are_deduplicated(kline_cache):
+    kline_cache.store(SYMBOL, INTERVAL, [{"timestamp": 60_000, "close_price": 1.0}], 60_000, 60_000)
+    kline_cache.store(SYMBOL, INTERVAL, [{"timestamp": 60_000, "close_price": 2.0},
+                                         {"timestamp": 120_000, "close_price": 3.0}], 60_000, 120_000)
+
+    assert kline_cache.load(SYMBOL, INTERVAL, 0, 200_000) == [
+        {"timestamp": 60_000, "close_price": 2.0},
+        {"timestamp": 120_000, "close_price": 3.0},
+    ]
@@ -0,0 +1,71 @@
+import random
+
+from models.order import Order
+from order_managers.position_book import PositionBook
+
+
+class CountingDict(dict):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.lookups = 0
+
+    def __getitem__(self, key):
+        self.lookups += 1
+        return super().__getitem__(key)
+
+
+def _find_sellable_order_by_scan(orders, current_price, min_profit):
+    # The linear scan PositionBook replaces (BaseOrderManager.find_sellable_order).
+    sorted_orders = sorted(orders, key=lambda order: order.price)
+    return next(
+        (order for order in sorted_orders if (current_price - order.price) * order.amount > min_profit and order.allow_to_sell),
+        None
+    )
+
+
+def test_find_sellable_order_matches_linear_scan():
+    generator = random.Random(7)
+    book = PositionBook()
+    orders = []
+    for index in range(500):
+        order = Order(
+            order_link_id=f"order-{index}",
+            amount=generator.choice([0.0001, 0.001, 0.01]),
+            price=round(generator.uniform(90, 110), 2),
+            allow_to_sell=generator.random() < 0.8,
+        )
+        orders.append(order)
+        book.add(order)
+
+    for _ in range(200):
+        current_price = generator.uniform(85, 115)
+        expected = _find_sellable_order_by_scan(orders, current_price, 0.02)
+        assert book.find_sellable_order(current_price, 0.02) is expected
+
+
+def test_find_sellable_order_visits_only_lots_below_the_profit_bound():
+    book = PositionBook()
+    # Cheap lots too small to ever clear min_profit, then equal lots that could.
+    for index in range(300):
+        book.add(Order(order_link_id=f"small-{index}", amount=0.0001, price=90 + index * 0.01, allow_to_sell=True))
+    for index in range(300):
+        book.add(Order(order_link_id=f"large-{index}", amount=1.0, price=99.99 + index * 0.01, allow_to_sell=True))
+    book.orders = CountingDict(book.orders)
+
+    # Only lots priced below 100 - 0.02 / 1.0 can be worth selling: the 300 small ones.
+    assert book.find_sellable_order(100, 0.02) is None
+    assert book.orders.lookups == 300
+
+
+def test_find_sellable_order_with_equal_amounts_stops_at_the_first_lot():
+    book = PositionBook()
+    for index in range(1000):
+        book.add(Order(order_link_id=f"order-{index}", amount=0.001, price=100 + index, allow_to_sell=True))
+    book.orders = CountingDict(book.orders)
+
+    assert book.find_sellable_order(150, 0.02).order_link_id == "order-0"
+    assert book.orders.lookups == 1
+
+    book.orders.lookups = 0
+    assert book.find_sellable_order(100.01, 0.02) is None
+    assert book.orders.lookups == 0
@@ -0,0 +1,81 @@
+import random
+
+import numpy as np
+import pytest
+
+from data.rolling_price_window import RollingPriceWindow
+from models.price_series import PriceSeries
+from utils.sorted_list import SortedList
+
+
+@pytest.fixture
+def small_buckets(monkeypatch):
+    # Small buckets, so a few hundred values already split and merge buckets.
+    monkeypatch.setattr(SortedList, "bucket_size", 4)
+
+
+def test_sorted_list_add_and_remove_across_buckets(small_buckets):
+    generator = random.Random(11)
+    sorted_list = SortedList()
+    expected = []
+
+    for _ in range(500):
+        value = generator.randint(0, 50)
+        sorted_list.add(value)
+        expected.append(value)
+    expected.sort()
+    assert list(sorted_list) == expected
+    assert len(sorted_list) == len(expected)
+
+    # Remove in random order until buckets empty out and disappear.
+    generator.shuffle(expected_order := list(expected))
+    for step, value in enumerate(expected_order):
+        sorted_list.remove(value)
+        expected.remove(value)
+        if step % 50 == 0:
+            assert list(sorted_list) == expected
+            assert [sorted_list[index] for index in (0, -1)] == [expected[0], expected[-1]]
+            assert sorted_list.bisect_left(25) == sum(1 for item in expected if item < 25)
+            assert sorted_list.bisect_right(25) == sum(1 for item in expected if item <= 25)
+
+    assert len(sorted_list) == 0
+    with pytest.raises(ValueError):
+        sorted_list.remove(1)
+
+    sorted_list.add(3)
+    assert list(sorted_list) == [3]
+
+
+def test_sorted_list_bulk_update(small_buckets):
+    sorted_list = SortedList([5, 1, 4])
+    sorted_list.update([3, 2, 6, 0])
+    assert list(sorted_list) == [0, 1, 2, 3, 4, 5, 6]
+    assert sorted_list.pop() == 6
+    assert sorted_list.pop(0) == 0
+    assert list(sorted_list) == [1, 2, 3, 4, 5]
+
+
+def test_rolling_window_percentile_matches_numpy_after_eviction(small_buckets):
+    generator = np.random.default_rng(2)
+    timestamps = np.arange(0, 2000 * 60_000, 60_000, dtype=np.int64)
+    prices = np.round(100 + np.cumsum(generator.normal(0, 1, len(timestamps))), 2)
+    price_series = PriceSeries(timestamps, prices)
+
+    window_duration_ms = 300 * 60_000
+    window = RollingPriceWindow(window_duration_ms)
+
+    for current_timestamp in range(100 * 60_000, 2000 * 60_000, 37 * 60_000):
+        window.advance(price_series, current_timestamp)
+
+        start = np.searchsorted(timestamps, current_timestamp - window_duration_ms, side="left")
+        end = np.searchsorted(timestamps, current_timestamp, side="left")
+        expected_prices = prices[start:end]
+
+        assert window.prices() == expected_prices.tolist()
+        for q in (0, 5, 50, 95, 100):
+            assert window.percentile(q) == np.percentile(expected_prices, q)
+
+
+def test_rolling_window_rejects_empty_percentile():
+    with pytest.raises(ValueError):
+        RollingPriceWindow(60_000).percentile(5)
@@ -0,0 +1,72 @@
+from models.order import Order
+from order_managers.sqlite_order_manager import SQLiteOrderManager
+from streams.fake_order_stream import FakeOrderStream
+from streams.fake_ticker_stream import FakeTickerStream
+from streams.order_update_consumer import OrderUpdateConsumer
+from utils.latest_value_mailbox import LatestValueMailbox
+
+
+def test_order_stream_updates_are_applied_by_the_consumer(tmp_path):
+    order_manager = SQLiteOrderManager(str(tmp_path / "orders.sqlite"), "BTCUSDT")
+    order_manager.add_orders([
+        Order(order_link_id="filled", amount=0.001, price=20000),
+        Order(order_link_id="cancelled", amount=0.001, price=20100),
+        Order(order_link_id="open", amount=0.001, price=20200),
+        Order(order_link_id="partial", amount=0.001, price=20300),
+    ])
+
+    order_stream = FakeOrderStream()
+    consumer = OrderUpdateConsumer(order_stream, "BTCUSDT")
+    consumer.start()
+    assert consumer.is_connected()
+
+    order_stream.publish("filled", "New")
+    order_stream.publish("filled", "Filled")
+    order_stream.publish("cancelled", "Cancelled")
+    order_stream.publish("open", "New")
+    order_stream.publish("partial", "PartiallyFilled", executed_qty="0.0004")
+    order_stream.publish("partial", "PartiallyFilledCanceled", executed_qty="0.0004")
+    # Sells and other symbols never change stored orders.
+    order_stream.publish("open", "Filled", side="Sell")
+    order_stream.publish("open", "Filled", symbol="ETHUSDT")
+
+    assert consumer.wait_for_updates(timeout=0)
+    assert consumer.apply_updates(order_manager) == 3
+
+    assert order_manager.get_order("filled").allow_to_sell
+    assert order_manager.get_order("cancelled") is None
+    assert not order_manager.get_order("open").allow_to_sell
+    # The executed part of a canceled buy is kept and becomes sellable.
+    partial_order = order_manager.get_order("partial")
+    assert partial_order.allow_to_sell
+    assert partial_order.amount == 0.0004
+
+    # Fills of both sides change balances; the sell above counts, the cross-symbol fill does not.
+    assert consumer.take_executions()
+    assert not consumer.take_executions()
+    order_stream.publish("sold", "PartiallyFilled", side="Sell")
+    assert consumer.take_executions()
+
+    # Everything was taken in one go.
+    assert not consumer.wait_for_updates(timeout=0)
+    assert consumer.apply_updates(order_manager) == 0
+
+    consumer.stop()
+    assert not consumer.is_connected()
+    order_manager.close()
+
+
+def test_ticker_stream_prices_are_coalesced_in_the_mailbox():
+    mailbox = LatestValueMailbox()
+    price_stream = FakeTickerStream("BTCUSDT")
+    price_stream.start(lambda price, timestamp: mailbox.put((price, timestamp)))
+
+    for price in (20000.0, 20010.5, 20021.0):
+        price_stream.publish(price)
+
+    price, timestamp = mailbox.take(timeout=0)
+    assert price == 20021.0
+    assert timestamp > 0
+    assert mailbox.put_count == 3
+    assert mailbox.coalesced_count == 2
+    assert mailbox.take(timeout=0) is None
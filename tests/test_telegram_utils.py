@@ -0,0 +1,38 @@
+from utils.telegram_utils import TelegramNotifier
+
+
+def _make_notifier(sent_messages):
+    notifier = TelegramNotifier("token", "chat", max_queue_size=2, messages_per_second=1000, timeout=1)
+    notifier._TelegramNotifier__post = sent_messages.append
+    return notifier
+
+
+def test_messages_with_the_same_coalesce_key_are_sent_once():
+    sent_messages = []
+    notifier = _make_notifier(sent_messages)
+
+    # Hold the worker back until the whole burst is queued.
+    with notifier._TelegramNotifier__condition:
+        for attempt in range(1, 4):
+            notifier.send(f"get_tickers failed (ErrTime: 12:00:0{attempt})", coalesce_key="api:get_tickers:Timeout")
+        notifier.send("Starting Grid Bot...")
+        notifier.send("Starting Grid Bot...")
+    assert notifier.flush(timeout=5)
+
+    assert sent_messages == [
+        "get_tickers failed (ErrTime: 12:00:03)\n\n(repeated 3 times)",
+        "Starting Grid Bot...\n\n(repeated 2 times)",
+    ]
+
+
+def test_full_queue_drops_the_oldest_message():
+    sent_messages = []
+    notifier = _make_notifier(sent_messages)
+
+    with notifier._TelegramNotifier__condition:
+        for index in range(3):
+            notifier.send(f"message {index}", coalesce_key=f"key {index}")
+    assert notifier.flush(timeout=5)
+
+    assert notifier.dropped_count == 1
+    assert sent_messages == ["message 1", "message 2"]
@@ -0,0 +1,39 @@
+from utils.ttl_cache import TTLCache
+
+
+def test_get_or_load_caches_until_invalidated():
+    cache = TTLCache(default_ttl=60)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return len(loads)
+
+    assert cache.get_or_load("balance", load) == 1
+    assert cache.get_or_load("balance", load) == 1
+
+    cache.invalidate()
+    assert cache.get_or_load("balance", load) == 2
+
+
+def test_load_overtaken_by_invalidation_is_not_stored():
+    cache = TTLCache(default_ttl=60)
+
+    def load_while_order_fills():
+        # The balance was read, then a fill invalidated the cache before the load returned.
+        cache.invalidate()
+        return 100.0
+
+    assert cache.get_or_load("balance", load_while_order_fills) == 100.0
+    assert cache.get("balance") is None
+
+    assert cache.get_or_load("balance", lambda: 90.0) == 90.0
+    assert cache.get("balance") == 90.0
+
+
+def test_expired_entries_are_reloaded():
+    cache = TTLCache(default_ttl=0)
+    cache.set("balance", 1.0)
+    assert cache.get("balance") is None
+    assert cache.get_or_load("balance", lambda: 2.0, ttl=60) == 2.0
+    assert cache.get("balance") == 2.0
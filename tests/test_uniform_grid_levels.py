@@ -0,0 +1,56 @@
+import numpy as np
+
+from bot.grid_levels_calculator import GridLevelsCalculator
+
+GRID_THRESHOLD_FACTOR = 0.3
+
+
+def _find_nearest_levels_by_scan(levels, price):
+    # The scan GridSpotStrategy did over the materialized list before UniformGridLevels.
+    lower_level = max((level for level in levels if level <= price), default=None)
+    upper_level = min((level for level in levels if level >= price), default=None)
+    return lower_level, upper_level
+
+
+def _get_zone(price, lower_level, upper_level):
+    grid_distance = upper_level - lower_level if lower_level is not None and upper_level is not None else 0
+    if lower_level is not None and lower_level <= price < lower_level + grid_distance * GRID_THRESHOLD_FACTOR:
+        return "buy"
+    if upper_level is not None and upper_level >= price > upper_level - grid_distance * GRID_THRESHOLD_FACTOR:
+        return "sell"
+    return None
+
+
+def test_uniform_grid_matches_materialized_levels():
+    random = np.random.default_rng(5)
+    historical_prices = (30000 + np.cumsum(random.normal(0, 50, 5000))).tolist()
+    grid_levels = GridLevelsCalculator.calculate_uniform_grid_levels_from_step(historical_prices, 20)
+
+    step = grid_levels.step
+    levels = np.arange(0, 1_000_000 + step, step)
+    assert len(grid_levels) == len(levels)
+    assert [grid_levels.level_at(index) for index in (0, 1, 1000, len(levels) - 1)] == \
+        levels[[0, 1, 1000, len(levels) - 1]].tolist()
+
+    # Range ends, exact levels, their floating point neighbours and random prices.
+    on_levels = levels[[0, 1, 2, 67, 68, 69, len(levels) // 2, len(levels) - 2, len(levels) - 1]]
+    prices = np.concatenate((
+        [0.0, grid_levels.min, grid_levels.max, np.nextafter(grid_levels.max, 0), levels[-1] + step / 2],
+        on_levels,
+        np.nextafter(on_levels, np.inf),
+        np.nextafter(on_levels, -np.inf),
+        random.uniform(25000, 35000, 200),
+    ))
+    prices = prices[prices >= 0]
+
+    lower_levels, upper_levels, has_lower, has_upper = grid_levels.find_nearest_levels_array(prices)
+    for index, price in enumerate(prices.tolist()):
+        expected = _find_nearest_levels_by_scan(levels, price)
+
+        assert grid_levels.find_nearest_levels(price) == expected
+
+        array_lower = lower_levels[index] if has_lower[index] else None
+        array_upper = upper_levels[index] if has_upper[index] else None
+        assert (array_lower, array_upper) == expected
+
+        assert _get_zone(price, *grid_levels.find_nearest_levels(price)) == _get_zone(price, *expected)
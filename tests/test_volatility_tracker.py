@@ -0,0 +1,91 @@
+import math
+
+from bot.volatility_tracker import VolatilityTracker
+from data.base_price_distribution import BasePriceDistribution
+
+MINUTE_MS = 60_000
+
+
+class FixedDistribution(BasePriceDistribution):
+    def __init__(self, lower_bound: float, upper_bound: float):
+        self.bounds = {5: lower_bound, 95: upper_bound}
+
+    def percentile(self, q: float) -> float:
+        return self.bounds[q]
+
+    def __len__(self) -> int:
+        return 100
+
+
+def _make_tracker() -> VolatilityTracker:
+    return VolatilityTracker(
+        threshold=0.05, half_life_ms=5 * MINUTE_MS, min_interval_ms=15 * MINUTE_MS, max_interval_ms=24 * 60 * MINUTE_MS
+    )
+
+
+def _feed(tracker: VolatilityTracker, timestamp: int, minutes: int, daily_volatility: float) -> int:
+    # Alternating one-minute log returns of equal size: the EWMA settles exactly at daily_volatility.
+    log_return = daily_volatility / math.sqrt(VolatilityTracker.day_ms / MINUTE_MS)
+    for minute in range(minutes):
+        timestamp += MINUTE_MS
+        tracker.update(timestamp, 100 * math.exp(log_return) if minute % 2 == 0 else 100.0)
+    return timestamp
+
+
+def test_volatility_needs_min_samples():
+    tracker = _make_tracker()
+    assert tracker.get_recalculation_reason(0, 100) == "no grid yet"
+
+    timestamp = _feed(tracker, 0, VolatilityTracker.min_samples, 0.03)
+    assert tracker.volatility is None
+
+    _feed(tracker, timestamp, 1, 0.03)
+    assert math.isclose(tracker.volatility, 0.03, rel_tol=1e-9)
+
+
+def test_volatility_crossing_respects_hysteresis():
+    tracker = _make_tracker()
+    timestamp = _feed(tracker, 0, 60, 0.03)
+    tracker.mark_recalculated(timestamp)
+
+    # Above the threshold but inside the band: no recalculation.
+    timestamp = _feed(tracker, timestamp, 120, 0.054)
+    assert math.isclose(tracker.volatility, 0.054, rel_tol=1e-6)
+    assert tracker.get_recalculation_reason(timestamp, 100) is None
+
+    timestamp = _feed(tracker, timestamp, 120, 0.06)
+    assert "rose above" in tracker.get_recalculation_reason(timestamp, 100)
+
+    tracker.mark_recalculated(timestamp)
+    timestamp = _feed(tracker, timestamp, 120, 0.046)
+    assert tracker.get_recalculation_reason(timestamp, 100) is None
+
+    timestamp = _feed(tracker, timestamp, 120, 0.04)
+    assert "fell below" in tracker.get_recalculation_reason(timestamp, 100)
+
+
+def test_price_leaving_the_grid_range():
+    tracker = _make_tracker()
+    timestamp = _feed(tracker, 0, 60, 0.03)
+    tracker.mark_recalculated(timestamp, FixedDistribution(95, 105))
+    timestamp = _feed(tracker, timestamp, 20, 0.03)
+
+    # The range is widened by the threshold: 95 * 0.95 = 90.25 and 105 * 1.05 = 110.25.
+    assert tracker.get_recalculation_reason(timestamp, 110) is None
+    assert tracker.get_recalculation_reason(timestamp, 91) is None
+    assert "rose above" in tracker.get_recalculation_reason(timestamp, 111)
+    assert "fell below" in tracker.get_recalculation_reason(timestamp, 90)
+
+
+def test_recalculation_interval_limits():
+    tracker = _make_tracker()
+    timestamp = _feed(tracker, 0, 60, 0.03)
+    tracker.mark_recalculated(timestamp, FixedDistribution(95, 105))
+
+    # Never sooner than min_interval_ms, however far the price moves.
+    assert tracker.get_recalculation_reason(timestamp + 14 * MINUTE_MS, 200) is None
+    assert tracker.get_recalculation_reason(timestamp + 15 * MINUTE_MS, 200) is not None
+
+    # A calm market is still recalculated after max_interval_ms.
+    assert tracker.get_recalculation_reason(timestamp + 24 * 60 * MINUTE_MS - 1, 100) is None
+    assert "since the last recalculation" in tracker.get_recalculation_reason(timestamp + 24 * 60 * MINUTE_MS, 100)
@@ -1,3 +1,5 @@
+from typing import Dict, Optional
+
 from models.order import Order
 from models.order_placement_result import OrderActionResult
 from models.portfolio_balance import PortfolioBalance
@@ -15,6 +17,9 @@ class BacktestTrader(BaseTrader):
     def is_order_closed(self, order_link_id: str) -> bool:
         pass
 
+    def get_order_statuses(self, symbol: str, start_time: Optional[int] = None) -> Optional[Dict[str, str]]:
+        return {}
+
     def place_order(self, symbol: str, decision: Order) -> OrderActionResult:
         if decision.action == "Buy":
             self.balance["USDT"] -= decision.amount * decision.price
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Dict, Optional
 from models.order import Order
 from models.order_placement_result import OrderActionResult
 from models.portfolio_balance import PortfolioBalance
@@ -13,6 +14,10 @@ class BaseTrader(ABC):
     def is_order_closed(self, order_link_id: str) -> bool:
         pass
 
+    @abstractmethod
+    def get_order_statuses(self, symbol: str, start_time: Optional[int] = None) -> Optional[Dict[str, str]]:
+        pass
+
     @abstractmethod
     def place_order(self, symbol: str, decision: Order) -> OrderActionResult:
         pass
@@ -23,4 +28,7 @@ class BaseTrader(ABC):
 
     @abstractmethod
     def cancel_order(self, order_link_id: str) -> OrderActionResult:
-        pass
\ No newline at end of file
+        pass
+
+    def invalidate_balances(self) -> None:
+        pass
@@ -1,20 +1,52 @@
+import time
+from typing import Dict, List, Optional
+
 from models.coin_balance import CoinBalance
 from models.order import Order
 from models.order_placement_result import OrderActionResult
+from configs.settings import Settings
 from models.portfolio_balance import PortfolioBalance
 from traders.base_trader import BaseTrader
 from utils.logging_utils import setup_logger
+from utils.ttl_cache import TTLCache
 
 
-logger = setup_logger(log_dir="logs", days_to_keep=30)
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
 
 
 class BybitTrader(BaseTrader):
+    order_page_limit = 50
+    order_history_window_ms = 7 * 24 * 60 * 60 * 1000 - 60 * 1000
+
     def __init__(self, api_manager):
         self.api_manager = api_manager
+        self.settings = Settings()
+        # Wallet data only changes after our own orders, so it is cached and dropped on place/cancel/fill.
+        self.balance_cache = TTLCache(self.settings.balance_cache_ttl)
 
     def get_available_coin_balance(self, coin: str, account_type: str = "UNIFIED") -> float:
-        logger.info(f"Fetching balance information for accountType={account_type}, coin={coin}.")
+        available_balance = self.balance_cache.get_or_load(
+            ("coin_balance", coin, account_type), lambda: self.__fetch_available_coin_balance(coin, account_type)
+        )
+        return available_balance if available_balance is not None else 0.0
+
+    def get_portfolio_balance(self, account_type="UNIFIED") -> PortfolioBalance:
+        portfolio_balance = self.balance_cache.get_or_load(
+            ("portfolio_balance", account_type), lambda: self.__fetch_portfolio_balance(account_type)
+        )
+        if portfolio_balance is None:
+            return PortfolioBalance(
+                total_equity=0.0,
+                total_available_balance=0.0,
+                details=[]
+            )
+        return portfolio_balance
+
+    def invalidate_balances(self) -> None:
+        self.balance_cache.invalidate()
+
+    def __fetch_available_coin_balance(self, coin: str, account_type: str) -> Optional[float]:
+        logger.info("Fetching balance information for accountType=%s, coin=%s.", account_type, coin)
         try:
             response = self.api_manager.safe_api_call(
                 self.api_manager.http_session.get_wallet_balance,
@@ -22,12 +54,12 @@ class BybitTrader(BaseTrader):
                 coin=coin
             )
         except Exception as e:
-            logger.error(f"Error during balance fetching: {e}", exc_info=True)
-            return 0.0
+            logger.error("Error during balance fetching: %s", e, exc_info=True)
+            return None
 
-        if response.get("retCode") != 0:
-            logger.error(f"Error fetching balance: {response.get('retMsg')}")
-            return 0.0
+        if response is None or response.get("retCode") != 0:
+            logger.error("Error fetching balance: %s", response.get('retMsg') if response else 'No response from API')
+            return None
 
         balance_data = response["result"].get("list", [])
         if not balance_data:
@@ -44,19 +76,19 @@ class BybitTrader(BaseTrader):
                         available_balance = wallet_balance - locked_balance
 
                         logger.info(
-                            f"Coin: {coin}, Wallet Balance: {wallet_balance:.6f}, "
-                            f"Locked Balance: {locked_balance:.6f}, Available Balance: {available_balance:.6f}"
+                            "Coin: %s, Wallet Balance: %.6f, Locked Balance: %.6f, Available Balance: %.6f",
+                            coin, wallet_balance, locked_balance, available_balance
                         )
                         return available_balance
 
-                logger.info(f"Coin {coin} not found in accountType={account_type}. Returning 0.0 balance.")
+                logger.info("Coin %s not found in accountType=%s. Returning 0.0 balance.", coin, account_type)
                 return 0.0
 
-        logger.warning(f"No account found with type {account_type} in API response.")
+        logger.warning("No account found with type %s in API response.", account_type)
         return 0.0
 
     def is_order_closed(self, order_link_id: str) -> bool:
-        logger.info(f"Checking if order with orderLinkId: {order_link_id} is closed...")
+        logger.info("Checking if order with orderLinkId: %s is closed...", order_link_id)
 
         try:
             response = self.api_manager.safe_api_call(
@@ -65,7 +97,11 @@ class BybitTrader(BaseTrader):
                 orderLinkId=order_link_id
             )
         except Exception as e:
-            logger.error(f"Error during order status check: {e}", exc_info=True)
+            logger.error("Error during order status check: %s", e, exc_info=True)
+            return False
+
+        if response is None:
+            logger.error("No response while checking order %s. Assuming it is not closed.", order_link_id)
             return False
 
         if response.get("retCode") == 0:
@@ -75,20 +111,50 @@ class BybitTrader(BaseTrader):
                 if order.get("orderLinkId") == order_link_id:
                     order_status = order.get("orderStatus")
                     if order_status == "Filled":
-                        logger.info(f"Order {order_link_id} is closed (status: Filled).")
+                        logger.info("Order %s is closed (status: Filled).", order_link_id)
                         return True
                     else:
-                        logger.info(f"Order {order_link_id} is still open (status: {order_status}).")
+                        logger.info("Order %s is still open (status: %s).", order_link_id, order_status)
                         return False
 
-            logger.info(f"Order {order_link_id} not found in the response. Assuming it is not closed.")
+            logger.info("Order %s not found in the response. Assuming it is not closed.", order_link_id)
             return False
         else:
-            logger.error(f"Error fetching open orders: {response.get('retMsg')}")
+            logger.error("Error fetching open orders: %s", response.get('retMsg'))
             return False
 
+    def get_order_statuses(self, symbol: str, start_time: Optional[int] = None) -> Optional[Dict[str, str]]:
+        logger.info("Fetching open orders and order history for %s...", symbol)
+
+        # The spot order history only serves 7 days starting at startTime, so a start older than that
+        # would hide the most recent fills.
+        if start_time is not None:
+            start_time = max(start_time, int(time.time() * 1000) - self.order_history_window_ms)
+
+        try:
+            open_orders = self.__fetch_order_pages(
+                self.api_manager.http_session.get_open_orders, category="spot", symbol=symbol
+            )
+            history_parameters = {"startTime": start_time} if start_time is not None else {}
+            order_history = self.__fetch_order_pages(
+                self.api_manager.http_session.get_order_history, category="spot", symbol=symbol, **history_parameters
+            )
+        except Exception as e:
+            logger.error("Error fetching order statuses for %s: %s", symbol, e, exc_info=True)
+            return None
+
+        # History first, so an order that appears in both keeps its live status from the open orders.
+        order_statuses = {}
+        for order in order_history + open_orders:
+            if order.get("orderLinkId"):
+                order_statuses[order["orderLinkId"]] = order.get("orderStatus")
+
+        logger.info("Fetched statuses of %s orders for %s (%s open, %s from history).",
+                    len(order_statuses), symbol, len(open_orders), len(order_history))
+        return order_statuses
+
     def place_order(self, symbol: str, decision: Order) -> OrderActionResult:
-        logger.info(f"Placing {decision.action} order for {symbol} with orderLinkId {decision.order_link_id}...")
+        logger.info("Placing %s order for %s with orderLinkId %s...", decision.action, symbol, decision.order_link_id)
 
         response = self.api_manager.safe_api_call(
             self.api_manager.http_session.place_order,
@@ -103,31 +169,32 @@ class BybitTrader(BaseTrader):
         )
 
         if response is None:
-            logger.error(f"Failed to place order {decision.order_link_id}. No response from API.")
+            logger.error("Failed to place order %s. No response from API.", decision.order_link_id)
             return OrderActionResult(success=False, error_message="No response from API")
 
         if response.get("retCode") == 0:
-            logger.info(f"Order placed successfully: {response['result']}")
+            self.invalidate_balances()
+            logger.info("Order placed successfully: %s", response['result'])
             return OrderActionResult(success=True, result=response["result"])
         else:
             error_message = response.get("retMsg", "Unknown error")
-            logger.error(f"Error placing order: {error_message}")
+            logger.error("Error placing order: %s", error_message)
             return OrderActionResult(success=False, error_message=error_message)
 
-    def get_portfolio_balance(self, account_type="UNIFIED") -> PortfolioBalance:
-        logger.info(f"Fetching portfolio balance for accountType={account_type}...")
+    def __fetch_portfolio_balance(self, account_type: str) -> Optional[PortfolioBalance]:
+        logger.info("Fetching portfolio balance for accountType=%s...", account_type)
         try:
             response = self.api_manager.safe_api_call(
                 self.api_manager.http_session.get_wallet_balance,
                 accountType=account_type
             )
         except Exception as e:
-            logger.error(f"Error fetching portfolio balance: {e}", exc_info=True)
-            return PortfolioBalance(
-                total_equity=0.0,
-                total_available_balance=0.0,
-                details=[]
-            )
+            logger.error("Error fetching portfolio balance: %s", e, exc_info=True)
+            return None
+
+        if response is None:
+            logger.error("Error fetching portfolio balance: No response from API")
+            return None
 
         if response.get("retCode") == 0:
             balance_data = response["result"].get("list", [])
@@ -162,8 +229,9 @@ class BybitTrader(BaseTrader):
                         )
 
             logger.info(
-                f"Portfolio balance fetched successfully: Total Equity = {total_equity:.6f}, "
-                f"Total Available Balance = {total_available_balance:.6f}, Details: {len(coin_balances)} coins."
+                "Portfolio balance fetched successfully: Total Equity = %.6f, "
+                "Total Available Balance = %.6f, Details: %s coins.",
+                total_equity, total_available_balance, len(coin_balances)
             )
             return PortfolioBalance(
                 total_equity=total_equity,
@@ -171,15 +239,11 @@ class BybitTrader(BaseTrader):
                 details=coin_balances
             )
         else:
-            logger.error(f"Error fetching portfolio balance: {response.get('retMsg')}")
-            return PortfolioBalance(
-                total_equity=0.0,
-                total_available_balance=0.0,
-                details=[]
-            )
+            logger.error("Error fetching portfolio balance: %s", response.get('retMsg'))
+            return None
 
     def cancel_order(self, order_link_id: str) -> OrderActionResult:
-        logger.info(f"Attempting to cancel order with orderLinkId: {order_link_id}...")
+        logger.info("Attempting to cancel order with orderLinkId: %s...", order_link_id)
 
         try:
             response = self.api_manager.safe_api_call(
@@ -188,7 +252,7 @@ class BybitTrader(BaseTrader):
                 orderLinkId=order_link_id
             )
         except Exception as e:
-            logger.error(f"Error during order cancellation: {e}", exc_info=True)
+            logger.error("Error during order cancellation: %s", e, exc_info=True)
             return OrderActionResult(success=False, error_message=str(e))
 
         if response is None:
@@ -196,12 +260,35 @@ class BybitTrader(BaseTrader):
             return OrderActionResult(success=False, error_message="No response from API")
 
         if response.get("retCode") == 0:
-            logger.info(f"Order {order_link_id} successfully canceled: {response.get('result', {})}")
+            self.invalidate_balances()
+            logger.info("Order %s successfully canceled: %s", order_link_id, response.get('result', {}))
             return OrderActionResult(
                 success=True,
                 result=response.get("result", {})
             )
         else:
             error_message = response.get("retMsg", "Unknown error")
-            logger.error(f"Error canceling order {order_link_id}: {error_message}")
-            return OrderActionResult(success=False, error_message=error_message)
\ No newline at end of file
+            logger.error("Error canceling order %s: %s", order_link_id, error_message)
+            return OrderActionResult(success=False, error_message=error_message)
+
+    def __fetch_order_pages(self, request_function, **parameters) -> List[dict]:
+        orders = []
+        cursor = None
+
+        while True:
+            if cursor:
+                parameters["cursor"] = cursor
+
+            response = self.api_manager.safe_api_call(request_function, limit=self.order_page_limit, **parameters)
+            if response is None:
+                raise RuntimeError("No response from API")
+            if response.get("retCode") != 0:
+                raise RuntimeError(response.get("retMsg"))
+
+            result = response.get("result", {})
+            orders.extend(result.get("list", []))
+
+            next_cursor = result.get("nextPageCursor")
+            if not next_cursor or next_cursor == cursor or not result.get("list"):
+                return orders
+            cursor = next_cursor
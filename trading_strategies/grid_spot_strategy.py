@@ -11,7 +11,7 @@ from utils.logging_utils import setup_logger
 from decimal import Decimal, ROUND_DOWN
 
 
-logger = setup_logger(log_dir="logs", days_to_keep=30)
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
 
 
 class GridSpotStrategy(BaseTradingStrategy):
@@ -19,6 +19,8 @@ class GridSpotStrategy(BaseTradingStrategy):
         self.settings = Settings()
         self.grid_levels = GridLevels(levels=[], min=0, max=0)
         self.balance = 0
+        # Live trading replaces this with the instrument's precision from the exchange.
+        self.qty_precision = self.settings.qty_precision
         #TODO: maybe store in somewhere
         self.trade_results = []
 
@@ -41,7 +43,7 @@ class GridSpotStrategy(BaseTradingStrategy):
 
     def log_grid_levels_and_zone(self, current_price: float) -> None:
         if not self.__is_price_within_grid(current_price):
-            logger.info(f"Current price {current_price:.2f} is outside the grid range.")
+            logger.info("Current price %.2f is outside the grid range.", current_price)
             return
 
         thresholds = self.__calculate_grid_thresholds(current_price)
@@ -49,35 +51,35 @@ class GridSpotStrategy(BaseTradingStrategy):
         upper = thresholds.upper_grid
 
         if lower is not None:
-            logger.info(f"Nearest lower grid: {lower:.2f}")
+            logger.info("Nearest lower grid: %.2f", lower)
         else:
             logger.info("No lower grid found.")
 
         if upper is not None:
-            logger.info(f"Nearest upper grid: {upper:.2f}")
+            logger.info("Nearest upper grid: %.2f", upper)
         else:
             logger.info("No upper grid found.")
 
         if lower is not None and lower <= current_price < thresholds.lower_buy_threshold:
-            logger.info(f"Zone: BUY zone (between {lower:.2f} and {thresholds.lower_buy_threshold:.2f})")
+            logger.info("Zone: BUY zone (between %.2f and %.2f)", lower, thresholds.lower_buy_threshold)
         elif upper is not None and upper >= current_price > thresholds.upper_sell_threshold:
-            logger.info(f"Zone: SELL zone (between {thresholds.upper_sell_threshold:.2f} and {upper:.2f})")
+            logger.info("Zone: SELL zone (between %.2f and %.2f)", thresholds.upper_sell_threshold, upper)
         else:
-            logger.info(f"Zone: No-action zone (between {thresholds.lower_buy_threshold:.2f} and {thresholds.upper_sell_threshold:.2f})")
+            logger.info("Zone: No-action zone (between %.2f and %.2f)",
+                        thresholds.lower_buy_threshold, thresholds.upper_sell_threshold)
 
     def __is_price_within_grid(self, current_price) -> bool:
         if current_price < self.grid_levels.min or current_price > self.grid_levels.max:
-            logger.info(f"Current price {current_price:.2f} is out of grid range. No action taken.")
+            logger.info("Current price %.2f is out of grid range. No action taken.", current_price)
             return False
         return True
 
     def __calculate_grid_thresholds(self, current_price) -> GridThresholds:
-        lower_grid = max((level for level in self.grid_levels.levels if level <= current_price), default=None)
-        upper_grid = min((level for level in self.grid_levels.levels if level >= current_price), default=None)
+        lower_grid, upper_grid = self.grid_levels.find_nearest_levels(current_price)
 
         grid_distance = upper_grid - lower_grid if lower_grid is not None and upper_grid is not None else 0
-        lower_buy_threshold = lower_grid + grid_distance * 0.30 if lower_grid is not None else None
-        upper_sell_threshold = upper_grid - grid_distance * 0.30 if upper_grid is not None else None
+        lower_buy_threshold = lower_grid + grid_distance * self.settings.grid_threshold_factor if lower_grid is not None else None
+        upper_sell_threshold = upper_grid - grid_distance * self.settings.grid_threshold_factor if upper_grid is not None else None
 
         calculated_amount_to_spend = self.balance * self.settings.buy_percentage
         amount_to_spend = max(calculated_amount_to_spend, self.settings.min_transaction_amount)
@@ -106,8 +108,8 @@ class GridSpotStrategy(BaseTradingStrategy):
         rounded_bought_amount = self.__round_to_precision(bought_amount)
 
         if rounded_bought_amount == 0:
-            logger.info(f"Buy skipped. Rounded bought amount is 0. Current price: {current_price:.2f}, "
-                        f"Amount to spend: {amount_to_spend:.2f}, Rounded Amount: {rounded_bought_amount:.6f}")
+            logger.info("Buy skipped. Rounded bought amount is 0. Current price: %.2f, Amount to spend: %.2f, "
+                        "Rounded Amount: %.6f", current_price, amount_to_spend, rounded_bought_amount)
             return None
 
         if rounded_bought_amount * current_price > self.balance:
@@ -115,7 +117,7 @@ class GridSpotStrategy(BaseTradingStrategy):
             return None
 
         order_link_id = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(16))
-        logger.info(f"Buy decision made @ {current_price:.7f}, Amount: {rounded_bought_amount:.6f}")
+        logger.info("Buy decision made @ %.7f, Amount: %.6f", current_price, rounded_bought_amount)
 
         return Order(
             order_link_id=order_link_id,
@@ -126,12 +128,7 @@ class GridSpotStrategy(BaseTradingStrategy):
         )
 
     def __execute_sell(self, current_price: float, timestamp: int) -> Optional[Order]:
-        sorted_orders = sorted(self.order_manager.get_orders(), key=lambda order: order.price)
-
-        active_order = next(
-            (order for order in sorted_orders if (current_price - order.price) * order.amount > 0.02 and order.allow_to_sell),
-            None
-        )
+        active_order = self.order_manager.find_sellable_order(current_price, min_profit=0.02)
 
         if active_order:
             profit = (current_price - active_order.price) * active_order.amount
@@ -150,7 +147,8 @@ class GridSpotStrategy(BaseTradingStrategy):
             })
 
             logger.info(
-                f"Sell executed @ {current_price:.7f}, Profit: {profit:.2f}, Sold Amount: {sale_amount:.2f}, Updated Balance: {self.balance:.2f}"
+                "Sell executed @ %.7f, Profit: %.2f, Sold Amount: %.2f, Updated Balance: %.2f",
+                current_price, profit, sale_amount, self.balance
             )
 
             return Order(
@@ -167,5 +165,5 @@ class GridSpotStrategy(BaseTradingStrategy):
 
     def __round_to_precision(self, value):
         decimal_value = Decimal(value)
-        rounded_value = decimal_value.quantize(Decimal(f'1e-{self.settings.qty_precision}'), rounding=ROUND_DOWN)
+        rounded_value = decimal_value.quantize(Decimal(f'1e-{self.qty_precision}'), rounding=ROUND_DOWN)
         return float(rounded_value)
\ No newline at end of file
@@ -0,0 +1,37 @@
+import threading
+from typing import Any, Optional
+
+
+class LatestValueMailbox:
+    """
+    Single-slot mailbox between a fast producer and a slower consumer. put() never blocks and
+    overwrites a value that has not been taken yet, so the consumer always works on the newest
+    value and a burst of updates can never pile up into a backlog of stale work.
+    """
+
+    def __init__(self):
+        self.__value: Optional[Any] = None
+        self.__has_value = False
+        self.__condition = threading.Condition()
+
+        self.put_count = 0
+        self.coalesced_count = 0
+
+    def put(self, value: Any) -> None:
+        with self.__condition:
+            if self.__has_value:
+                self.coalesced_count += 1
+            self.__value = value
+            self.__has_value = True
+            self.put_count += 1
+            self.__condition.notify()
+
+    def take(self, timeout: Optional[float] = None) -> Optional[Any]:
+        with self.__condition:
+            if not self.__condition.wait_for(lambda: self.__has_value, timeout):
+                return None
+
+            value = self.__value
+            self.__value = None
+            self.__has_value = False
+            return value
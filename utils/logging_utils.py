@@ -1,38 +1,163 @@
+import atexit
 import gzip
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 from datetime import datetime, timedelta
+from typing import Dict, Optional
 
+from configs.settings import Settings
 
-def setup_logger(log_dir="logs", days_to_keep=30):
-    logger = logging.getLogger(__name__)
-    logger.setLevel(logging.INFO)
 
-    if logger.hasHandlers():
-        return logger
+ROOT_LOGGER_NAME = "trading_bot"
 
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+# Level overrides per logger, relative to ROOT_LOGGER_NAME ("" is the root itself). The backtest
+# profile silences the per-tick strategy, order and trader logs and keeps the run summaries.
+LOG_PROFILES: Dict[str, Dict[str, int]] = {
+    "live": {},
+    "backtest": {
+        "": logging.WARNING,
+        "bot.grid_bot": logging.INFO,
+        "bot.parameter_sweep": logging.INFO,
+        "__main__": logging.INFO,
+    },
+    # Sweep workers run many backtests in parallel; only problems are worth reporting from them.
+    "sweep_worker": {
+        "": logging.WARNING,
+        "bot.grid_bot": logging.WARNING,
+        "bot.parameter_sweep": logging.WARNING,
+    },
+}
 
-    cleanup_old_logs(log_dir, days_to_keep)
+_configuration_lock = threading.Lock()
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_log_location = ("logs", 30)
 
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    log_file = os.path.join(log_dir, f"bot_{current_date}.log")
+logger = logging.getLogger(f"{ROOT_LOGGER_NAME}.{__name__}")
 
-    file_handler = logging.FileHandler(log_file)
-    file_handler.setLevel(logging.INFO)
-    file_formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-    file_handler.setFormatter(file_formatter)
 
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter("%(levelname)s - %(message)s")
-    console_handler.setFormatter(console_formatter)
+class DailyLogFileHandler(logging.FileHandler):
+    """
+    Writes to logs/bot_<date>.log and switches to a new file when the date changes. Archiving
+    and deleting old files runs on a background thread, never on the caller's path.
+    """
 
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    def __init__(self, log_dir: str, days_to_keep: int):
+        self.log_dir = log_dir
+        self.days_to_keep = days_to_keep
+        self.current_date = datetime.now().strftime("%Y-%m-%d")
+
+        super().__init__(self.__get_log_file(self.current_date), delay=True)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        record_date = datetime.fromtimestamp(record.created).strftime("%Y-%m-%d")
+        if record_date != self.current_date:
+            self.current_date = record_date
+            self.close()
+            self.baseFilename = os.path.abspath(self.__get_log_file(record_date))
+            start_log_cleanup(self.log_dir, self.days_to_keep)
+
+        super().emit(record)
+
+    def __get_log_file(self, date: str) -> str:
+        return os.path.join(self.log_dir, f"bot_{date}.log")
+
+
+def setup_logger(log_dir="logs", days_to_keep=30, name: Optional[str] = None):
+    _configure_root_logger(log_dir, days_to_keep)
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}" if name else ROOT_LOGGER_NAME)
+
+
+def apply_log_profile(profile: str) -> None:
+    for logger_name, level in LOG_PROFILES[profile].items():
+        logging.getLogger(f"{ROOT_LOGGER_NAME}.{logger_name}" if logger_name else ROOT_LOGGER_NAME).setLevel(level)
+
+
+def stop_logging() -> None:
+    global _queue_listener
+
+    with _configuration_lock:
+        if _queue_listener is not None:
+            _queue_listener.stop()
+            _queue_listener = None
+
+
+def _configure_root_logger(log_dir: str, days_to_keep: int) -> None:
+    global _queue_listener, _log_location
+
+    root_logger = logging.getLogger(ROOT_LOGGER_NAME)
+
+    with _configuration_lock:
+        if root_logger.handlers:
+            return
+
+        settings = Settings()
+        root_logger.setLevel(settings.log_level)
+        _log_location = (log_dir, days_to_keep)
+        root_logger.propagate = False
+
+        if not os.path.exists(log_dir):
+            os.makedirs(log_dir)
+
+        file_handler = DailyLogFileHandler(log_dir, days_to_keep)
+        file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter("%(levelname)s - %(message)s"))
+
+        if settings.log_async:
+            # Callers only put the record on a queue; a background thread does the file and console I/O.
+            log_queue = queue.SimpleQueue()
+            root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+            _queue_listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler)
+            _queue_listener.start()
+            atexit.register(stop_logging)
+        else:
+            root_logger.addHandler(file_handler)
+            root_logger.addHandler(console_handler)
+
+        apply_log_profile(settings.log_profile)
+        for logger_name, level in _parse_module_levels(settings.log_module_levels).items():
+            logging.getLogger(f"{ROOT_LOGGER_NAME}.{logger_name}").setLevel(level)
+
+    start_log_cleanup(log_dir, days_to_keep)
+
+
+def _restart_after_fork() -> None:
+    # A forked worker (e.g. the parameter sweep pool) inherits the queue handler but not the
+    # listener thread, so it drops the inherited handlers and starts its own listener.
+    global _configuration_lock, _queue_listener
+
+    _configuration_lock = threading.Lock()
+    if _queue_listener is None:
+        return
+
+    _queue_listener = None
+    root_logger = logging.getLogger(ROOT_LOGGER_NAME)
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+
+    _configure_root_logger(*_log_location)
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def _parse_module_levels(module_levels: str) -> Dict[str, str]:
+    # "bot.grid_bot=DEBUG,trading_strategies=WARNING" -> {"bot.grid_bot": "DEBUG", "trading_strategies": "WARNING"}
+    levels = {}
+    for entry in module_levels.split(","):
+        if "=" in entry:
+            logger_name, level = entry.split("=", 1)
+            levels[logger_name.strip()] = level.strip().upper()
+    return levels
+
+
+def start_log_cleanup(log_dir, days_to_keep=30):
+    threading.Thread(target=cleanup_old_logs, args=(log_dir, days_to_keep), name="log-cleanup", daemon=True).start()
 
-    return logger
 
 def cleanup_old_logs(log_dir, days_to_keep=30):
     now = datetime.now()
@@ -54,11 +179,11 @@ def cleanup_old_logs(log_dir, days_to_keep=30):
             last_modified_date = datetime.fromtimestamp(os.path.getmtime(log_path))
             if last_modified_date < cutoff_delete:
                 os.remove(log_path)
-                print(f"Deleted old log file: {log_file}")
+                logger.info("Deleted old log file: %s", log_file)
 
 def archive_log_file(log_path):
     with open(log_path, "rb") as f_in:
         with gzip.open(f"{log_path}.gz", "wb") as f_out:
             f_out.writelines(f_in)
     os.remove(log_path)
-    print(f"Archived log file: {log_path}")
\ No newline at end of file
+    logger.info("Archived log file: %s", log_path)
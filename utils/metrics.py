@@ -0,0 +1,216 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from utils.logging_utils import setup_logger
+
+
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
+
+# Upper bounds in seconds, from a cached read to a slow paged download.
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[Tuple[str, str], ...]
+
+
+class Counter:
+    def __init__(self, name: str, description: str):
+        self.name = name
+        self.description = description
+        self.__values: Dict[LabelValues, float] = {}
+        self.__lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _to_label_values(labels)
+        with self.__lock:
+            self.__values[key] = self.__values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        with self.__lock:
+            return self.__values.get(_to_label_values(labels), 0)
+
+    def total(self) -> float:
+        with self.__lock:
+            return sum(self.__values.values())
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        with self.__lock:
+            for key, value in sorted(self.__values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, description: str, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+                 is_latency: bool = True):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self.is_latency = is_latency
+        # Per label set: [count per bucket (the last one is +Inf), sum, max].
+        self.__series: Dict[LabelValues, list] = {}
+        self.__lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _to_label_values(labels)
+        bucket_index = bisect.bisect_left(self.buckets, value)
+        with self.__lock:
+            series = self.__series.get(key)
+            if series is None:
+                series = self.__series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0.0]
+            series[0][bucket_index] += 1
+            series[1] += value
+            series[2] = max(series[2], value)
+
+    @contextmanager
+    def time(self, **labels):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started_at, **labels)
+
+    def summarize(self) -> Dict[LabelValues, Tuple[int, float, float]]:
+        # Count, mean and max per label set, for the periodic log summary.
+        with self.__lock:
+            return {
+                key: (sum(bucket_counts), total / max(sum(bucket_counts), 1), maximum)
+                for key, (bucket_counts, total, maximum) in self.__series.items()
+            }
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self.__lock:
+            for key, (bucket_counts, total, _) in sorted(self.__series.items()):
+                cumulative = 0
+                for upper_bound, count in zip(self.buckets, bucket_counts):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(key, le=f'{upper_bound:g}')} {cumulative}")
+                cumulative += bucket_counts[-1]
+                lines.append(f"{self.name}_bucket{_format_labels(key, le='+Inf')} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {total:.6f}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.__metrics: Dict[str, object] = {}
+        self.__lock = threading.Lock()
+
+    def counter(self, name: str, description: str) -> Counter:
+        return self.__get_or_create(name, lambda: Counter(name, description))
+
+    def histogram(self, name: str, description: str, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+                  is_latency: bool = True) -> Histogram:
+        return self.__get_or_create(name, lambda: Histogram(name, description, buckets, is_latency))
+
+    def render(self) -> str:
+        with self.__lock:
+            metrics = list(self.__metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+    def summary(self) -> str:
+        with self.__lock:
+            metrics = list(self.__metrics.values())
+
+        parts = []
+        for metric in metrics:
+            if isinstance(metric, Histogram):
+                for key, (count, mean, maximum) in sorted(metric.summarize().items()):
+                    if metric.is_latency:
+                        parts.append(f"{metric.name}{_format_labels(key)}: n={count} "
+                                     f"avg={mean * 1000:.1f}ms max={maximum * 1000:.1f}ms")
+                    else:
+                        parts.append(f"{metric.name}{_format_labels(key)}: n={count} avg={mean:.2f} max={maximum:g}")
+            elif isinstance(metric, Counter) and metric.total():
+                parts.append(f"{metric.name}={metric.total():g}")
+        return "; ".join(parts)
+
+    def __get_or_create(self, name: str, factory):
+        with self.__lock:
+            metric = self.__metrics.get(name)
+            if metric is None:
+                metric = self.__metrics[name] = factory()
+            return metric
+
+
+class MetricsServer:
+    """
+    Serves the registry in the Prometheus text format on http://<host>:<port>/metrics from a
+    daemon thread. Bind it to localhost; it has no authentication.
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str, port: int):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.__server: Optional[ThreadingHTTPServer] = None
+
+    def start(self) -> None:
+        registry = self.registry
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.__server = ThreadingHTTPServer((self.host, self.port), MetricsRequestHandler)
+        self.__server.daemon_threads = True
+        threading.Thread(target=self.__server.serve_forever, name="metrics-server", daemon=True).start()
+        logger.info("Metrics endpoint listening on http://%s:%d/metrics", self.host, self.__server.server_port)
+
+    def stop(self) -> None:
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+
+
+def _to_label_values(labels: dict) -> LabelValues:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(label_values: LabelValues, **extra_labels) -> str:
+    pairs = list(label_values) + list(extra_labels.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in pairs) + "}"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+metrics = MetricsRegistry()
+
+# Shared instruments, so every module records into the same series.
+api_call_seconds = metrics.histogram("bybit_api_call_seconds", "Latency of Bybit REST calls, including retries.")
+api_calls_total = metrics.counter("bybit_api_calls_total", "Bybit REST call attempts by endpoint and outcome.")
+api_retries_total = metrics.counter("bybit_api_retries_total", "Bybit REST calls retried after a temporary error.")
+dynamodb_call_seconds = metrics.histogram("dynamodb_call_seconds", "Latency of DynamoDB calls by operation.")
+live_stage_seconds = metrics.histogram("live_loop_stage_seconds", "Time spent in each stage of the live loop.")
+live_iterations_total = metrics.counter("live_loop_iterations_total", "Completed live loop iterations.")
+live_api_calls_per_iteration = metrics.histogram(
+    "live_loop_api_calls", "Bybit REST call attempts per live loop iteration.", buckets=(0, 1, 2, 3, 5, 8, 13, 21),
+    is_latency=False
+)
+price_to_order_seconds = metrics.histogram("price_to_order_seconds", "Time from receiving a price to the order being placed.")
+orders_placed_total = metrics.counter("orders_placed_total", "Orders accepted by the exchange.")
+notification_seconds = metrics.histogram("telegram_send_seconds", "Latency of Telegram sendMessage calls.")
+notifications_total = metrics.counter("telegram_notifications_total", "Telegram notifications by outcome.")
@@ -0,0 +1,265 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from utils.logging_utils import setup_logger
+
+
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Frame label prefixes per component. A stack is charged to the innermost frame that matches, so
+# a log call made by the strategy counts as logging, not as strategy time.
+COMPONENT_PREFIXES = {
+    "logging": ("logging/", "utils/logging_utils.py"),
+    "strategy": ("trading_strategies/",),
+    "order_manager": ("order_managers/",),
+    "trader": ("traders/",),
+    "grid_calculator": (
+        "bot/grid_levels_calculator.py", "models/grid_levels.py", "models/uniform_grid_levels.py",
+        "data/rolling_price_window.py", "utils/sorted_list.py", "data/streaming_price_distribution.py",
+        "utils/t_digest.py",
+    ),
+    "backtest_engine": ("bot/vectorized_backtest_engine.py",),
+}
+
+Stack = Tuple[str, ...]
+
+
+class BacktestProfiler:
+    """
+    Profiles the calling thread while active and reports where the time went.
+
+    "deterministic" records every Python and C call through sys.setprofile: exact stacks, but the
+    run is several times slower. "sampling" snapshots the thread's stack from a
+    background thread about every `sampling_interval` seconds, which barely slows the backtest down.
+
+    write_report produces a collapsed-stack file (flamegraph.pl / speedscope / inferno), a top-N
+    text summary and a JSON summary per component for comparing runs.
+    """
+
+    modes = ("deterministic", "sampling")
+
+    def __init__(self, mode: str, output_directory: str = "profiles", top_n: int = 25,
+                 sampling_interval: float = 0.002):
+        if mode not in self.modes:
+            raise ValueError(f"Unknown profiling mode: {mode}. Expected one of: {', '.join(self.modes)}")
+
+        self.mode = mode
+        self.output_directory = output_directory
+        self.top_n = top_n
+        self.sampling_interval = sampling_interval
+
+        # Seconds of self time per call stack, root first.
+        self.stacks: Dict[Stack, float] = defaultdict(float)
+        self.wall_time = 0.0
+
+        self.__labels: Dict[object, str] = {}
+        self.__started_at: Optional[float] = None
+
+        # Deterministic mode: a call tree of [children, self time, label] nodes and the current path in it.
+        self.__root = [{}, 0.0, None]
+        self.__path: List[list] = []
+        self.__last_event_at = 0.0
+
+        # Sampling mode.
+        self.__target_thread_id: Optional[int] = None
+        self.__stop_sampling = threading.Event()
+        self.__sampler: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        return False
+
+    def start(self) -> None:
+        self.__started_at = time.perf_counter()
+
+        if self.mode == "deterministic":
+            self.__path = [self.__root]
+            self.__last_event_at = time.perf_counter()
+            sys.setprofile(self.__on_profile_event)
+        else:
+            self.__target_thread_id = threading.get_ident()
+            self.__stop_sampling.clear()
+            self.__sampler = threading.Thread(target=self.__sample, name="backtest-profiler", daemon=True)
+            self.__sampler.start()
+
+    def stop(self) -> None:
+        if self.__started_at is None:
+            return
+
+        if self.mode == "deterministic":
+            sys.setprofile(None)
+            self.__charge(time.perf_counter())
+            self.__collect_call_tree(self.__root, ())
+            self.__root = [{}, 0.0, None]
+        else:
+            self.__stop_sampling.set()
+            self.__sampler.join()
+
+        self.wall_time += time.perf_counter() - self.__started_at
+        self.__started_at = None
+
+    def merge(self, stacks: Dict[Stack, float], wall_time: float = 0.0) -> None:
+        # Combines profiles of several runs, e.g. every backtest of a parameter sweep.
+        for stack, seconds in stacks.items():
+            self.stacks[stack] += seconds
+        self.wall_time += wall_time
+
+    def component_times(self) -> Dict[str, float]:
+        times = {component: 0.0 for component in COMPONENT_PREFIXES}
+        times["other"] = 0.0
+        for stack, seconds in self.stacks.items():
+            times[_get_component(stack)] += seconds
+        return times
+
+    def top_functions(self) -> List[Tuple[str, float, float]]:
+        # (label, self seconds, inclusive seconds), ordered by self time.
+        self_times = defaultdict(float)
+        total_times = defaultdict(float)
+        for stack, seconds in self.stacks.items():
+            self_times[stack[-1]] += seconds
+            for label in set(stack):
+                total_times[label] += seconds
+
+        ranked = sorted(self_times.items(), key=lambda item: item[1], reverse=True)[:self.top_n]
+        return [(label, self_time, total_times[label]) for label, self_time in ranked]
+
+    def write_report(self, name: str) -> str:
+        if not os.path.exists(self.output_directory):
+            os.makedirs(self.output_directory)
+
+        base_path = os.path.join(self.output_directory, f"{name}_{self.mode}_{datetime.now():%Y%m%d_%H%M%S}")
+
+        with open(f"{base_path}.collapsed", "w") as file:
+            for stack, seconds in sorted(self.stacks.items()):
+                microseconds = int(round(seconds * 1_000_000))
+                if microseconds > 0:
+                    file.write(f"{';'.join(stack)} {microseconds}\n")
+
+        summary = self.format_summary()
+        with open(f"{base_path}.txt", "w") as file:
+            file.write(summary)
+
+        with open(f"{base_path}.json", "w") as file:
+            json.dump({
+                "mode": self.mode,
+                "wall_time": self.wall_time,
+                "profiled_time": sum(self.stacks.values()),
+                "components": self.component_times(),
+                "top_functions": [
+                    {"function": label, "self_time": self_time, "total_time": total_time}
+                    for label, self_time, total_time in self.top_functions()
+                ],
+            }, file, indent=2)
+
+        logger.info("Profile written to %s.{collapsed,txt,json}\n%s", base_path, summary)
+        return base_path
+
+    def format_summary(self) -> str:
+        profiled_time = sum(self.stacks.values()) or 1.0
+
+        lines = [f"Profile ({self.mode}): {self.wall_time:.3f}s wall time, {sum(self.stacks.values()):.3f}s profiled", ""]
+        lines.append(f"{'component':<20}{'seconds':>12}{'share':>10}")
+        for component, seconds in sorted(self.component_times().items(), key=lambda item: item[1], reverse=True):
+            lines.append(f"{component:<20}{seconds:>12.3f}{seconds / profiled_time:>10.1%}")
+
+        lines.append("")
+        lines.append(f"{'self s':>10}{'total s':>10}{'self %':>9}  function")
+        for label, self_time, total_time in self.top_functions():
+            lines.append(f"{self_time:>10.3f}{total_time:>10.3f}{self_time / profiled_time:>9.1%}  {label}")
+
+        return "\n".join(lines) + "\n"
+
+    def __on_profile_event(self, frame, event, arg):
+        now = time.perf_counter()
+        self.__charge(now)
+
+        if event == "call" or event == "c_call":
+            # Bound C methods are new objects on every call, so C functions are keyed by their label.
+            key = frame.f_code if event == "call" else _format_label(arg)
+            node = self.__path[-1]
+            child = node[0].get(key)
+            if child is None:
+                child = node[0][key] = [{}, 0.0, self.__get_label(key)]
+            self.__path.append(child)
+        elif len(self.__path) > 1:
+            # Returns from frames entered before start() would pop past the root, so they are ignored.
+            self.__path.pop()
+
+        self.__last_event_at = time.perf_counter()
+
+    def __charge(self, now: float) -> None:
+        # The profiler's own bookkeeping between the previous event and this one is not charged.
+        self.__path[-1][1] += now - self.__last_event_at
+
+    def __collect_call_tree(self, node: list, stack: Stack) -> None:
+        children, self_time, _ = node
+        if stack and self_time > 0:
+            self.stacks[stack] += self_time
+        for child in children.values():
+            self.__collect_call_tree(child, stack + (child[2],))
+
+    def __sample(self) -> None:
+        # The sampler often wakes up late because the profiled thread holds the GIL, so every sample
+        # is weighted by the time since the previous one rather than by the nominal interval.
+        last_sample_at = time.perf_counter()
+        while not self.__stop_sampling.wait(self.sampling_interval):
+            now = time.perf_counter()
+            elapsed, last_sample_at = now - last_sample_at, now
+
+            frame = sys._current_frames().get(self.__target_thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(self.__get_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += elapsed
+
+    def __get_label(self, key) -> str:
+        if isinstance(key, str):
+            return key
+
+        label = self.__labels.get(key)
+        if label is None:
+            label = self.__labels[key] = f"{_shorten_path(key.co_filename)}:{key.co_name}"
+        return label
+
+
+def _format_label(function) -> str:
+    # A C function seen by the deterministic profiler.
+    module = getattr(function, "__module__", None) or "builtins"
+    return f"<{module}>:{getattr(function, '__qualname__', type(function).__name__)}"
+
+
+def _shorten_path(path: str) -> str:
+    # Project files relative to the repository, library files relative to their sys.path entry.
+    if path.startswith("<"):
+        return path
+
+    path = os.path.abspath(path)
+    if path.startswith(PROJECT_ROOT + os.sep):
+        return os.path.relpath(path, PROJECT_ROOT).replace(os.sep, "/")
+
+    roots = [os.path.abspath(entry) for entry in sys.path if entry and path.startswith(os.path.abspath(entry) + os.sep)]
+    if roots:
+        return os.path.relpath(path, max(roots, key=len)).replace(os.sep, "/")
+    return os.path.basename(path)
+
+
+def _get_component(stack: Stack) -> str:
+    for label in reversed(stack):
+        for component, prefixes in COMPONENT_PREFIXES.items():
+            if label.startswith(prefixes):
+                return component
+    return "other"
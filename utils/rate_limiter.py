@@ -0,0 +1,37 @@
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket: up to `burst` calls may pass at once, after which callers are
+    spaced to `rate_per_second` on average.
+    """
+
+    def __init__(self, rate_per_second: float, burst: Optional[int] = None):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second must be positive")
+
+        self.rate_per_second = rate_per_second
+        self.burst = burst if burst is not None else max(1, int(rate_per_second))
+
+        self.__tokens = float(self.burst)
+        self.__updated_at = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> None:
+        while True:
+            with self.__lock:
+                self.__refill()
+                if self.__tokens >= tokens:
+                    self.__tokens -= tokens
+                    return
+                wait_time = (tokens - self.__tokens) / self.rate_per_second
+
+            time.sleep(wait_time)
+
+    def __refill(self) -> None:
+        now = time.monotonic()
+        self.__tokens = min(self.burst, self.__tokens + (now - self.__updated_at) * self.rate_per_second)
+        self.__updated_at = now
@@ -0,0 +1,132 @@
+from bisect import bisect_left, bisect_right, insort_right
+from itertools import chain
+
+
+class SortedList:
+    """
+    Sorted multiset split into bounded buckets, so inserts and removals shift at most
+    one bucket instead of the whole list. Equal values keep their insertion order.
+    """
+
+    bucket_size = 1000
+
+    def __init__(self, values=None):
+        self.__buckets = []
+        self.__maxes = []
+        self.__length = 0
+
+        if values is not None:
+            self.update(values)
+
+    def __len__(self) -> int:
+        return self.__length
+
+    def __iter__(self):
+        return chain.from_iterable(self.__buckets)
+
+    def __getitem__(self, index: int):
+        bucket_index, position = self.__locate(index)
+        return self.__buckets[bucket_index][position]
+
+    def add(self, value) -> None:
+        if not self.__buckets:
+            self.__buckets.append([value])
+            self.__maxes.append(value)
+            self.__length = 1
+            return
+
+        bucket_index = bisect_right(self.__maxes, value)
+        if bucket_index == len(self.__maxes):
+            bucket_index -= 1
+            self.__buckets[bucket_index].append(value)
+            self.__maxes[bucket_index] = value
+        else:
+            insort_right(self.__buckets[bucket_index], value)
+
+        self.__length += 1
+        self.__split_if_needed(bucket_index)
+
+    def update(self, values) -> None:
+        values = sorted(values)
+        if not values:
+            return
+
+        if self.__buckets:
+            for value in values:
+                self.add(value)
+            return
+
+        self.__buckets = [values[i:i + self.bucket_size] for i in range(0, len(values), self.bucket_size)]
+        self.__maxes = [bucket[-1] for bucket in self.__buckets]
+        self.__length = len(values)
+
+    def remove(self, value) -> None:
+        bucket_index = bisect_left(self.__maxes, value)
+        if bucket_index == len(self.__maxes):
+            raise ValueError(f"{value!r} not in SortedList")
+
+        bucket = self.__buckets[bucket_index]
+        position = bisect_left(bucket, value)
+        if bucket[position] != value:
+            raise ValueError(f"{value!r} not in SortedList")
+
+        self.__delete(bucket_index, position)
+
+    def pop(self, index: int = -1):
+        bucket_index, position = self.__locate(index)
+        value = self.__buckets[bucket_index][position]
+        self.__delete(bucket_index, position)
+        return value
+
+    def bisect_left(self, value) -> int:
+        return self.__bisect(value, bisect_left)
+
+    def bisect_right(self, value) -> int:
+        return self.__bisect(value, bisect_right)
+
+    def clear(self) -> None:
+        self.__buckets = []
+        self.__maxes = []
+        self.__length = 0
+
+    def __bisect(self, value, bisect_function) -> int:
+        bucket_index = bisect_function(self.__maxes, value)
+        if bucket_index == len(self.__maxes):
+            return self.__length
+
+        preceding = sum(len(bucket) for bucket in self.__buckets[:bucket_index])
+        return preceding + bisect_function(self.__buckets[bucket_index], value)
+
+    def __locate(self, index: int):
+        if index < 0:
+            index += self.__length
+        if index < 0 or index >= self.__length:
+            raise IndexError("SortedList index out of range")
+
+        for bucket_index, bucket in enumerate(self.__buckets):
+            if index < len(bucket):
+                return bucket_index, index
+            index -= len(bucket)
+
+        raise IndexError("SortedList index out of range")
+
+    def __delete(self, bucket_index: int, position: int) -> None:
+        bucket = self.__buckets[bucket_index]
+        del bucket[position]
+        self.__length -= 1
+
+        if bucket:
+            self.__maxes[bucket_index] = bucket[-1]
+        else:
+            del self.__buckets[bucket_index]
+            del self.__maxes[bucket_index]
+
+    def __split_if_needed(self, bucket_index: int) -> None:
+        bucket = self.__buckets[bucket_index]
+        if len(bucket) <= 2 * self.bucket_size:
+            return
+
+        half = len(bucket) // 2
+        self.__buckets.insert(bucket_index + 1, bucket[half:])
+        del bucket[half:]
+        self.__maxes.insert(bucket_index, bucket[-1])
@@ -0,0 +1,155 @@
+import math
+from typing import Iterable, List, Optional
+
+
+class TDigest:
+    """
+    Merging t-digest (Dunning & Ertl): a mergeable quantile sketch of at most about `compression`
+    centroids. Centroids are small near the tails, so the 5th/95th percentiles stay accurate to a
+    fraction of a percent of rank while memory does not grow with the number of values.
+    """
+
+    buffer_factor = 5
+
+    def __init__(self, compression: float = 100):
+        self.compression = compression
+
+        self.__means: List[float] = []
+        self.__weights: List[float] = []
+        self.__buffer: List[tuple] = []
+        self.__total_weight = 0.0
+        self.__min: Optional[float] = None
+        self.__max: Optional[float] = None
+
+    def __len__(self) -> int:
+        self.__flush()
+        return len(self.__means)
+
+    @property
+    def total_weight(self) -> float:
+        return self.__total_weight
+
+    @property
+    def min(self) -> Optional[float]:
+        return self.__min
+
+    @property
+    def max(self) -> Optional[float]:
+        return self.__max
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        value = float(value)
+        self.__buffer.append((value, weight))
+        self.__total_weight += weight
+        self.__min = value if self.__min is None else min(self.__min, value)
+        self.__max = value if self.__max is None else max(self.__max, value)
+
+        if len(self.__buffer) >= self.buffer_factor * self.compression:
+            self.__flush()
+
+    def update(self, values: Iterable[float], weight: float = 1.0) -> None:
+        for value in values:
+            self.add(value, weight)
+
+    def merge(self, other: "TDigest") -> None:
+        other.__flush()
+        if not other.__means:
+            return
+
+        self.__buffer.extend(zip(other.__means, other.__weights))
+        self.__total_weight += other.__total_weight
+        self.__min = other.__min if self.__min is None else min(self.__min, other.__min)
+        self.__max = other.__max if self.__max is None else max(self.__max, other.__max)
+        self.__flush()
+
+    def scale(self, factor: float) -> None:
+        # Multiplies every weight, e.g. to decay old data or to keep growing weights in range.
+        # Quantiles are unchanged by scaling, only the balance against values added later.
+        self.__flush()
+        self.__weights = [weight * factor for weight in self.__weights]
+        self.__total_weight *= factor
+
+    def quantile(self, q: float) -> float:
+        self.__flush()
+        if not self.__means:
+            raise ValueError("Cannot calculate a quantile of an empty t-digest")
+        if len(self.__means) == 1 or q <= 0:
+            return self.__min if q <= 0 else self.__means[0]
+        if q >= 1:
+            return self.__max
+
+        # Each centroid's mean sits at the middle of its weight; the extremes anchor both ends.
+        target = q * self.__total_weight
+        previous_position, previous_value = 0.0, self.__min
+        cumulative_weight = 0.0
+        for mean, weight in zip(self.__means, self.__weights):
+            position = cumulative_weight + weight / 2
+            if target < position:
+                return _interpolate(target, previous_position, previous_value, position, mean)
+            previous_position, previous_value = position, mean
+            cumulative_weight += weight
+
+        return _interpolate(target, previous_position, previous_value, self.__total_weight, self.__max)
+
+    def to_dict(self) -> dict:
+        self.__flush()
+        return {
+            "compression": self.compression,
+            "means": list(self.__means),
+            "weights": list(self.__weights),
+            "min": self.__min,
+            "max": self.__max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TDigest":
+        digest = cls(data["compression"])
+        digest.__means = [float(mean) for mean in data["means"]]
+        digest.__weights = [float(weight) for weight in data["weights"]]
+        digest.__total_weight = sum(digest.__weights)
+        digest.__min = data["min"]
+        digest.__max = data["max"]
+        return digest
+
+    def __flush(self) -> None:
+        if not self.__buffer:
+            return
+
+        items = sorted(list(zip(self.__means, self.__weights)) + self.__buffer)
+        self.__buffer = []
+        total_weight = sum(weight for _, weight in items)
+
+        # k1 scale function: a centroid may only span one unit of k, which keeps the tails fine-grained.
+        means, weights = [], []
+        current_mean, current_weight = items[0]
+        merged_weight = 0.0
+        weight_limit = total_weight * self.__get_quantile_limit(0.0)
+
+        for mean, weight in items[1:]:
+            if merged_weight + current_weight + weight <= weight_limit:
+                current_weight += weight
+                current_mean += (mean - current_mean) * weight / current_weight
+            else:
+                means.append(current_mean)
+                weights.append(current_weight)
+                merged_weight += current_weight
+                weight_limit = total_weight * self.__get_quantile_limit(merged_weight / total_weight)
+                current_mean, current_weight = mean, weight
+
+        means.append(current_mean)
+        weights.append(current_weight)
+
+        self.__means = means
+        self.__weights = weights
+        self.__total_weight = total_weight
+
+    def __get_quantile_limit(self, q: float) -> float:
+        k = self.compression / (2 * math.pi) * math.asin(2 * q - 1) + 1
+        angle = min(max(2 * math.pi * k / self.compression, -math.pi / 2), math.pi / 2)
+        return (1 + math.sin(angle)) / 2
+
+
+def _interpolate(target: float, left_position: float, left_value: float, right_position: float, right_value: float) -> float:
+    if right_position <= left_position:
+        return right_value
+    return left_value + (right_value - left_value) * (target - left_position) / (right_position - left_position)
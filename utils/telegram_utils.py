@@ -1,26 +1,137 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
 import requests
 
 from configs.settings import Settings
 from utils.logging_utils import setup_logger
+from utils.metrics import notification_seconds, notifications_total
+from utils.rate_limiter import RateLimiter
 
 
-logger = setup_logger(log_dir="logs", days_to_keep=30)
+logger = setup_logger(log_dir="logs", days_to_keep=30, name=__name__)
 settings = Settings()
 
 
-def send_telegram_notification(message):
-    url = f"https://api.telegram.org/bot{settings.telegram_bot_token}/sendMessage"
-    payload = {
-        "chat_id": settings.telegram_chat_id,
-        "text": message,
-        "parse_mode": "Markdown"
-    }
-    try:
-        response = requests.post(url, json=payload)
-        if response.status_code == 200:
-            logger.info("Telegram notification sent successfully.")
-        else:
-            logger.error(f"Failed to send Telegram notification. Status code: {response.status_code}")
-            logger.error(f"Response: {response.text}")
-    except Exception as e:
-        logger.error(f"Error sending Telegram notification: {e}")
\ No newline at end of file
+class TelegramNotifier:
+    """
+    Sends Telegram messages from a background thread, so callers only pay for an enqueue.
+    Pending messages live in a bounded queue: a message with the same coalesce key (by default its
+    text) as one already waiting is merged into it, and when the queue is full the oldest message is
+    dropped. Sending is
+    spaced to Telegram's per-chat limit over one keep-alive session.
+    """
+
+    def __init__(self, bot_token: str, chat_id: str, max_queue_size: int, messages_per_second: float, timeout: float):
+        self.url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        self.chat_id = chat_id
+        self.max_queue_size = max_queue_size
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.rate_limiter = RateLimiter(messages_per_second, burst=1)
+
+        # Coalesce key -> [latest message text, how many times it was queued while waiting to be sent].
+        self.__pending = OrderedDict()
+        self.__sending = False
+        self.__condition = threading.Condition()
+        self.__worker = None
+
+        self.dropped_count = 0
+
+    def send(self, message: str, coalesce_key: Optional[str] = None) -> None:
+        # Messages that differ only in details (attempt counts, timestamps in error texts) pass a
+        # stable coalesce_key, e.g. endpoint and error type, so a burst of them is sent once.
+        key = message if coalesce_key is None else coalesce_key
+
+        with self.__condition:
+            pending_message = self.__pending.get(key)
+            if pending_message is not None:
+                pending_message[0] = message
+                pending_message[1] += 1
+                return
+
+            if len(self.__pending) >= self.max_queue_size:
+                _, (dropped_message, _) = self.__pending.popitem(last=False)
+                self.dropped_count += 1
+                notifications_total.inc(outcome="dropped")
+                logger.warning("Telegram queue is full. Dropped message: %s", dropped_message[:100])
+
+            self.__pending[key] = [message, 1]
+            self.__start_worker()
+            self.__condition.notify()
+
+    def flush(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        with self.__condition:
+            return self.__condition.wait_for(
+                lambda: not self.__pending and not self.__sending, max(0.0, deadline - time.monotonic())
+            )
+
+    def __start_worker(self) -> None:
+        if self.__worker is None:
+            self.__worker = threading.Thread(target=self.__run, name="telegram-notifier", daemon=True)
+            self.__worker.start()
+
+    def __run(self) -> None:
+        while True:
+            with self.__condition:
+                self.__condition.wait_for(lambda: self.__pending)
+                _, (message, count) = self.__pending.popitem(last=False)
+                self.__sending = True
+
+            if count > 1:
+                message = f"{message}\n\n(repeated {count} times)"
+
+            try:
+                self.rate_limiter.acquire()
+                self.__post(message)
+            finally:
+                with self.__condition:
+                    self.__sending = False
+                    self.__condition.notify_all()
+
+    def __post(self, message: str, retry_on_rate_limit: bool = True) -> None:
+        payload = {
+            "chat_id": self.chat_id,
+            "text": message,
+            "parse_mode": "Markdown"
+        }
+        try:
+            with notification_seconds.time():
+                response = self.session.post(self.url, json=payload, timeout=self.timeout)
+            if response.status_code == 200:
+                notifications_total.inc(outcome="sent")
+                logger.info("Telegram notification sent successfully.")
+            elif response.status_code == 429 and retry_on_rate_limit:
+                # Too many requests: Telegram says how long to back off; the message is sent again after that.
+                retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+                logger.warning("Telegram rate limit hit. Retrying in %ss.", retry_after)
+                time.sleep(retry_after)
+                self.__post(message, retry_on_rate_limit=False)
+            else:
+                notifications_total.inc(outcome="failed")
+                logger.error("Failed to send Telegram notification. Status code: %s", response.status_code)
+                logger.error("Response: %s", response.text)
+        except Exception as e:
+            notifications_total.inc(outcome="failed")
+            logger.error("Error sending Telegram notification: %s", e)
+
+
+notifier = TelegramNotifier(
+    settings.telegram_bot_token,
+    settings.telegram_chat_id,
+    settings.telegram_queue_size,
+    settings.telegram_messages_per_second,
+    settings.telegram_timeout
+)
+
+
+def send_telegram_notification(message, coalesce_key: Optional[str] = None):
+    notifier.send(message, coalesce_key)
+
+
+def flush_telegram_notifications(timeout: float = 10) -> bool:
+    return notifier.flush(timeout)
@@ -0,0 +1,64 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Thread-safe key/value cache in which every entry expires after its own time to live.
+    Entries can also be dropped explicitly when the data behind them is known to have changed.
+    """
+
+    def __init__(self, default_ttl: float):
+        self.default_ttl = default_ttl
+
+        self.__entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self.__lock = threading.Lock()
+        # Bumped by invalidate(), so a load that started before an invalidation is not stored after it.
+        self.__generation = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, generation: Optional[int] = None) -> bool:
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self.__lock:
+            if generation is not None and generation != self.__generation:
+                return False
+            self.__entries[key] = (value, expires_at)
+            return True
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None,
+                    should_cache: Callable[[Any], bool] = lambda value: value is not None) -> Any:
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self.__lock:
+            generation = self.__generation
+
+        # Loaded outside the lock, so a slow request does not block readers of other keys. The value
+        # is still returned if the key was invalidated meanwhile, but it may predate that change, so
+        # it is not cached.
+        value = loader()
+        if should_cache(value):
+            self.set(key, value, ttl, generation)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self.__lock:
+            self.__generation += 1
+            if key is None:
+                self.__entries.clear()
+            else:
+                self.__entries.pop(key, None)